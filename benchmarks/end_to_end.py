@@ -0,0 +1,250 @@
+import json
+import resource
+import sys
+from argparse import ArgumentParser
+from logging import getLogger
+from pathlib import Path
+from statistics import mean, quantiles
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Optional
+
+from shushu.actions import (
+    DataProcessorCoreAction,
+    MemoryPayload,
+    OpenMemoryUrlCoreAction,
+    OpenUrlAction,
+    PythonCodeDataProcessorAction,
+    SaveDataAction,
+    SelectedElementPayload,
+    SelectedElementsPayload,
+    SequencialCoreAction,
+    SetSelectorAction,
+    StorageCoreAction,
+    WebAgentCoreAction,
+    XPathSelector,
+)
+from shushu.core import gen_shushu_core
+from shushu.models import BaseDataModel, Url
+from shushu.plans import compile_plan
+from shushu.settings import (
+    CoreSettings,
+    HttpWebAgentSettings,
+    LocalFileStorageSettings,
+    PythonCodeWorkerPoolSettings,
+    SeleniumWebAgentSettings,
+    TracingSettings,
+    WebAgentSettings,
+)
+from shushu.tracing import SpanRecord
+from shushu.types import TypeId
+
+from .fixture_site import serve_fixture_site
+
+LISTING_CODE = """\
+from urllib.parse import urljoin
+
+from shushu.models import BaseDataModel, ElementSequence
+from shushu.types import TypeId
+
+
+class Links(BaseDataModel):
+    type_id: TypeId = TypeId("01M57K84NJ3CSV3N45V2NPWHC5")
+    links: list[str]
+
+
+def convert(element_sequence: ElementSequence) -> Links:
+    return Links(
+        links=[urljoin(str(element.url.value), element.root.find("a")["href"]) for element in element_sequence.elements]
+    )
+"""
+
+DETAIL_CODE = """\
+from shushu.models import BaseDataModel, Element
+from shushu.types import TypeId
+
+
+class Article(BaseDataModel):
+    type_id: TypeId = TypeId("01M57K84NJ5KS5YZ93328T1KPF")
+    url: str
+    title: str
+    paragraph_count: int
+
+
+def convert(element: Element) -> Article:
+    return Article(
+        url=str(element.url.value),
+        title=element.root.find("h1").text.strip(),
+        paragraph_count=len(element.root.find_all("p")),
+    )
+"""
+
+# spans that make up each stage of the pipeline
+STAGES = {
+    "page_load": ("web_agent", "OPEN_URL"),
+    "extraction": ("extraction", None),
+    "processor": ("data_processor", None),
+    "storage": ("storage", None),
+}
+
+
+class DetailLink(BaseDataModel):
+    type_id: TypeId = TypeId("01M57JHR94Z80BAXG881HD43QN")
+    link: str
+
+
+def build_listing_action() -> SequencialCoreAction:
+    """Collects the detail links of the opened listing page."""
+    return SequencialCoreAction(
+        actions=[
+            WebAgentCoreAction(action=SetSelectorAction(selector=XPathSelector(xpath="//li[@class='list-item']"))),
+            DataProcessorCoreAction(
+                action=PythonCodeDataProcessorAction(code=LISTING_CODE), payload=SelectedElementsPayload()
+            ),
+        ]
+    )
+
+
+def build_detail_action() -> SequencialCoreAction:
+    """Opens, extracts, processes and saves the detail page of a `DetailLink`."""
+    return SequencialCoreAction(
+        actions=[
+            OpenMemoryUrlCoreAction(attribute="link"),
+            WebAgentCoreAction(action=SetSelectorAction(selector=XPathSelector(xpath="/html/body"))),
+            DataProcessorCoreAction(
+                action=PythonCodeDataProcessorAction(code=DETAIL_CODE), payload=SelectedElementPayload()
+            ),
+            StorageCoreAction(action=SaveDataAction(), payload=MemoryPayload()),
+        ]
+    )
+
+
+def summarize_stage(durations_us: list[float]) -> dict[str, Any]:
+    """
+    >>> summarize_stage([1000.0, 2000.0, 3000.0])["mean_ms"]
+    2.0
+    >>> summarize_stage([])["count"]
+    0
+    """
+    if not durations_us:
+        return {"count": 0}
+    durations_ms = sorted(d / 1000 for d in durations_us)
+    percentiles = quantiles(durations_ms, n=100, method="inclusive") if len(durations_ms) > 1 else durations_ms * 99
+    return {
+        "count": len(durations_ms),
+        "total_ms": sum(durations_ms),
+        "mean_ms": mean(durations_ms),
+        "p50_ms": percentiles[49],
+        "p95_ms": percentiles[94],
+        "max_ms": durations_ms[-1],
+    }
+
+
+def summarize_stages(records: list[SpanRecord]) -> dict[str, dict[str, Any]]:
+    return {
+        stage: summarize_stage(
+            [r.duration_us for r in records if r.category == category and (name is None or r.name == name)]
+        )
+        for stage, (category, name) in STAGES.items()
+    }
+
+
+def peak_rss_kb() -> dict[str, int]:
+    """Peak resident set sizes of this process and of its terminated children (browsers and python code workers)."""
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }
+
+
+def run(
+    agent: str,
+    pages: int,
+    rows_per_page: int,
+    paragraphs_per_detail: int,
+    max_workers: int,
+    python_code_workers: int,
+    trace_path: Optional[str] = None,
+) -> dict[str, Any]:
+    logger = getLogger("shushu.benchmarks")
+    web_agent_settings: WebAgentSettings = (
+        SeleniumWebAgentSettings(driver_pool_size=max_workers + 1) if agent == "SELENIUM" else HttpWebAgentSettings()
+    )
+    with TemporaryDirectory() as tempdir:
+        settings = CoreSettings(
+            web_agent_settings=web_agent_settings,
+            storage_settings=LocalFileStorageSettings(path=Path(tempdir) / "data"),
+            python_code_worker_pool_settings=PythonCodeWorkerPoolSettings(size=python_code_workers),
+            tracing_settings=TracingSettings(
+                enabled=True,
+                trace_path=Path(trace_path) if trace_path is not None else Path(tempdir) / "trace.json",
+                log_spans=False,
+            ),
+        )
+        core = gen_shushu_core(settings=settings, logger=logger)
+        listing_plan = compile_plan(build_listing_action())
+        detail_plan = compile_plan(build_detail_action())
+        with serve_fixture_site(
+            rows_per_page=rows_per_page, pages=pages, paragraphs_per_detail=paragraphs_per_detail
+        ) as base_url:
+            start = perf_counter()
+            with core:
+                for page in range(pages):
+                    core.perform(
+                        WebAgentCoreAction(action=OpenUrlAction(url=Url(value=f"{base_url}/index{page}.html")))
+                    )
+                    core.run(listing_plan)
+                    links = [DetailLink(link=link) for link in getattr(core.get_memory(), "links")]
+                    core.map(action=detail_plan, items=links, max_workers=max_workers)
+            seconds = perf_counter() - start
+        records = core.tracer.records
+    detail_pages = pages * rows_per_page
+    return {
+        "benchmark": "end_to_end",
+        "agent": agent,
+        "pages": pages,
+        "rows_per_page": rows_per_page,
+        "paragraphs_per_detail": paragraphs_per_detail,
+        "max_workers": max_workers,
+        "python_code_workers": python_code_workers,
+        "pages_opened": pages + detail_pages,
+        "seconds": seconds,
+        "pages_per_second": (pages + detail_pages) / seconds,
+        "stages": summarize_stages(records),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Measure end-to-end scraping throughput against a local fixture site")
+    parser.add_argument("--agents", type=str, nargs="+", default=["SELENIUM", "HTTP"], choices=["SELENIUM", "HTTP"])
+    parser.add_argument("--pages", type=int, default=2, help="Listing pages to scrape")
+    parser.add_argument("--rows", type=int, default=20, help="Detail links on each listing page")
+    parser.add_argument("--paragraphs", type=int, default=10, help="Sections on each detail page")
+    parser.add_argument("--workers", type=int, default=1, help="Detail pages processed in parallel")
+    parser.add_argument("--python-code-workers", type=int, default=1, help="Size of the python code worker pool")
+    parser.add_argument("--trace", type=str, default=None, help="Path to write the Chrome trace of the last run")
+    parser.add_argument("--output", type=str, default=None, help="Path to write JSON results (default: stdout)")
+    args = parser.parse_args()
+    results = [
+        run(
+            agent=agent,
+            pages=args.pages,
+            rows_per_page=args.rows,
+            paragraphs_per_detail=args.paragraphs,
+            max_workers=args.workers,
+            python_code_workers=args.python_code_workers,
+            trace_path=args.trace,
+        )
+        for agent in args.agents
+    ]
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
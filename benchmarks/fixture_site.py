@@ -0,0 +1,113 @@
+import http.server
+import re
+import socketserver
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+
+INDEX_PATH_PATTERN = re.compile(r"/index(\d*)\.html")
+DETAIL_PATH_PATTERN = re.compile(r"/detail(\d+)\.html")
+
+
+def listing_page_source(page: int, rows_per_page: int, pages: int) -> str:
+    rows = "\n".join(
+        f"""\
+        <li class="list-item">
+            <a href="detail{index}.html">記事 {index} - 攻略ガイド</a>
+            <p>日付: 2024-04-{index % 28 + 1:02d}</p>
+            <p>記事 {index} の概要です。冒険に必要な準備と戦略について詳しく解説します。</p>
+        </li>"""
+        for index in range(page * rows_per_page, (page + 1) * rows_per_page)
+    )
+    next_link = (
+        f'<li><a href="index{page + 1}.html">次のページへ</a></li>' if page + 1 < pages else "<li>次のページ</li>"
+    )
+    return f"""\
+<!DOCTYPE html>
+<html lang="ja">
+<head>
+    <meta charset="UTF-8">
+    <title>Benchmark 攻略記事一覧 {page}</title>
+</head>
+<body>
+    <h1>攻略記事一覧 {page}</h1>
+    <ul class="item-list">
+{rows}
+    </ul>
+    <ul class="pagination">
+        {next_link}
+    </ul>
+</body>
+</html>
+"""
+
+
+def detail_page_source(index: int, paragraphs: int) -> str:
+    body = "\n".join(
+        f"<h2>セクション {n}</h2>\n<p>{'記事 ' + str(index) + ' のセクション ' + str(n) + ' の本文です。' * 20}</p>"
+        for n in range(paragraphs)
+    )
+    return f"""\
+<!DOCTYPE html>
+<html lang="ja">
+<head>
+    <meta charset="UTF-8">
+    <title>記事 {index}</title>
+</head>
+<body>
+    <h1>記事 {index} - 攻略ガイド</h1>
+    <p class="date">日付: 2024-04-{index % 28 + 1:02d}</p>
+    <article>
+{body}
+    </article>
+    <a href="index.html">攻略記事一覧に戻る</a>
+</body>
+</html>
+"""
+
+
+@contextmanager
+def serve_fixture_site(
+    rows_per_page: int = 20, pages: int = 1, paragraphs_per_detail: int = 3
+) -> Generator[str, None, None]:
+    """Serves generated listing pages (`/index.html`, `/index1.html`, ...) and detail pages (`/detail0.html`, ...)."""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def serve_page(self, page: str) -> None:
+            data = page.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            path = "/index.html" if self.path == "/" else self.path
+            index_match = INDEX_PATH_PATTERN.fullmatch(path)
+            if index_match is not None:
+                page = int(index_match.group(1) or 0)
+                if page < pages:
+                    self.serve_page(listing_page_source(page, rows_per_page, pages))
+                    return
+            detail_match = DETAIL_PATH_PATTERN.fullmatch(path)
+            if detail_match is not None:
+                index = int(detail_match.group(1))
+                if index < rows_per_page * pages:
+                    self.serve_page(detail_page_source(index, paragraphs_per_detail))
+                    return
+            self.send_error(404)
+
+        def log_message(self, format: str, *args: object) -> None: ...
+
+    class Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+        daemon_threads = True
+
+    with Server(("localhost", 0), Handler) as httpd:
+        port = httpd.server_address[1]
+        server_thread = threading.Thread(target=httpd.serve_forever)
+        server_thread.start()
+        try:
+            yield f"http://localhost:{port}"
+        finally:
+            httpd.shutdown()
+            server_thread.join()
@@ -0,0 +1,104 @@
+import json
+import sys
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Any
+
+from lxml.html import HtmlElement, document_fromstring, tostring
+
+from shushu.models import Element, Url, get_html_parser_type, set_html_parser_type
+from shushu.types import HtmlParserType
+
+from .fixture_site import detail_page_source, listing_page_source
+
+LIST_ITEM_XPATH = "//li[contains(@class, 'list-item')]"
+
+
+def listing_item_sources(rows: int) -> list[str]:
+    """Returns the HTML of the list items of a listing page, as a web agent selects them."""
+    document = document_fromstring(listing_page_source(page=0, rows_per_page=rows, pages=1))
+    return [tostring(e, encoding="unicode", with_tail=False) for e in document.xpath(LIST_ITEM_XPATH)]
+
+
+def detail_sources(count: int, paragraphs: int) -> list[str]:
+    sources: list[str] = []
+    for index in range(count):
+        body = document_fromstring(detail_page_source(index=index, paragraphs=paragraphs)).find("body")
+        if isinstance(body, HtmlElement):
+            sources.append(tostring(body, encoding="unicode", with_tail=False))
+    return sources
+
+
+def inspect(sources: list[str]) -> int:
+    """Reads what processor code typically reads from every element and returns the length of the collected text."""
+    url = Url(value="http://localhost:8080/")
+    text_length = 0
+    for source in sources:
+        element = Element(url=url, html_source=source)
+        element.classes
+        element.tag_name
+        text_length += len(element.text)
+    return text_length
+
+
+def run(html_parser_types: list[HtmlParserType], rows: int, details: int, paragraphs: int) -> list[dict[str, Any]]:
+    workloads = {
+        "listing_items": listing_item_sources(rows),
+        "detail_bodies": detail_sources(details, paragraphs),
+    }
+    results: list[dict[str, Any]] = []
+    selected_html_parser_type = get_html_parser_type()
+    try:
+        for workload, sources in workloads.items():
+            megabytes = sum(len(source.encode("utf-8")) for source in sources) / (1024 * 1024)
+            for html_parser_type in html_parser_types:
+                # the parser is selected for the process, as a python code worker does at startup
+                set_html_parser_type(html_parser_type)
+                start = perf_counter()
+                text_length = inspect(sources)
+                seconds = perf_counter() - start
+                results.append(
+                    {
+                        "benchmark": "html_parsing",
+                        "workload": workload,
+                        "html_parser_type": html_parser_type.value,
+                        "elements": len(sources),
+                        "megabytes": megabytes,
+                        "text_length": text_length,
+                        "seconds": seconds,
+                        "seconds_per_megabyte": seconds / megabytes,
+                    }
+                )
+    finally:
+        set_html_parser_type(selected_html_parser_type)
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(
+        description="Compare Element inspection throughput of the parsers selectable with CoreSettings.html_parser_type"
+    )
+    parser.add_argument(
+        "--parsers",
+        type=HtmlParserType,
+        nargs="+",
+        default=list(HtmlParserType),
+        choices=list(HtmlParserType),
+        help="Parsers to compare",
+    )
+    parser.add_argument("--rows", type=int, default=2000, help="List items on the listing page")
+    parser.add_argument("--details", type=int, default=50, help="Detail pages")
+    parser.add_argument("--paragraphs", type=int, default=20, help="Sections on each detail page")
+    parser.add_argument("--output", type=str, default=None, help="Path to write JSON results (default: stdout)")
+    args = parser.parse_args()
+    results = run(args.parsers, rows=args.rows, details=args.details, paragraphs=args.paragraphs)
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import json
+import sys
+from argparse import ArgumentParser
+from collections.abc import Callable
+from logging import getLogger
+from time import perf_counter
+from typing import Any, TypeVar
+
+from shushu.actions import OpenUrlAction, SetSelectorAction, XPathSelector
+from shushu.models import Url
+from shushu.settings import ChromeSeleniumDriverSettings
+from shushu.types import XPath
+from shushu.web_agents.selenium_drivers.base import BaseSeleniumDriver
+from shushu.web_agents.selenium_drivers.chrome import ChromeSeleniumDriver
+
+from .fixture_site import serve_fixture_site
+
+T = TypeVar("T")
+
+LIST_ITEM_XPATH = XPath("//li[contains(@class, 'list-item')]")
+
+
+def count_round_trips(driver: BaseSeleniumDriver, func: Callable[[], T]) -> tuple[int, float, T]:
+    """Counts WebDriver commands issued by `func` by wrapping `WebDriver.execute`, the single exit point of commands."""
+    web_driver = driver._driver
+    original_execute = web_driver.execute
+    count = 0
+
+    def counting_execute(*args: Any, **kwargs: Any) -> Any:
+        nonlocal count
+        count += 1
+        return original_execute(*args, **kwargs)
+
+    setattr(web_driver, "execute", counting_execute)
+    try:
+        start = perf_counter()
+        result = func()
+        elapsed = perf_counter() - start
+    finally:
+        delattr(web_driver, "execute")
+    return count, elapsed, result
+
+
+def run(rows_list: list[int]) -> list[dict[str, Any]]:
+    logger = getLogger("shushu.benchmarks")
+    driver = ChromeSeleniumDriver(settings=ChromeSeleniumDriverSettings(), logger=logger)
+    results: list[dict[str, Any]] = []
+    for rows in rows_list:
+        with serve_fixture_site(rows_per_page=rows) as base_url:
+            driver.perform(OpenUrlAction(url=Url(value=f"{base_url}/index.html")))
+            driver.perform(SetSelectorAction(selector=XPathSelector(xpath=LIST_ITEM_XPATH)))
+            for implementation, func in (
+                ("execute_script", lambda: len(driver.get_selected_elements().elements)),
+                ("find_elements", lambda: len(driver._select_elements_by_find_elements(LIST_ITEM_XPATH))),
+            ):
+                round_trips, seconds, selected = count_round_trips(driver, func)
+                results.append(
+                    {
+                        "benchmark": "selenium_round_trips",
+                        "implementation": implementation,
+                        "rows": rows,
+                        "selected": selected,
+                        "round_trips": round_trips,
+                        "seconds": seconds,
+                    }
+                )
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Compare WebDriver round trips of element extraction strategies")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 500], help="Rows on the listing page")
+    parser.add_argument("--output", type=str, default=None, help="Path to write JSON results (default: stdout)")
+    args = parser.parse_args()
+    results = run(args.rows)
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,12 @@ from shushu.actions import (
 )
 from shushu.core import gen_shushu_core
 from shushu.models import Url
-from shushu.settings import CoreSettings, LocalFileStorageSettings, LoggerSettings
+from shushu.settings import (
+    CoreSettings,
+    HttpWebAgentSettings,
+    LocalFileStorageSettings,
+    LoggerSettings,
+)
 
 
 def test_get_minimum_enclosing_element_with_multiple_texts(http_server_fixture: str) -> None:
@@ -165,3 +170,47 @@ def convert(element_sequence: ElementSequence) -> Data:
                     assert any(
                         [all([d[k] == e[k] for k in ("link", "title", "date", "description")]) for e in expected]
                     )
+
+
+def test_http_web_agent_collects_list_pages(http_server_fixture: str) -> None:
+    with TemporaryDirectory() as tempdir:
+        settings = CoreSettings(
+            web_agent_settings=HttpWebAgentSettings(), storage_settings=LocalFileStorageSettings(path=tempdir)
+        )
+        logger = get_logger(settings=LoggerSettings())
+        core = gen_shushu_core(settings=settings, logger=logger)
+        with core:
+            core.perform(action=WebAgentCoreAction(action=OpenUrlAction(url=Url(value=http_server_fixture))))
+            core.perform(
+                action=WebAgentCoreAction(
+                    action=SetSelectorAction(
+                        selector=MinimumEnclosingElementWithMultipleTextsSelector(target_strings=["始まりの村", "2024"])
+                    )
+                )
+            )
+            minelem = core.web_agent.get_selected_element()
+            assert minelem.tag_name == "li"
+            assert "list-item" in minelem.classes
+            core.perform(
+                action=WebAgentCoreAction(
+                    action=SetSelectorAction(selector=XPathSelector(xpath="//li[contains(@class, 'list-item')]"))
+                )
+            )
+            similar_elems = core.web_agent.get_selected_elements()
+            assert len(similar_elems.elements) == 3
+            assert "始まりの村" in similar_elems.elements[0].text
+            core.perform(
+                action=WebAgentCoreAction(
+                    action=SetSelectorAction(selector=XPathSelector(xpath="//a[text()='次のページへ']"))
+                )
+            )
+            core.perform(action=WebAgentCoreAction(action=ClickSelectedElementAction()))
+            core.perform(
+                action=WebAgentCoreAction(
+                    action=SetSelectorAction(selector=XPathSelector(xpath="//li[contains(@class, 'list-item')]"))
+                )
+            )
+            similar_elems2 = core.web_agent.get_selected_elements()
+            assert len(similar_elems2.elements) == 3
+            assert "冒険者の港町" in similar_elems2.elements[0].text
+            assert str(similar_elems2.elements[0].url.value) == f"{http_server_fixture}/index1.html"
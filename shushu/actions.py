@@ -10,6 +10,7 @@ from .types import (
     CoreActionType,
     DataProcessorId,
     DataProcessorType,
+    PaginationMode,
     PayloadType,
     QueryString,
     SelectorId,
@@ -34,6 +35,28 @@ class SequencialCoreAction(BaseCoreAction):
     actions: Sequence["CoreAction"]
 
 
+class ParallelCoreAction(BaseCoreAction):
+    """Performs `action` for every item of a memory attribute, each item in its own memory.
+
+    Items are processed by up to `max_workers` workers, each with its own web agent. The collected memories of the
+    items are stored in the memory as a `DataSequence`, in the order of the items when `ordered` is True and in the
+    order of completion otherwise.
+    """
+
+    type: Literal[CoreActionType.PARALLEL] = CoreActionType.PARALLEL
+    payload: "MemoryPayload"
+    action: "CoreAction"
+    max_workers: int = Field(default=4, ge=1)
+    ordered: bool = True
+
+
+class OpenMemoryUrlCoreAction(BaseCoreAction):
+    """Opens the URL stored in the memory (or in its `attribute`) with the web agent."""
+
+    type: Literal[CoreActionType.OPEN_MEMORY_URL] = CoreActionType.OPEN_MEMORY_URL
+    attribute: Optional[str] = None
+
+
 class BaseWebAgentAction(BaseUpdateTimeAwareModel, BaseEntity[WebAgentActionId]):
     type: WebAgentActionType
 
@@ -104,7 +127,10 @@ class SelectedElementPayload(BasePayload):
 
 
 class SelectedElementsPayload(BasePayload):
+    """The elements matched by the selector, as a `CompactElementSequence` when `compact` is True."""
+
     type: Literal[PayloadType.SELECTED_ELEMENTS] = PayloadType.SELECTED_ELEMENTS
+    compact: bool = False
 
 
 Payload = Annotated[Union[MemoryPayload, SelectedElementPayload, SelectedElementsPayload], Field(discriminator="type")]
@@ -145,7 +171,53 @@ class StorageCoreAction(BaseCoreAction):
     payload: Optional[Payload] = None
 
 
+class PaginateCoreAction(BaseCoreAction):
+    """Performs `action` on the current page and on every following page.
+
+    After each page the element selected by `next_selector` is followed, by opening its href when `mode` is OPEN_URL
+    or by clicking it when `mode` is CLICK, until it matches nothing or `max_pages` pages have been processed. In
+    OPEN_URL mode the pagination also stops when the href leads back to a page it has visited. The next element is
+    looked up before `action` runs, so `action` may navigate away in OPEN_URL mode but must leave the web
+    agent on the page in CLICK mode. With `prefetch`, the web agent is asked to load the next page while `action`
+    processes the current one.
+    """
+
+    type: Literal[CoreActionType.PAGINATE] = CoreActionType.PAGINATE
+    action: "CoreAction"
+    next_selector: Selector
+    mode: PaginationMode = PaginationMode.OPEN_URL
+    max_pages: Optional[int] = Field(default=None, ge=1)
+    prefetch: bool = False
+
+
+class StreamCoreAction(BaseCoreAction):
+    """Converts the selected elements with `action` chunk by chunk and saves the result of every chunk.
+
+    The web agent yields the elements in sequences of at most `chunk_size` elements (`CompactElementSequence`s when
+    `compact` is True). Each chunk is converted into the memory, which is saved with `storage_action` as a
+    `StorageCoreAction` with `storage_payload` would save it, before the next chunk is read. Only one chunk is held at
+    a time however many elements the selector matches, and the memory holds the result of the last chunk afterwards.
+    """
+
+    type: Literal[CoreActionType.STREAM] = CoreActionType.STREAM
+    action: DataProcessorAction
+    storage_action: StorageAction = Field(default_factory=SaveDataAction)
+    storage_payload: MemoryPayload = Field(default_factory=MemoryPayload)
+    chunk_size: int = Field(default=100, ge=1)
+    compact: bool = False
+
+
 CoreAction = Annotated[
-    Union[GenerateIdCoreAction, WebAgentCoreAction, DataProcessorCoreAction, StorageCoreAction, SequencialCoreAction],
+    Union[
+        GenerateIdCoreAction,
+        WebAgentCoreAction,
+        DataProcessorCoreAction,
+        StorageCoreAction,
+        SequencialCoreAction,
+        ParallelCoreAction,
+        OpenMemoryUrlCoreAction,
+        PaginateCoreAction,
+        StreamCoreAction,
+    ],
     Field(discriminator="type"),
 ]
@@ -0,0 +1,307 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import AbstractAsyncContextManager
+from logging import Logger
+from types import TracebackType
+from typing import Any, ClassVar, Optional, Union
+
+from oltl import Id
+
+from .actions import (
+    CoreAction,
+    MemoryPayload,
+    OpenUrlAction,
+    Payload,
+    SelectedElementPayload,
+    SelectedElementsPayload,
+    SetSelectorAction,
+    StorageAction,
+    WebAgentAction,
+)
+from .core import (
+    BaseShushuCore,
+    ItemErrorHandler,
+    build_core_components,
+    load_memory_items,
+    load_memory_url,
+    load_storage_payloads,
+)
+from .data_processors.async_base import ThreadedAsyncDataProcessor
+from .models import BaseDataModel, DataSequence, Element, IdData
+from .plans import (
+    DataProcessorStep,
+    GenerateIdStep,
+    OpenMemoryUrlStep,
+    PaginateStep,
+    ParallelStep,
+    Plan,
+    StorageStep,
+    StreamStep,
+    WebAgentStep,
+)
+from .settings import CoreSettings
+from .storages.async_base import BaseAsyncStorage, ThreadedAsyncStorage
+from .web_agents.async_base import BaseAsyncWebAgent, ThreadedAsyncWebAgent
+from .web_agents.selenium_drivers.exceptions import NoElementFoundError
+
+
+class AsyncShushuCore(
+    BaseShushuCore[BaseAsyncWebAgent, BaseAsyncStorage], AbstractAsyncContextManager["AsyncShushuCore"]
+):
+    """The asyncio counterpart of `ShushuCore`.
+
+    Page loads, data processors and storage writes of concurrent pipelines overlap under one event loop.
+    """
+
+    async def __aenter__(self) -> "AsyncShushuCore":
+        await self.web_agent.__aenter__()
+        return self
+
+    async def __aexit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> bool | None:
+        for web_agent in self._worker_web_agents:
+            await web_agent.__aexit__(None, None, None)
+        self._worker_web_agents.clear()
+        await self.web_agent.__aexit__(__exc_type, __exc_value, __traceback)
+        await self.storage.flush()
+        if self.checkpoint_journal is not None:
+            await asyncio.to_thread(self.checkpoint_journal.close)
+        await asyncio.to_thread(self.tracer.close)
+        if self.python_code_worker_pool is not None:
+            await asyncio.to_thread(self.python_code_worker_pool.close)
+        for closer in self.closers:
+            await asyncio.to_thread(closer)
+        return None
+
+    async def _mark_completed(self, key: str) -> None:
+        if self.checkpoint_journal is not None and self.checkpoint_journal.mark_completed(key):
+            await self.storage.flush()
+            await asyncio.to_thread(self.checkpoint_journal.flush)
+
+    async def _run_item(
+        self,
+        plan: Plan,
+        web_agent: BaseAsyncWebAgent,
+        key: Optional[str],
+        item: BaseDataModel,
+        on_error: Optional[ItemErrorHandler] = None,
+    ) -> Optional[BaseDataModel]:
+        child = self._spawn(web_agent=web_agent, memory=item, checkpoint_scope=self._item_checkpoint_scope(key, item))
+        try:
+            await child.run(plan)
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(item, e)
+            return None
+        if key is not None:
+            await self._mark_completed(key)
+        return child.get_memory()
+
+    async def map(
+        self,
+        action: Union[CoreAction, Plan],
+        items: Sequence[BaseDataModel],
+        max_workers: int = 1,
+        ordered: bool = True,
+        checkpoint_prefix: Optional[str] = None,
+        on_error: Optional[ItemErrorHandler] = None,
+        use_own_web_agent: bool = False,
+    ) -> list[BaseDataModel]:
+        """Performs `action` once per item, with the item as the memory, and returns the resulting memories.
+
+        Up to `max_workers` items are in flight at once, each with a web agent created by `web_agent_factory`, but no
+        more than `max_worker_web_agents`. Otherwise it behaves like `ShushuCore.map`.
+        """
+        plan, keyed_items, worker_count = self._plan_map(
+            action, items, max_workers, checkpoint_prefix, use_own_web_agent
+        )
+        web_agent_factory = self.web_agent_factory
+        if web_agent_factory is None or worker_count == 1:
+            results = [await self._run_item(plan, self.web_agent, key, item, on_error) for key, item in keyed_items]
+            return [result for result in results if result is not None]
+        idle_web_agents: asyncio.LifoQueue[Optional[BaseAsyncWebAgent]] = asyncio.LifoQueue()
+        for idle_web_agent in self._idle_web_agents(worker_count, use_own_web_agent):
+            idle_web_agents.put_nowait(idle_web_agent)
+
+        async def perform_item(key: Optional[str], item: BaseDataModel) -> Optional[BaseDataModel]:
+            web_agent = await idle_web_agents.get()
+            try:
+                if web_agent is None:
+                    web_agent = await web_agent_factory().__aenter__()
+                    self._worker_web_agents.append(web_agent)
+                return await self._run_item(plan, web_agent, key, item, on_error)
+            finally:
+                idle_web_agents.put_nowait(web_agent)
+
+        self.log_info(
+            "Starting parallel actions.", extra={"item_count": len(keyed_items), "worker_count": worker_count}
+        )
+        tasks = [asyncio.ensure_future(perform_item(key, item)) for key, item in keyed_items]
+        try:
+            if ordered:
+                results = list(await asyncio.gather(*tasks))
+            else:
+                results = [await task for task in asyncio.as_completed(tasks)]
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.log_info("Finished parallel actions.", extra={"item_count": len(keyed_items)})
+        return [result for result in results if result is not None]
+
+    async def _load_selected_element(self, payload: SelectedElementPayload) -> BaseDataModel:
+        return await self.web_agent.get_selected_element()
+
+    async def _load_selected_elements(self, payload: SelectedElementsPayload) -> BaseDataModel:
+        if payload.compact:
+            return await self.web_agent.get_selected_elements_compact()
+        return await self.web_agent.get_selected_elements()
+
+    async def _load_memory(self, payload: MemoryPayload) -> BaseDataModel:
+        return self.get_memory()
+
+    _payload_loaders: ClassVar[dict[type, Callable[["AsyncShushuCore", Any], Awaitable[BaseDataModel]]]] = {
+        SelectedElementPayload: _load_selected_element,
+        SelectedElementsPayload: _load_selected_elements,
+        MemoryPayload: _load_memory,
+    }
+
+    async def _load_payload(self, payload: Payload) -> BaseDataModel:
+        with self.tracer.span(payload.type.value, category="extraction"):
+            return await self._payload_loaders[type(payload)](self, payload)
+
+    async def _perform_parallel(self, step: ParallelStep) -> None:
+        results = await self.map(
+            action=step.plan,
+            items=load_memory_items(self.get_memory(), step.payload),
+            max_workers=step.max_workers,
+            ordered=step.ordered,
+            checkpoint_prefix=step.checkpoint_prefix,
+        )
+        self.set_memory(DataSequence(data=results))
+
+    async def _find_next_page_element(self, step: PaginateStep) -> Optional[Element]:
+        await self._perform_web_agent_action(SetSelectorAction(selector=step.next_selector))
+        try:
+            return await self.web_agent.get_selected_element()
+        except NoElementFoundError:
+            return None
+
+    async def _perform_paginate(self, step: PaginateStep) -> None:
+        page_count = 0
+        visited_urls: set[str] = set()
+        while True:
+            page_count += 1
+            has_next_page, next_url = False, None
+            if step.max_pages is None or page_count < step.max_pages:
+                has_next_page, next_url = self._next_page(step, await self._find_next_page_element(step), visited_urls)
+            if step.prefetch and next_url is not None:
+                await self.web_agent.prefetch(next_url)
+            checkpoint_key = self._page_checkpoint_key(step, page_count)
+            if not self._is_completed(checkpoint_key):
+                await self.run(step.plan)
+                await self._mark_completed(checkpoint_key)
+            if not has_next_page:
+                break
+            for action in self._next_page_actions(step, next_url):
+                await self._perform_web_agent_action(action)
+        self.log_info("Finished pagination.", extra={"action_id": str(step.action_id), "page_count": page_count})
+
+    async def _perform_open_memory_url(self, step: OpenMemoryUrlStep) -> None:
+        await self._perform_web_agent_action(OpenUrlAction(url=load_memory_url(self.get_memory(), step.attribute)))
+
+    async def _perform_generate_id(self, step: GenerateIdStep) -> None:
+        self.set_memory(IdData(value=Id.generate()))
+
+    async def _perform_web_agent_action(self, action: WebAgentAction) -> None:
+        with self._web_agent_span(action):
+            await self.web_agent.perform(action)
+
+    async def _perform_web_agent(self, step: WebAgentStep) -> None:
+        await self._perform_web_agent_action(step.action)
+
+    async def _save_memory(self, action: StorageAction, payload: MemoryPayload) -> None:
+        for data in load_storage_payloads(self.get_memory(), payload):
+            with self._storage_span(action, data):
+                await self.storage.perform(action=action, payload=data)
+
+    async def _perform_storage(self, step: StorageStep) -> None:
+        if step.payload is None:
+            with self._storage_span(step.action):
+                await self.storage.perform(action=step.action)
+            return
+        await self._save_memory(step.action, step.payload)
+
+    async def _perform_data_processor(self, step: DataProcessorStep) -> None:
+        payload = await self._load_payload(step.payload)
+        with self._data_processor_span(step.action, payload):
+            data_processor = ThreadedAsyncDataProcessor(
+                data_processor=self._create_data_processor(step, payload),
+                logger=self.logger,
+            )
+            self.set_memory(await data_processor.perform())
+
+    def _iter_selected_element_chunks(self, step: StreamStep) -> AsyncIterator[BaseDataModel]:
+        if step.compact:
+            return self.web_agent.iter_selected_elements_compact(step.chunk_size)
+        return self.web_agent.iter_selected_elements(step.chunk_size)
+
+    async def _perform_stream(self, step: StreamStep) -> None:
+        chunk_count = 0
+        async for chunk in self._iter_selected_element_chunks(step):
+            chunk_count += 1
+            with self._data_processor_span(step.action, chunk, chunk=chunk_count):
+                data_processor = ThreadedAsyncDataProcessor(
+                    data_processor=self._create_data_processor(step, chunk),
+                    logger=self.logger,
+                )
+                self.set_memory(await data_processor.perform())
+            await self._save_memory(step.storage_action, step.storage_payload)
+        self.log_info("Finished streaming.", extra={"action_id": str(step.action_id), "chunk_count": chunk_count})
+
+    _step_handlers: ClassVar[dict[type, Callable[["AsyncShushuCore", Any], Awaitable[None]]]] = {
+        ParallelStep: _perform_parallel,
+        PaginateStep: _perform_paginate,
+        OpenMemoryUrlStep: _perform_open_memory_url,
+        GenerateIdStep: _perform_generate_id,
+        WebAgentStep: _perform_web_agent,
+        StorageStep: _perform_storage,
+        DataProcessorStep: _perform_data_processor,
+        StreamStep: _perform_stream,
+    }
+
+    async def run(self, plan: Plan) -> None:
+        for step in plan.steps:
+            with self._step_span(step):
+                await self._step_handlers[type(step)](self, step)
+
+    async def perform(self, action: CoreAction) -> None:
+        await self.run(self.compile(action))
+
+
+def gen_async_shushu_core(settings: CoreSettings, logger: Logger) -> AsyncShushuCore:
+    """Builds an `AsyncShushuCore` whose components are the synchronous ones running in worker threads."""
+    components = build_core_components(settings=settings, logger=logger)
+
+    def create_web_agent() -> BaseAsyncWebAgent:
+        return ThreadedAsyncWebAgent(
+            web_agent=components.web_agent_factory.create(settings=settings.web_agent_settings), logger=logger
+        )
+
+    return AsyncShushuCore(
+        logger=logger,
+        web_agent=create_web_agent(),
+        storage=ThreadedAsyncStorage(storage=components.storage, logger=logger),
+        python_code_worker_pool=components.python_code_worker_pool,
+        web_agent_factory=create_web_agent,
+        max_worker_web_agents=components.max_worker_web_agents,
+        tracer=components.tracer,
+        checkpoint_journal=components.checkpoint_journal,
+        closers=[components.web_agent_factory.close],
+        html_parser_type=settings.html_parser_type,
+    )
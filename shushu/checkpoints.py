@@ -0,0 +1,124 @@
+from collections.abc import Sequence
+from logging import Logger
+from threading import Lock
+from typing import Optional
+
+from .base import BaseShushuComponent
+from .hashing import compute_content_hash
+from .line_journal import LineJournal
+from .models import BaseDataModel
+from .settings import NewOrExistingPath
+
+
+def item_checkpoint_key(prefix: str, item: BaseDataModel) -> str:
+    """Returns the key under which the work on `item` is recorded.
+
+    Items are identified by their content because their ids are generated anew on every run.
+
+    >>> from oltl import Id
+    >>> from shushu.models import IdData
+    >>> value = Id.generate()
+    >>> item_checkpoint_key("action", IdData(value=value)) == item_checkpoint_key("action", IdData(value=value))
+    True
+    >>> item_checkpoint_key("action", IdData(value=value)).startswith("action:")
+    True
+    """
+    return f"{prefix}:{compute_content_hash(item)}"
+
+
+def scoped_checkpoint_prefix(scope: Optional[str], prefix: str) -> str:
+    """Returns `prefix` for the work done on behalf of the item recorded under `scope`.
+
+    Nested maps and paginations run once per item of the enclosing map, so their keys must not collide across items.
+
+    >>> scoped_checkpoint_prefix(None, "action")
+    'action'
+    >>> scoped_checkpoint_prefix("outer:0123", "action")
+    'outer:0123/action'
+    """
+    if scope is None:
+        return prefix
+    return f"{scope}/{prefix}"
+
+
+def page_checkpoint_key(prefix: str, page_number: int) -> str:
+    """
+    >>> page_checkpoint_key("action", 3)
+    'action:page:3'
+    """
+    return f"{prefix}:page:{page_number}"
+
+
+class CheckpointJournal(BaseShushuComponent):
+    """Records the keys of completed units of work in a file so that a restarted crawl can skip them.
+
+    Every line of the journal at `path` is the key of a completed unit. With `resume` the keys of an existing journal
+    are loaded, otherwise the journal is started afresh. Completed keys are kept in memory until `flush`, and
+    `mark_completed` reports when `flush_interval` keys are pending, so that callers can flush the data produced by
+    those units before the journal claims they are done.
+    """
+
+    def __init__(self, path: NewOrExistingPath, logger: Logger, resume: bool = True, flush_interval: int = 100) -> None:
+        super(CheckpointJournal, self).__init__(logger=logger)
+        self._path = path
+        self._resume = resume
+        self._flush_interval = flush_interval
+        self._completed: set[str] = set()
+        self._journal = LineJournal(path)
+        self._lock = Lock()
+        if not path.exists():
+            return
+        if not resume:
+            path.unlink()
+            return
+        self._completed.update(self._journal.read_lines())
+        self.log_info("Resuming from checkpoint journal.", extra={"path": str(path), "completed_count": len(self)})
+
+    def __del__(self) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._completed)
+
+    @property
+    def path(self) -> NewOrExistingPath:
+        return self._path
+
+    @property
+    def resume(self) -> bool:
+        return self._resume
+
+    @property
+    def flush_interval(self) -> int:
+        return self._flush_interval
+
+    def is_completed(self, key: str) -> bool:
+        return key in self._completed
+
+    def mark_completed(self, key: str) -> bool:
+        """Records `key` as completed and returns whether the journal should be flushed."""
+        with self._lock:
+            if key not in self._completed:
+                self._completed.add(key)
+                self._journal.append(key)
+            return self._journal.pending_count >= self.flush_interval
+
+    def pending_items(self, prefix: str, items: Sequence[BaseDataModel]) -> list[tuple[str, BaseDataModel]]:
+        """Returns the items that are not completed under `prefix`, each with its key."""
+        keyed_items = [(item_checkpoint_key(prefix, item), item) for item in items]
+        pending_items = [(key, item) for key, item in keyed_items if not self.is_completed(key)]
+        if len(pending_items) < len(keyed_items):
+            self.log_info(
+                "Skipping completed items.",
+                extra={"checkpoint_prefix": prefix, "skipped_count": len(keyed_items) - len(pending_items)},
+            )
+        return pending_items
+
+    def flush(self) -> None:
+        with self._lock:
+            self._journal.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._journal.flush()
+            self._journal.close()
@@ -1,55 +1,435 @@
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import AbstractContextManager
 from logging import Logger
+from queue import LifoQueue
+from threading import Lock
 from types import TracebackType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Generic,
+    NamedTuple,
+    Optional,
+    TypeVar,
+    Union,
+)
+from urllib.parse import urldefrag, urljoin
 
 from oltl import Id
 
 from .actions import (
+    ClickSelectedElementAction,
     CoreAction,
-    DataProcessorCoreAction,
-    GenerateIdCoreAction,
+    DataProcessorAction,
     MemoryPayload,
+    OpenUrlAction,
     Payload,
     SelectedElementPayload,
     SelectedElementsPayload,
-    SequencialCoreAction,
-    StorageCoreAction,
-    WebAgentCoreAction,
+    SetSelectorAction,
+    StorageAction,
+    WebAgentAction,
 )
 from .base import BaseShushuComponent
+from .checkpoints import (
+    CheckpointJournal,
+    item_checkpoint_key,
+    page_checkpoint_key,
+    scoped_checkpoint_prefix,
+)
+from .data_processors.base import BaseDataProcessor
 from .data_processors.factory import DataProcessorFactory
 from .exceptions import MemoryNotSetError
-from .models import BaseDataModel, IdData
+from .models import (
+    BaseDataModel,
+    DataSequence,
+    Element,
+    IdData,
+    Url,
+    UrlData,
+)
+from .plans import (
+    DataProcessorStep,
+    GenerateIdStep,
+    OpenMemoryUrlStep,
+    PaginateStep,
+    ParallelStep,
+    Plan,
+    PlanStep,
+    StorageStep,
+    StreamStep,
+    WebAgentStep,
+    action_checkpoint_prefix,
+    bind_plan,
+    compile_plan,
+)
 from .settings import CoreSettings
 from .storages.base import BaseStorage
 from .storages.factory import StorageFactory
+from .tracing import Span, Tracer
+from .types import HtmlParserType, PaginationMode
 from .web_agents.base import BaseWebAgent
 from .web_agents.factory import WebAgentFactory
+from .web_agents.selenium_drivers.exceptions import NoElementFoundError
+
+if TYPE_CHECKING:
+    from .data_processors.python_code_worker_pool import PythonCodeWorkerPool
+
+# receives an item of a map whose action failed, together with the exception
+ItemErrorHandler = Callable[[BaseDataModel, Exception], None]
+CoreWebAgentT = TypeVar("CoreWebAgentT")
+CoreStorageT = TypeVar("CoreStorageT")
+CoreT = TypeVar("CoreT", bound="BaseShushuCore[Any, Any]")
+
+
+def load_memory_items(memory: BaseDataModel, payload: MemoryPayload) -> list[BaseDataModel]:
+    """Returns the items a `ParallelCoreAction` fans out over."""
+    items = memory if payload.attribute is None else getattr(memory, payload.attribute)
+    if isinstance(items, BaseDataModel):
+        items = [items]
+    for item in items:
+        if not isinstance(item, BaseDataModel):
+            raise TypeError(f"Items must be data models, but got {type(item).__name__}")
+    return list(items)
+
+
+def load_memory_url(memory: BaseDataModel, attribute: Optional[str]) -> Url:
+    value = memory if attribute is None else getattr(memory, attribute)
+    if isinstance(value, UrlData):
+        return value.url
+    if isinstance(value, Url):
+        return value
+    return Url(value=str(value))
+
+
+def get_next_page_url(element: Element) -> Optional[str]:
+    """Returns the absolute URL the "next" element of a `PaginateCoreAction` links to, if any."""
+    href = element.get_attribute("href")
+    if href is None:
+        return None
+    return urljoin(str(element.url.value), href)
+
+
+def is_visited_page(url: str, visited_urls: set[str]) -> bool:
+    """Returns whether the page at `url` is one of `visited_urls`, and adds it to them.
+
+    URLs that differ only in their fragment, such as the ones of `href="#"` links, point to the same page.
+
+    >>> visited_urls: set[str] = set()
+    >>> is_visited_page("http://example.com/index.html", visited_urls)
+    False
+    >>> is_visited_page("http://example.com/index.html#", visited_urls)
+    True
+    """
+    page_url = urldefrag(url).url
+    if page_url in visited_urls:
+        return True
+    visited_urls.add(page_url)
+    return False
+
+
+def load_storage_payloads(memory: BaseDataModel, payload: MemoryPayload) -> list[BaseDataModel]:
+    """Returns the data a `StorageCoreAction` with a memory payload saves."""
+    if payload.attribute is None:
+        return [memory]
+    value = getattr(memory, payload.attribute)
+    if payload.expand:
+        return list(value)
+    return [value]
+
+
+def limit_worker_count(max_workers: int, max_worker_web_agents: Optional[int]) -> int:
+    """Returns the number of workers a map may use when only `max_worker_web_agents` extra web agents can be open.
+
+    With a single worker the items are processed with the core's own web agent.
+
+    >>> limit_worker_count(4, None)
+    4
+    >>> limit_worker_count(4, 2)
+    2
+    >>> limit_worker_count(4, 0)
+    1
+    """
+    if max_worker_web_agents is None:
+        return max_workers
+    return max(1, min(max_workers, max_worker_web_agents))
+
+
+class CoreComponents(NamedTuple):
+    """The components of a core built from `CoreSettings`, shared by `gen_shushu_core` and `gen_async_shushu_core`."""
+
+    web_agent_factory: WebAgentFactory
+    storage: BaseStorage
+    python_code_worker_pool: Optional["PythonCodeWorkerPool"]
+    tracer: Tracer
+    checkpoint_journal: Optional[CheckpointJournal]
+    max_worker_web_agents: Optional[int]
+
 
+def build_core_components(settings: CoreSettings, logger: Logger) -> CoreComponents:
+    web_agent_factory = WebAgentFactory(logger=logger)
+    storage = StorageFactory(logger=logger).create(settings=settings.storage_settings)
+    python_code_worker_pool = None
+    if settings.python_code_worker_pool_settings.size > 0:
+        from .data_processors.python_code_worker_pool import PythonCodeWorkerPool
+
+        python_code_worker_pool = PythonCodeWorkerPool(
+            size=settings.python_code_worker_pool_settings.size,
+            max_tasks_per_worker=settings.python_code_worker_pool_settings.max_tasks_per_worker,
+            logger=logger,
+            html_parser_type=settings.html_parser_type,
+        )
+    tracer = Tracer(
+        logger=logger,
+        enabled=settings.tracing_settings.enabled,
+        trace_path=settings.tracing_settings.trace_path,
+        log_spans=settings.tracing_settings.log_spans,
+    )
+    checkpoint_journal = None
+    if settings.checkpoint_settings is not None:
+        checkpoint_journal = CheckpointJournal(
+            path=settings.checkpoint_settings.path,
+            logger=logger,
+            resume=settings.checkpoint_settings.resume,
+            flush_interval=settings.checkpoint_settings.flush_interval,
+        )
+    # the core's own web agent holds one of the drivers of a pool while the workers of a map open theirs
+    capacity = web_agent_factory.get_capacity(settings.web_agent_settings)
+    return CoreComponents(
+        web_agent_factory=web_agent_factory,
+        storage=storage,
+        python_code_worker_pool=python_code_worker_pool,
+        tracer=tracer,
+        checkpoint_journal=checkpoint_journal,
+        max_worker_web_agents=None if capacity is None else capacity - 1,
+    )
+
+
+class BaseShushuCore(BaseShushuComponent, Generic[CoreWebAgentT, CoreStorageT]):
+    """The state and the step logic shared by `ShushuCore` and `AsyncShushuCore`.
 
-class ShushuCore(BaseShushuComponent, AbstractContextManager["ShushuCore"]):
-    def __init__(self, logger: Logger, web_agent: BaseWebAgent, storage: BaseStorage) -> None:
-        super(ShushuCore, self).__init__(logger=logger)
+    Subclasses only add the code that waits for the web agent and the storage, which is blocking in `ShushuCore` and
+    awaited in `AsyncShushuCore`.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        web_agent: CoreWebAgentT,
+        storage: CoreStorageT,
+        python_code_worker_pool: Optional["PythonCodeWorkerPool"] = None,
+        web_agent_factory: Optional[Callable[[], CoreWebAgentT]] = None,
+        max_worker_web_agents: Optional[int] = None,
+        tracer: Optional[Tracer] = None,
+        checkpoint_journal: Optional[CheckpointJournal] = None,
+        closers: Sequence[Callable[[], None]] = (),
+        html_parser_type: Optional[HtmlParserType] = None,
+        checkpoint_scope: Optional[str] = None,
+    ) -> None:
+        super(BaseShushuCore, self).__init__(logger=logger)
+        self._checkpoint_journal = checkpoint_journal
+        self._checkpoint_scope = checkpoint_scope
+        self._closers = tuple(closers)
+        self._tracer = tracer if tracer is not None else Tracer(logger=logger, enabled=False)
         self._web_agent = web_agent
         self._storage = storage
-        self._memroy: None | BaseDataModel = None
+        self._python_code_worker_pool = python_code_worker_pool
+        self._web_agent_factory = web_agent_factory
+        self._max_worker_web_agents = max_worker_web_agents
+        self._worker_web_agents: list[CoreWebAgentT] = []
+        self._html_parser_type = html_parser_type
+        self._data_processor_factory = DataProcessorFactory(
+            logger=logger, python_code_worker_pool=python_code_worker_pool, html_parser_type=html_parser_type
+        )
+        self._memory: None | BaseDataModel = None
 
     @property
-    def web_agent(self) -> BaseWebAgent:
+    def web_agent(self) -> CoreWebAgentT:
         return self._web_agent
 
     @property
-    def storage(self) -> BaseStorage:
+    def storage(self) -> CoreStorageT:
         return self._storage
 
+    @property
+    def python_code_worker_pool(self) -> Optional["PythonCodeWorkerPool"]:
+        return self._python_code_worker_pool
+
+    @property
+    def web_agent_factory(self) -> Optional[Callable[[], CoreWebAgentT]]:
+        return self._web_agent_factory
+
+    @property
+    def max_worker_web_agents(self) -> Optional[int]:
+        """How many web agents `web_agent_factory` can open while this core's own web agent is open."""
+        return self._max_worker_web_agents
+
+    @property
+    def data_processor_factory(self) -> DataProcessorFactory:
+        return self._data_processor_factory
+
+    @property
+    def html_parser_type(self) -> Optional[HtmlParserType]:
+        """The parser the python code data processors of this core inspect elements with."""
+        return self._html_parser_type
+
+    @property
+    def tracer(self) -> Tracer:
+        return self._tracer
+
+    @property
+    def checkpoint_journal(self) -> Optional[CheckpointJournal]:
+        return self._checkpoint_journal
+
+    @property
+    def checkpoint_scope(self) -> Optional[str]:
+        """The key of the item of an enclosing map this core works on, which scopes the keys of its checkpoints."""
+        return self._checkpoint_scope
+
+    @property
+    def closers(self) -> tuple[Callable[[], None], ...]:
+        """Callables that release the resources shared by the web agents, such as driver pools, on exit."""
+        return self._closers
+
     def set_memory(self, memory: BaseDataModel) -> None:
-        self._memroy = memory
+        self._memory = memory
 
     def get_memory(self) -> BaseDataModel:
-        if self._memroy is None:
+        if self._memory is None:
             raise MemoryNotSetError()
-        return self._memroy
+        return self._memory
+
+    def _spawn(self: CoreT, web_agent: Any, memory: BaseDataModel, checkpoint_scope: Optional[str] = None) -> CoreT:
+        # children share the storage and the worker pool, which are owned (and closed) by this core
+        child = type(self)(
+            logger=self.logger,
+            web_agent=web_agent,
+            storage=self.storage,
+            python_code_worker_pool=self.python_code_worker_pool,
+            tracer=self.tracer,
+            checkpoint_journal=self.checkpoint_journal,
+            html_parser_type=self.html_parser_type,
+            checkpoint_scope=checkpoint_scope,
+        )
+        child.set_memory(memory)
+        return child
+
+    def _item_checkpoint_scope(self, key: Optional[str], item: BaseDataModel) -> Optional[str]:
+        if self.checkpoint_journal is None:
+            return None
+        if key is not None:
+            return key
+        return item_checkpoint_key(scoped_checkpoint_prefix(self.checkpoint_scope, "item"), item)
+
+    def compile(self, action: Union[CoreAction, Plan]) -> Plan:
+        """Returns the plan of `action` with its data processors resolved for this core and the cores it spawns."""
+        plan = action if isinstance(action, Plan) else compile_plan(action)
+        return bind_plan(plan, self.data_processor_factory)
 
+    def _create_data_processor(
+        self, step: Union[DataProcessorStep, StreamStep], payload: BaseDataModel
+    ) -> BaseDataProcessor:
+        if step.processor is None:
+            # a plan passed to `run` as it was compiled
+            return self.data_processor_factory.create(action=step.action, payload=payload)
+        return step.processor(payload)
+
+    def _is_completed(self, key: str) -> bool:
+        return self.checkpoint_journal is not None and self.checkpoint_journal.is_completed(key)
+
+    def _plan_map(
+        self,
+        action: Union[CoreAction, Plan],
+        items: Sequence[BaseDataModel],
+        max_workers: int,
+        checkpoint_prefix: Optional[str],
+        use_own_web_agent: bool,
+    ) -> tuple[Plan, Sequence[tuple[Optional[str], BaseDataModel]], int]:
+        """Returns the plan of a map, its pending items with their checkpoint keys and the number of its workers."""
+        plan = self.compile(action)
+        if checkpoint_prefix is None and not isinstance(action, Plan):
+            checkpoint_prefix = action_checkpoint_prefix(action)
+        keyed_items: Sequence[tuple[Optional[str], BaseDataModel]] = [(None, item) for item in items]
+        if self.checkpoint_journal is not None and checkpoint_prefix is not None:
+            keyed_items = self.checkpoint_journal.pending_items(
+                scoped_checkpoint_prefix(self.checkpoint_scope, checkpoint_prefix), items
+            )
+        max_worker_web_agents = self.max_worker_web_agents
+        if max_worker_web_agents is not None and use_own_web_agent:
+            max_worker_web_agents += 1
+        worker_limit = limit_worker_count(max_workers, max_worker_web_agents)
+        if worker_limit < max_workers:
+            # more workers would wait forever for a driver leased by another worker
+            self.log_warning(
+                "Limiting workers to the available web agents.",
+                extra={"max_workers": max_workers, "worker_count": worker_limit},
+            )
+            max_workers = worker_limit
+        return plan, keyed_items, min(max_workers, max(1, len(keyed_items)))
+
+    def _idle_web_agents(self, worker_count: int, use_own_web_agent: bool) -> list[Optional[CoreWebAgentT]]:
+        """Returns the web agents the workers of a map start with, None for each one still to be created.
+
+        They are meant for a last in, first out queue, so the open web agents come last to be taken before new ones
+        are started.
+        """
+        open_web_agents = ([self.web_agent] if use_own_web_agent else []) + self._worker_web_agents
+        open_web_agents = open_web_agents[:worker_count]
+        return [None] * (worker_count - len(open_web_agents)) + list(open_web_agents)
+
+    def _page_checkpoint_key(self, step: PaginateStep, page_number: int) -> str:
+        return page_checkpoint_key(scoped_checkpoint_prefix(self.checkpoint_scope, step.checkpoint_prefix), page_number)
+
+    def _next_page(
+        self, step: PaginateStep, element: Optional[Element], visited_urls: set[str]
+    ) -> tuple[bool, Optional[str]]:
+        """Returns whether the "next" `element` leads to another page and, in OPEN_URL mode, its URL."""
+        if element is None:
+            return False, None
+        if step.mode == PaginationMode.CLICK:
+            return True, None
+        is_visited_page(str(element.url.value), visited_urls)
+        next_url = get_next_page_url(element)
+        if next_url is None:
+            self.log_warning("Next page element has no href.", extra={"action_id": str(step.action_id)})
+            return False, None
+        if is_visited_page(next_url, visited_urls):
+            # a link to the current or an earlier page would make the pagination loop forever
+            self.log_warning(
+                "Next page was already visited.", extra={"action_id": str(step.action_id), "url": next_url}
+            )
+            return False, None
+        return True, next_url
+
+    def _next_page_actions(self, step: PaginateStep, next_url: Optional[str]) -> list[WebAgentAction]:
+        if next_url is not None:
+            return [OpenUrlAction(url=Url(value=next_url))]
+        return [SetSelectorAction(selector=step.next_selector), ClickSelectedElementAction()]
+
+    def _web_agent_span(self, action: WebAgentAction) -> Span:
+        return self.tracer.span(action.type.value, category="web_agent", action_id=str(action.id))
+
+    def _storage_span(self, action: StorageAction, data: Optional[BaseDataModel] = None) -> Span:
+        if data is None:
+            return self.tracer.span(action.type.value, category="storage", action_id=str(action.id))
+        span = self.tracer.span(action.type.value, category="storage", action_id=str(action.id), data_id=str(data.id))
+        if self.tracer.enabled:
+            span.set("payload_size", len(data.model_dump_json()))
+        return span
+
+    def _data_processor_span(self, action: DataProcessorAction, payload: BaseDataModel, **attributes: Any) -> Span:
+        span = self.tracer.span(action.type.value, category="data_processor", action_id=str(action.id), **attributes)
+        if self.tracer.enabled:
+            span.set("payload_size", len(payload.model_dump_json()))
+        return span
+
+    def _step_span(self, step: PlanStep) -> Span:
+        return self.tracer.span(type(step).__name__, category="core", action_id=str(step.action_id))
+
+
+class ShushuCore(BaseShushuCore[BaseWebAgent, BaseStorage], AbstractContextManager["ShushuCore"]):
     def __enter__(self) -> "ShushuCore":
         self.web_agent.__enter__()
         return self
@@ -60,58 +440,249 @@ class ShushuCore(BaseShushuComponent, AbstractContextManager["ShushuCore"]):
         __exc_value: BaseException | None,
         __traceback: TracebackType | None,
     ) -> bool | None:
+        for web_agent in self._worker_web_agents:
+            web_agent.__exit__(None, None, None)
+        self._worker_web_agents.clear()
         self.web_agent.__exit__(__exc_type, __exc_value, __traceback)
+        self.storage.flush()
+        if self.checkpoint_journal is not None:
+            self.checkpoint_journal.close()
+        self.tracer.close()
+        if self.python_code_worker_pool is not None:
+            self.python_code_worker_pool.close()
+        for closer in self.closers:
+            closer()
         return None
 
+    def _mark_completed(self, key: str) -> None:
+        if self.checkpoint_journal is not None and self.checkpoint_journal.mark_completed(key):
+            # the data of the completed work must be stored before the journal claims it is done
+            self.storage.flush()
+            self.checkpoint_journal.flush()
+
+    def _run_item(
+        self,
+        plan: Plan,
+        web_agent: BaseWebAgent,
+        key: Optional[str],
+        item: BaseDataModel,
+        on_error: Optional[ItemErrorHandler] = None,
+    ) -> Optional[BaseDataModel]:
+        child = self._spawn(web_agent=web_agent, memory=item, checkpoint_scope=self._item_checkpoint_scope(key, item))
+        try:
+            child.run(plan)
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(item, e)
+            return None
+        if key is not None:
+            self._mark_completed(key)
+        return child.get_memory()
+
+    def map(
+        self,
+        action: Union[CoreAction, Plan],
+        items: Sequence[BaseDataModel],
+        max_workers: int = 1,
+        ordered: bool = True,
+        checkpoint_prefix: Optional[str] = None,
+        on_error: Optional[ItemErrorHandler] = None,
+        use_own_web_agent: bool = False,
+    ) -> list[BaseDataModel]:
+        """Performs `action` once per item, with the item as the memory, and returns the resulting memories.
+
+        Items are processed by up to `max_workers` threads, each with its own web agent created by
+        `web_agent_factory`, but by no more threads than `max_worker_web_agents`. Without a factory, or when only one
+        worker is left, items are processed one by one with this core's web agent. Web agents created for the threads
+        are kept open until this core exits, so that later maps reuse them. With `use_own_web_agent` this core's web
+        agent is one of them, which saves a web agent when the page it has open is not needed afterwards.
+
+        With `on_error`, an item whose action raises an exception is passed to it together with the exception and left
+        out of the result, instead of the exception stopping the map.
+
+        With a checkpoint journal, items completed under `checkpoint_prefix` (derived from the content of `action` by
+        default) are skipped and left out of the result. Within an item of an enclosing map the prefix is scoped to that
+        item, so that the same nested work is done for every item.
+        """
+        plan, keyed_items, worker_count = self._plan_map(
+            action, items, max_workers, checkpoint_prefix, use_own_web_agent
+        )
+        web_agent_factory = self.web_agent_factory
+        if web_agent_factory is None or worker_count == 1:
+            results = [self._run_item(plan, self.web_agent, key, item, on_error) for key, item in keyed_items]
+            return [result for result in results if result is not None]
+        idle_web_agents: LifoQueue[Optional[BaseWebAgent]] = LifoQueue()
+        for idle_web_agent in self._idle_web_agents(worker_count, use_own_web_agent):
+            idle_web_agents.put(idle_web_agent)
+        lock = Lock()
+
+        def perform_item(key: Optional[str], item: BaseDataModel) -> Optional[BaseDataModel]:
+            web_agent = idle_web_agents.get()
+            try:
+                if web_agent is None:
+                    web_agent = web_agent_factory().__enter__()
+                    with lock:
+                        self._worker_web_agents.append(web_agent)
+                return self._run_item(plan, web_agent, key, item, on_error)
+            finally:
+                idle_web_agents.put(web_agent)
+
+        self.log_info(
+            "Starting parallel actions.", extra={"item_count": len(keyed_items), "worker_count": worker_count}
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                futures = [executor.submit(perform_item, key, item) for key, item in keyed_items]
+                try:
+                    results = [future.result() for future in (futures if ordered else as_completed(futures))]
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            self.log_info("Finished parallel actions.", extra={"item_count": len(keyed_items)})
+        return [result for result in results if result is not None]
+
+    def _load_selected_element(self, payload: SelectedElementPayload) -> BaseDataModel:
+        return self.web_agent.get_selected_element()
+
+    def _load_selected_elements(self, payload: SelectedElementsPayload) -> BaseDataModel:
+        if payload.compact:
+            return self.web_agent.get_selected_elements_compact()
+        return self.web_agent.get_selected_elements()
+
+    def _load_memory(self, payload: MemoryPayload) -> BaseDataModel:
+        return self.get_memory()
+
+    _payload_loaders: ClassVar[dict[type, Callable[["ShushuCore", Any], BaseDataModel]]] = {
+        SelectedElementPayload: _load_selected_element,
+        SelectedElementsPayload: _load_selected_elements,
+        MemoryPayload: _load_memory,
+    }
+
     def _load_payload(self, payload: Payload) -> BaseDataModel:
-        if isinstance(payload, SelectedElementPayload):
+        with self.tracer.span(payload.type.value, category="extraction"):
+            return self._payload_loaders[type(payload)](self, payload)
+
+    def _perform_parallel(self, step: ParallelStep) -> None:
+        results = self.map(
+            action=step.plan,
+            items=load_memory_items(self.get_memory(), step.payload),
+            max_workers=step.max_workers,
+            ordered=step.ordered,
+            checkpoint_prefix=step.checkpoint_prefix,
+        )
+        self.set_memory(DataSequence(data=results))
+
+    def _find_next_page_element(self, step: PaginateStep) -> Optional[Element]:
+        self._perform_web_agent_action(SetSelectorAction(selector=step.next_selector))
+        try:
             return self.web_agent.get_selected_element()
-        if isinstance(payload, SelectedElementsPayload):
-            return self.web_agent.get_selected_elements()
-        if isinstance(payload, MemoryPayload):
-            return self.get_memory()
-        raise NotImplementedError()
+        except NoElementFoundError:
+            return None
 
-    def perform(self, action: CoreAction) -> None:
-        if isinstance(action, SequencialCoreAction):
-            for sub_action in action.actions:
-                self.perform(sub_action)
-            return
-        if isinstance(action, GenerateIdCoreAction):
-            self.set_memory(IdData(value=Id.generate()))
-            return
-        if isinstance(action, WebAgentCoreAction):
-            self.web_agent.perform(action.action)
+    def _perform_paginate(self, step: PaginateStep) -> None:
+        page_count = 0
+        visited_urls: set[str] = set()
+        while True:
+            page_count += 1
+            has_next_page, next_url = False, None
+            if step.max_pages is None or page_count < step.max_pages:
+                has_next_page, next_url = self._next_page(step, self._find_next_page_element(step), visited_urls)
+            if step.prefetch and next_url is not None:
+                self.web_agent.prefetch(next_url)
+            checkpoint_key = self._page_checkpoint_key(step, page_count)
+            if not self._is_completed(checkpoint_key):
+                self.run(step.plan)
+                self._mark_completed(checkpoint_key)
+            if not has_next_page:
+                break
+            for action in self._next_page_actions(step, next_url):
+                self._perform_web_agent_action(action)
+        self.log_info("Finished pagination.", extra={"action_id": str(step.action_id), "page_count": page_count})
+
+    def _perform_open_memory_url(self, step: OpenMemoryUrlStep) -> None:
+        self._perform_web_agent_action(OpenUrlAction(url=load_memory_url(self.get_memory(), step.attribute)))
+
+    def _perform_generate_id(self, step: GenerateIdStep) -> None:
+        self.set_memory(IdData(value=Id.generate()))
+
+    def _perform_web_agent_action(self, action: WebAgentAction) -> None:
+        with self._web_agent_span(action):
+            self.web_agent.perform(action)
+
+    def _perform_web_agent(self, step: WebAgentStep) -> None:
+        self._perform_web_agent_action(step.action)
+
+    def _save_memory(self, action: StorageAction, payload: MemoryPayload) -> None:
+        for data in load_storage_payloads(self.get_memory(), payload):
+            with self._storage_span(action, data):
+                self.storage.perform(action=action, payload=data)
+
+    def _perform_storage(self, step: StorageStep) -> None:
+        if step.payload is None:
+            with self._storage_span(step.action):
+                self.storage.perform(action=step.action)
             return
-        if isinstance(action, StorageCoreAction):
-            if action.payload is None:
-                self.storage.perform(action=action.action)
-                return
-            if isinstance(action.payload, MemoryPayload):
-                if action.payload.attribute is not None:
-                    if action.payload.expand is not None:
-                        if action.payload.expand:
-                            for item in getattr(self.get_memory(), action.payload.attribute):
-                                self.storage.perform(action=action.action, payload=item)
-                            return
-                    self.storage.perform(
-                        action=action.action, payload=getattr(self.get_memory(), action.payload.attribute)
-                    )
-                    return
-                self.storage.perform(action=action.action, payload=self.get_memory())
-                return
-        if isinstance(action, DataProcessorCoreAction):
-            data_processor_factory = DataProcessorFactory(logger=self.logger)
-            data_processor = data_processor_factory.create(
-                action=action.action, payload=self._load_payload(action.payload)
-            )
+        self._save_memory(step.action, step.payload)
+
+    def _perform_data_processor(self, step: DataProcessorStep) -> None:
+        payload = self._load_payload(step.payload)
+        with self._data_processor_span(step.action, payload):
+            data_processor = self._create_data_processor(step, payload)
             self.set_memory(data_processor.perform())
-            return
+
+    def _iter_selected_element_chunks(self, step: StreamStep) -> Iterator[BaseDataModel]:
+        if step.compact:
+            return self.web_agent.iter_selected_elements_compact(step.chunk_size)
+        return self.web_agent.iter_selected_elements(step.chunk_size)
+
+    def _perform_stream(self, step: StreamStep) -> None:
+        chunk_count = 0
+        for chunk in self._iter_selected_element_chunks(step):
+            chunk_count += 1
+            with self._data_processor_span(step.action, chunk, chunk=chunk_count):
+                data_processor = self._create_data_processor(step, chunk)
+                self.set_memory(data_processor.perform())
+            self._save_memory(step.storage_action, step.storage_payload)
+        self.log_info("Finished streaming.", extra={"action_id": str(step.action_id), "chunk_count": chunk_count})
+
+    _step_handlers: ClassVar[dict[type, Callable[["ShushuCore", Any], None]]] = {
+        ParallelStep: _perform_parallel,
+        PaginateStep: _perform_paginate,
+        OpenMemoryUrlStep: _perform_open_memory_url,
+        GenerateIdStep: _perform_generate_id,
+        WebAgentStep: _perform_web_agent,
+        StorageStep: _perform_storage,
+        DataProcessorStep: _perform_data_processor,
+        StreamStep: _perform_stream,
+    }
+
+    def run(self, plan: Plan) -> None:
+        for step in plan.steps:
+            with self._step_span(step):
+                self._step_handlers[type(step)](self, step)
+
+    def perform(self, action: CoreAction) -> None:
+        self.run(self.compile(action))
 
 
 def gen_shushu_core(settings: CoreSettings, logger: Logger) -> ShushuCore:
-    web_agent_factory = WebAgentFactory(logger=logger)
-    web_agent = web_agent_factory.create(settings=settings.web_agent_settings)
-    storage_factory = StorageFactory(logger=logger)
-    storage = storage_factory.create(settings=settings.storage_settings)
-    return ShushuCore(logger=logger, web_agent=web_agent, storage=storage)
+    components = build_core_components(settings=settings, logger=logger)
+
+    def create_web_agent() -> BaseWebAgent:
+        return components.web_agent_factory.create(settings=settings.web_agent_settings)
+
+    return ShushuCore(
+        logger=logger,
+        web_agent=create_web_agent(),
+        storage=components.storage,
+        python_code_worker_pool=components.python_code_worker_pool,
+        web_agent_factory=create_web_agent,
+        max_worker_web_agents=components.max_worker_web_agents,
+        tracer=components.tracer,
+        checkpoint_journal=components.checkpoint_journal,
+        closers=[components.web_agent_factory.close],
+        html_parser_type=settings.html_parser_type,
+    )
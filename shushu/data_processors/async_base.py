@@ -0,0 +1,34 @@
+import asyncio
+from logging import Logger
+
+from ..base import BaseShushuComponent
+from ..models import BaseDataModel
+from .base import BaseDataProcessor
+
+
+class BaseAsyncDataProcessor(BaseShushuComponent):
+    def __init__(self, payload: BaseDataModel, logger: Logger):
+        super(BaseAsyncDataProcessor, self).__init__(logger=logger)
+        self._payload = payload
+
+    @property
+    def payload(self) -> BaseDataModel:
+        return self._payload
+
+    async def perform(self) -> BaseDataModel:
+        raise NotImplementedError()
+
+
+class ThreadedAsyncDataProcessor(BaseAsyncDataProcessor):
+    """Runs a synchronous data processor in a worker thread so that it does not block the event loop."""
+
+    def __init__(self, data_processor: BaseDataProcessor, logger: Logger):
+        super(ThreadedAsyncDataProcessor, self).__init__(payload=data_processor.payload, logger=logger)
+        self._data_processor = data_processor
+
+    @property
+    def data_processor(self) -> BaseDataProcessor:
+        return self._data_processor
+
+    async def perform(self) -> BaseDataModel:
+        return await asyncio.to_thread(self.data_processor.perform)
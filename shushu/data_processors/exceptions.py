@@ -8,3 +8,8 @@ class BaseDataProcessorError(BaseError):
 class PythonCodeError(BaseDataProcessorError):
     def __init__(self, message: str):
         super(PythonCodeError, self).__init__(message)
+
+
+class PythonCodeWorkerError(BaseDataProcessorError):
+    def __init__(self, message: str):
+        super(PythonCodeWorkerError, self).__init__(message)
@@ -1,16 +1,49 @@
+from collections.abc import Callable
+from logging import Logger
+from typing import TYPE_CHECKING, Optional
+
 from ..actions import BaseDataProcessorAction, PythonCodeDataProcessorAction
 from ..base import BaseShushuComponent
 from ..models import BaseDataModel
+from ..types import HtmlParserType
 from .base import BaseDataProcessor
-from .python_code import PythonCodeDataProcessor
+
+if TYPE_CHECKING:
+    from .python_code_worker_pool import PythonCodeWorkerPool
 
 
 class DataProcessorFactory(BaseShushuComponent):
-    def create(self, action: BaseDataProcessorAction, payload: BaseDataModel) -> BaseDataProcessor:
+    def __init__(
+        self,
+        logger: Logger,
+        python_code_worker_pool: Optional["PythonCodeWorkerPool"] = None,
+        html_parser_type: Optional[HtmlParserType] = None,
+    ) -> None:
+        super(DataProcessorFactory, self).__init__(logger=logger)
+        self._python_code_worker_pool = python_code_worker_pool
+        self._html_parser_type = html_parser_type
+
+    def resolve(self, action: BaseDataProcessorAction) -> Callable[[BaseDataModel], BaseDataProcessor]:
+        """Returns the function that creates the processor of `action` for a payload, so that plans look it up once."""
         if isinstance(action, PythonCodeDataProcessorAction):
-            return PythonCodeDataProcessor(
-                code=action.code,
-                payload=payload,
-                logger=self.logger,
-            )
+            from .python_code import PythonCodeDataProcessor
+
+            code = action.code
+            logger = self.logger
+            worker_pool = self._python_code_worker_pool
+            html_parser_type = self._html_parser_type
+
+            def create_python_code_data_processor(payload: BaseDataModel) -> BaseDataProcessor:
+                return PythonCodeDataProcessor(
+                    code=code,
+                    payload=payload,
+                    logger=logger,
+                    worker_pool=worker_pool,
+                    html_parser_type=html_parser_type,
+                )
+
+            return create_python_code_data_processor
         raise NotImplementedError()
+
+    def create(self, action: BaseDataProcessorAction, payload: BaseDataModel) -> BaseDataProcessor:
+        return self.resolve(action)(payload)
@@ -1,57 +1,77 @@
 import json
 from logging import Logger
-from subprocess import run
+from typing import Optional
 
-from ..models import BaseDataModel, Element, ElementSequence, json_schema_to_data_model
-from ..types import CodeString
+from ..models import (
+    BaseDataModel,
+    CompactElementSequence,
+    Element,
+    ElementSequence,
+    data_model_cache,
+    json_schema_to_data_model,
+)
+from ..types import CodeString, HtmlParserType
 from .base import BaseDataProcessor
 from .exceptions import PythonCodeError
+from .python_code_protocol import PythonCodeWorkerRequest, PythonCodeWorkerResponse
+from .python_code_worker_pool import PythonCodeWorkerPool, PythonCodeWorkerProcess
 
 
 class PythonCodeDataProcessor(BaseDataProcessor):
-    def __init__(self, code: CodeString, payload: BaseDataModel, logger: Logger):
+    def __init__(
+        self,
+        code: CodeString,
+        payload: BaseDataModel,
+        logger: Logger,
+        worker_pool: Optional[PythonCodeWorkerPool] = None,
+        html_parser_type: Optional[HtmlParserType] = None,
+    ):
         super(PythonCodeDataProcessor, self).__init__(payload=payload, logger=logger)
         self._code = code
+        self._worker_pool = worker_pool
+        self._html_parser_type = html_parser_type
 
-    @classmethod
-    def _export_element(cls, element: Element) -> str:
-        return element.model_dump_json(by_alias=False).replace("\\", "\\\\").replace('"', '\\"')
+    @property
+    def worker_pool(self) -> Optional[PythonCodeWorkerPool]:
+        return self._worker_pool
 
-    @classmethod
-    def _export_element_sequence(cls, element_sequence: ElementSequence) -> str:
-        return element_sequence.model_dump_json(by_alias=False).replace("\\", "\\\\").replace('"', '\\"')
+    @property
+    def html_parser_type(self) -> Optional[HtmlParserType]:
+        """The parser of a worker started for this processor alone. Workers of `worker_pool` use the pool's."""
+        return self._html_parser_type
 
     @classmethod
-    def _export_payload(cls, payload: BaseDataModel) -> str:
-        if isinstance(payload, Element):
-            return cls._export_element(payload)
-        if isinstance(payload, ElementSequence):
-            return cls._export_element_sequence(payload)
+    def _export_payload(cls, payload: BaseDataModel) -> bytes:
+        if isinstance(payload, (Element, ElementSequence, CompactElementSequence)):
+            return payload.model_dump_json(by_alias=False).encode("utf-8")
         raise TypeError(f"Unsupported payload type: {type(payload)}")
 
     def perform(self) -> BaseDataModel:
-        model_exporting_string = self._export_payload(self.payload)
-        result = run(
-            [
-                "python",
-                "-c",
-                self._code
-                + f"""
-import json
-import sys
-
-res = convert({self.payload.__class__.__name__}(**json.loads('{model_exporting_string}')))
-json.dump(res.model_json_schema(), sys.stdout, ensure_ascii=False)
-sys.stdout.write('\\n')
-sys.stdout.write(res.model_dump_json())
-""",
-            ],
-            text=True,
-            capture_output=True,
+        request = PythonCodeWorkerRequest(
+            code=self._code,
+            payload_type=self.payload.__class__.__name__,
+            payload=self._export_payload(self.payload),
+        )
+        if self.worker_pool is not None:
+            response = self.worker_pool.execute(request)
+        else:
+            worker = PythonCodeWorkerProcess(logger=self.logger, html_parser_type=self.html_parser_type)
+            try:
+                response = worker.request(request)
+            finally:
+                worker.close()
+        return self._to_data_model(response)
+
+    def _to_data_model(self, response: PythonCodeWorkerResponse) -> BaseDataModel:
+        if response.error is not None:
+            self.log_error(response.error)
+            raise PythonCodeError(response.error)
+        dynamic_model = data_model_cache.get(response.schema_key)
+        if dynamic_model is None:
+            dynamic_model = json_schema_to_data_model(json.loads(response.json_schema))
+            data_model_cache.put(response.schema_key, dynamic_model)
+        self.log_debug(
+            "Data model cache statistics.",
+            extra={"data_model_cache_hits": data_model_cache.hits, "data_model_cache_misses": data_model_cache.misses},
         )
-        if result.returncode != 0:
-            self.log_error(result.stderr)
-            raise PythonCodeError(result.stderr)
-        (json_schema_line, serizlied_data_line) = result.stdout.split("\n")
-        dynamic_model = json_schema_to_data_model(json.loads(json_schema_line))
-        return dynamic_model.model_validate_json(serizlied_data_line)
+        return dynamic_model.model_validate_json(response.data)
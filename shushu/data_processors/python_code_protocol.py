@@ -0,0 +1,120 @@
+import json
+import struct
+from typing import IO, Any, NamedTuple, Optional
+
+from .exceptions import PythonCodeWorkerError
+
+# every frame is an 8-byte big-endian length followed by that many bytes
+FRAME_HEADER = struct.Struct(">Q")
+
+
+class PythonCodeWorkerRequest(NamedTuple):
+    code: str
+    payload_type: str
+    payload: bytes
+
+
+class PythonCodeWorkerResponse(NamedTuple):
+    error: Optional[str] = None
+    schema_key: str = ""
+    json_schema: bytes = b""
+    data: bytes = b""
+
+
+def write_frame(stream: IO[bytes], data: bytes) -> None:
+    stream.write(FRAME_HEADER.pack(len(data)))
+    stream.write(data)
+
+
+def _read_exactly(stream: IO[bytes], size: int) -> bytes:
+    data = stream.read(size)
+    if data is None or len(data) != size:
+        raise PythonCodeWorkerError(f"Unexpected end of stream: expected {size} bytes.")
+    return data
+
+
+def read_frame(stream: IO[bytes]) -> Optional[bytes]:
+    """Reads a frame. Returns None when the stream ends before a new frame starts.
+
+    >>> from io import BytesIO
+    >>> stream = BytesIO()
+    >>> write_frame(stream, b"abc")
+    >>> write_frame(stream, b"")
+    >>> _ = stream.seek(0)
+    >>> read_frame(stream), read_frame(stream), read_frame(stream)
+    (b'abc', b'', None)
+    """
+    header = stream.read(FRAME_HEADER.size)
+    if not header:
+        return None
+    if len(header) != FRAME_HEADER.size:
+        raise PythonCodeWorkerError("Unexpected end of stream in frame header.")
+    (size,) = FRAME_HEADER.unpack(header)
+    return _read_exactly(stream, size)
+
+
+def _read_header(stream: IO[bytes]) -> Optional[dict[str, Any]]:
+    frame = read_frame(stream)
+    if frame is None:
+        return None
+    header: dict[str, Any] = json.loads(frame)
+    return header
+
+
+def _read_required_frame(stream: IO[bytes]) -> bytes:
+    frame = read_frame(stream)
+    if frame is None:
+        raise PythonCodeWorkerError("Unexpected end of stream.")
+    return frame
+
+
+def write_request(stream: IO[bytes], request: PythonCodeWorkerRequest) -> None:
+    write_frame(stream, json.dumps({"code": request.code, "payload_type": request.payload_type}).encode("utf-8"))
+    write_frame(stream, request.payload)
+    stream.flush()
+
+
+def read_request(stream: IO[bytes]) -> Optional[PythonCodeWorkerRequest]:
+    header = _read_header(stream)
+    if header is None:
+        return None
+    return PythonCodeWorkerRequest(
+        code=header["code"], payload_type=header["payload_type"], payload=_read_required_frame(stream)
+    )
+
+
+def write_response(stream: IO[bytes], response: PythonCodeWorkerResponse) -> None:
+    if response.error is not None:
+        write_frame(stream, json.dumps({"error": response.error}).encode("utf-8"))
+    else:
+        write_frame(stream, json.dumps({"schema_key": response.schema_key}).encode("utf-8"))
+        write_frame(stream, response.json_schema)
+        write_frame(stream, response.data)
+    stream.flush()
+
+
+def read_response(stream: IO[bytes]) -> Optional[PythonCodeWorkerResponse]:
+    """Reads a response. Returns None when the worker closed the stream without answering.
+
+    >>> from io import BytesIO
+    >>> stream = BytesIO()
+    >>> write_response(stream, PythonCodeWorkerResponse(schema_key="k", json_schema=b"{}", data=b'{"a":1}'))
+    >>> write_response(stream, PythonCodeWorkerResponse(error="Traceback"))
+    >>> _ = stream.seek(0)
+    >>> read_response(stream)
+    PythonCodeWorkerResponse(error=None, schema_key='k', json_schema=b'{}', data=b'{"a":1}')
+    >>> read_response(stream)
+    PythonCodeWorkerResponse(error='Traceback', schema_key='', json_schema=b'', data=b'')
+    >>> read_response(stream) is None
+    True
+    """
+    header = _read_header(stream)
+    if header is None:
+        return None
+    if "error" in header:
+        return PythonCodeWorkerResponse(error=header["error"])
+    return PythonCodeWorkerResponse(
+        schema_key=header["schema_key"],
+        json_schema=_read_required_frame(stream),
+        data=_read_required_frame(stream),
+    )
@@ -0,0 +1,97 @@
+import json
+import sys
+import traceback
+from collections import OrderedDict
+from collections.abc import Callable
+from hashlib import sha256
+from typing import IO, Any
+from weakref import WeakKeyDictionary
+
+from ..models import (
+    BaseDataModel,
+    CompactElementSequence,
+    Element,
+    ElementSequence,
+    json_schema_key,
+    set_html_parser_type,
+)
+from ..types import HtmlParserType
+from .python_code_protocol import (
+    PythonCodeWorkerRequest,
+    PythonCodeWorkerResponse,
+    read_request,
+    write_response,
+)
+
+Converter = Callable[[BaseDataModel], BaseDataModel]
+
+PAYLOAD_TYPES: dict[str, type[BaseDataModel]] = {
+    Element.__name__: Element,
+    ElementSequence.__name__: ElementSequence,
+    CompactElementSequence.__name__: CompactElementSequence,
+}
+
+
+class PythonCodeWorker:
+    """Executes `convert` functions of python code data processors inside a long-lived process.
+
+    Compiled code is kept per code string and JSON schemas are kept per result model so that repeated tasks only pay
+    for the conversion itself.
+    """
+
+    def __init__(self, max_cached_codes: int = 32) -> None:
+        self._max_cached_codes = max_cached_codes
+        self._converters: OrderedDict[str, Converter] = OrderedDict()
+        self._json_schemas: WeakKeyDictionary[type[BaseDataModel], tuple[str, bytes]] = WeakKeyDictionary()
+
+    def get_converter(self, code: str) -> Converter:
+        key = sha256(code.encode("utf-8")).hexdigest()
+        converter = self._converters.get(key)
+        if converter is not None:
+            self._converters.move_to_end(key)
+            return converter
+        namespace: dict[str, Any] = {"__name__": "__shushu_python_code__"}
+        exec(compile(code, "<python_code>", "exec"), namespace)
+        converter = namespace["convert"]
+        self._converters[key] = converter
+        if len(self._converters) > self._max_cached_codes:
+            self._converters.popitem(last=False)
+        return converter
+
+    def get_json_schema(self, model: type[BaseDataModel]) -> tuple[str, bytes]:
+        cached = self._json_schemas.get(model)
+        if cached is None:
+            json_schema = model.model_json_schema()
+            cached = (json_schema_key(json_schema), json.dumps(json_schema, ensure_ascii=False).encode("utf-8"))
+            self._json_schemas[model] = cached
+        return cached
+
+    def handle(self, request: PythonCodeWorkerRequest) -> PythonCodeWorkerResponse:
+        try:
+            converter = self.get_converter(request.code)
+            payload = PAYLOAD_TYPES[request.payload_type].model_validate_json(request.payload)
+            res = converter(payload)
+            schema_key, json_schema = self.get_json_schema(type(res))
+            return PythonCodeWorkerResponse(
+                schema_key=schema_key, json_schema=json_schema, data=res.model_dump_json().encode("utf-8")
+            )
+        except Exception:
+            return PythonCodeWorkerResponse(error=traceback.format_exc())
+
+    def serve(self, reader: IO[bytes], writer: IO[bytes]) -> None:
+        while (request := read_request(reader)) is not None:
+            write_response(writer, self.handle(request))
+
+
+def main() -> None:
+    # the parser is passed by PythonCodeWorkerProcess and selected once for every element of the process
+    if len(sys.argv) > 1:
+        set_html_parser_type(HtmlParserType(sys.argv[1]))
+    protocol_writer = sys.stdout.buffer
+    # anything printed by the user code must not corrupt the protocol stream
+    sys.stdout = sys.stderr
+    PythonCodeWorker().serve(reader=sys.stdin.buffer, writer=protocol_writer)
+
+
+if __name__ == "__main__":
+    main()
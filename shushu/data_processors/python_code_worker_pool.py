@@ -0,0 +1,170 @@
+import sys
+from logging import Logger
+from queue import Empty, LifoQueue
+from subprocess import PIPE, Popen, TimeoutExpired
+from typing import IO, Optional
+
+from ..base import BaseShushuComponent
+from ..models import get_html_parser_type
+from ..types import HtmlParserType
+from .exceptions import PythonCodeWorkerError
+from .python_code_protocol import (
+    PythonCodeWorkerRequest,
+    PythonCodeWorkerResponse,
+    read_response,
+    write_request,
+)
+
+
+class PythonCodeWorkerProcess(BaseShushuComponent):
+    """A python process running `shushu.data_processors.python_code_worker`.
+
+    The process selects `html_parser_type` once at startup and inspects its elements with it. Without one it uses the
+    parser selected in this process.
+    """
+
+    def __init__(self, logger: Logger, html_parser_type: Optional[HtmlParserType] = None) -> None:
+        super(PythonCodeWorkerProcess, self).__init__(logger=logger)
+        if html_parser_type is None:
+            html_parser_type = get_html_parser_type()
+        self._process = Popen(
+            [sys.executable, "-m", "shushu.data_processors.python_code_worker", html_parser_type.value],
+            stdin=PIPE,
+            stdout=PIPE,
+        )
+        self._task_count = 0
+
+    @property
+    def pid(self) -> int:
+        return self._process.pid
+
+    @property
+    def task_count(self) -> int:
+        return self._task_count
+
+    @property
+    def stdin(self) -> IO[bytes]:
+        if self._process.stdin is None:
+            raise PythonCodeWorkerError("Python code worker has no stdin.")
+        return self._process.stdin
+
+    @property
+    def stdout(self) -> IO[bytes]:
+        if self._process.stdout is None:
+            raise PythonCodeWorkerError("Python code worker has no stdout.")
+        return self._process.stdout
+
+    def is_alive(self) -> bool:
+        return self._process.poll() is None
+
+    def request(self, request: PythonCodeWorkerRequest) -> PythonCodeWorkerResponse:
+        try:
+            write_request(self.stdin, request)
+        except BrokenPipeError:
+            raise PythonCodeWorkerError(f"Python code worker (pid={self.pid}) is not accepting requests.")
+        try:
+            response = read_response(self.stdout)
+        except PythonCodeWorkerError:
+            # the stream is out of sync and the worker cannot be trusted anymore
+            self._process.kill()
+            response = None
+        if response is None:
+            raise PythonCodeWorkerError(
+                f"Python code worker (pid={self.pid}) exited unexpectedly with code {self._process.wait()}."
+            )
+        self._task_count += 1
+        return response
+
+    def close(self) -> None:
+        try:
+            self.stdin.close()
+            self._process.wait(timeout=5)
+        except (BrokenPipeError, TimeoutExpired):
+            self._process.kill()
+            self._process.wait()
+        self.stdout.close()
+
+
+class PythonCodeWorkerPool(BaseShushuComponent):
+    """A pool of warm python processes running `shushu.data_processors.python_code_worker`.
+
+    Workers are started lazily, reused across tasks and replaced after `max_tasks_per_worker` tasks or when they die.
+    They inspect elements with `html_parser_type`, see `PythonCodeWorkerProcess`.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_tasks_per_worker: int,
+        logger: Logger,
+        html_parser_type: Optional[HtmlParserType] = None,
+    ) -> None:
+        super(PythonCodeWorkerPool, self).__init__(logger=logger)
+        if size < 1:
+            raise ValueError(f"Pool size must be positive, but got {size}")
+        self._size = size
+        self._max_tasks_per_worker = max_tasks_per_worker
+        self._html_parser_type = html_parser_type
+        self._idle_workers: LifoQueue[Optional[PythonCodeWorkerProcess]] = LifoQueue()
+        for _ in range(size):
+            self._idle_workers.put(None)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def max_tasks_per_worker(self) -> int:
+        return self._max_tasks_per_worker
+
+    @property
+    def html_parser_type(self) -> Optional[HtmlParserType]:
+        return self._html_parser_type
+
+    def _acquire(self) -> PythonCodeWorkerProcess:
+        worker = self._idle_workers.get()
+        if worker is not None and worker.is_alive():
+            return worker
+        if worker is not None:
+            worker.close()
+        try:
+            worker = PythonCodeWorkerProcess(logger=self.logger, html_parser_type=self.html_parser_type)
+        except BaseException:
+            self._idle_workers.put(None)
+            raise
+        self.log_debug("Started python code worker.", extra={"worker_pid": worker.pid})
+        return worker
+
+    def _release(self, worker: PythonCodeWorkerProcess) -> None:
+        if worker.is_alive() and worker.task_count < self.max_tasks_per_worker:
+            self._idle_workers.put(worker)
+            return
+        self.log_debug(
+            "Recycling python code worker.",
+            extra={"worker_pid": worker.pid, "task_count": worker.task_count, "alive": worker.is_alive()},
+        )
+        worker.close()
+        self._idle_workers.put(None)
+
+    def execute(self, request: PythonCodeWorkerRequest) -> PythonCodeWorkerResponse:
+        worker = self._acquire()
+        try:
+            return worker.request(request)
+        except PythonCodeWorkerError as e:
+            self.log_error(str(e))
+            raise
+        finally:
+            self._release(worker)
+
+    def close(self) -> None:
+        drained = 0
+        while True:
+            try:
+                worker = self._idle_workers.get_nowait()
+            except Empty:
+                break
+            if worker is not None:
+                worker.close()
+            drained += 1
+        for _ in range(drained):
+            self._idle_workers.put(None)
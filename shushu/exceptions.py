@@ -9,3 +9,10 @@ class BaseCoreError(BaseError): ...
 class MemoryNotSetError(BaseCoreError):
     def __init__(self) -> None:
         super(MemoryNotSetError, self).__init__("Memory is not set.")
+
+
+class PlanValidationError(BaseCoreError):
+    def __init__(self, path: str, reason: str) -> None:
+        super(PlanValidationError, self).__init__(f"Invalid plan at {path}: {reason}.")
+        self.path = path
+        self.reason = reason
@@ -0,0 +1,32 @@
+import json
+from hashlib import sha256
+from typing import Any
+
+from pydantic import BaseModel
+
+VOLATILE_FIELDS = {"id", "created_at", "updated_at"}
+
+
+def _strip_volatile_fields(value: Any) -> Any:
+    if isinstance(value, dict):
+        # entities, such as the elements of an ElementSequence, are the objects that carry an id and both timestamps
+        is_entity = VOLATILE_FIELDS.issubset(value)
+        return {k: _strip_volatile_fields(v) for k, v in value.items() if not (is_entity and k in VOLATILE_FIELDS)}
+    if isinstance(value, list):
+        return [_strip_volatile_fields(v) for v in value]
+    return value
+
+
+def compute_content_hash(data: BaseModel) -> str:
+    """Returns a hash of the fields of a model except for the ids and timestamps of the model and the entities in it.
+
+    >>> from oltl import Id
+    >>> from shushu.models import IdData
+    >>> value = Id.generate()
+    >>> compute_content_hash(IdData(value=value)) == compute_content_hash(IdData(value=value))
+    True
+    >>> compute_content_hash(IdData(value=value)) == compute_content_hash(IdData(value=Id.generate()))
+    False
+    """
+    content = _strip_volatile_fields(data.model_dump(mode="json"))
+    return sha256(json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")).hexdigest()
@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from logging import Logger
 
 from ..base import BaseShushuComponent
@@ -13,5 +14,10 @@ class BaseInterface(BaseShushuComponent):
     def core(self) -> ShushuCore:
         return self._core
 
-    def run(self, target: str) -> None:
+    def run(self, target: str) -> int:
+        """Scrapes `target` and returns the number of targets that failed."""
+        raise NotImplementedError
+
+    def run_batch(self, targets: Iterable[str]) -> int:
+        """Scrapes every target and returns the number of targets that failed."""
         raise NotImplementedError
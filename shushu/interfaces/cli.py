@@ -1,4 +1,144 @@
+import sys
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from logging import Logger
+from pathlib import Path
+from time import perf_counter
+from typing import Optional, TextIO
+
+from pydantic import TypeAdapter, ValidationError
+
+from ..actions import CoreAction, OpenMemoryUrlCoreAction
+from ..core import ShushuCore
+from ..models import BaseDataModel, Url, UrlData
+from ..plans import Plan, action_checkpoint_prefix, compile_plan
 from .base import BaseInterface
 
 
-class CliInterface(BaseInterface): ...
+def load_core_action(path: Path) -> CoreAction:
+    """Reads the JSON of a `CoreAction` from `path`."""
+    action: CoreAction = TypeAdapter(CoreAction).validate_json(path.read_bytes())
+    return action
+
+
+def read_targets(lines: Iterable[str]) -> Iterator[str]:
+    """Yields the targets listed one per line, skipping blank lines and comments.
+
+    >>> list(read_targets(["http://localhost:8080/\\n", "\\n", "# done\\n", " http://localhost:8080/a \\n"]))
+    ['http://localhost:8080/', 'http://localhost:8080/a']
+    """
+    for line in lines:
+        target = line.strip()
+        if len(target) > 0 and not target.startswith("#"):
+            yield target
+
+
+class CliInterface(BaseInterface):
+    """Performs `action` for every target with one long-lived core.
+
+    Each target is the memory of its run as a `UrlData`, so plans usually start with an `OpenMemoryUrlCoreAction`.
+    Without an action the targets are only opened, which is enough to fill a page cache. Targets are read lazily,
+    `batch_size` at a time, and each batch is spread over up to `concurrency` web agents, which are kept open for the
+    following batches. A target that fails is logged and counted without stopping the others. Progress, throughput
+    and failures are printed to `progress_stream` (stderr by default) after every batch.
+
+    `action` is compiled on construction, so that an invalid plan fails before any target is read, unless its compiled
+    `plan` is passed along.
+    """
+
+    def __init__(
+        self,
+        core: ShushuCore,
+        logger: Logger,
+        action: Optional[CoreAction] = None,
+        concurrency: int = 1,
+        batch_size: int = 100,
+        progress_stream: Optional[TextIO] = None,
+        plan: Optional[Plan] = None,
+    ) -> None:
+        super(CliInterface, self).__init__(core=core, logger=logger)
+        self._action: CoreAction = OpenMemoryUrlCoreAction() if action is None else action
+        self._plan = compile_plan(self._action) if plan is None else plan
+        # a plan parsed again on a restart gets new ids, so its checkpoints are keyed by its content
+        self._checkpoint_prefix = action_checkpoint_prefix(self._action)
+        self._concurrency = concurrency
+        self._batch_size = batch_size
+        self._progress_stream = progress_stream
+
+    @property
+    def action(self) -> CoreAction:
+        return self._action
+
+    @property
+    def plan(self) -> Plan:
+        return self._plan
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    @property
+    def progress_stream(self) -> TextIO:
+        return sys.stderr if self._progress_stream is None else self._progress_stream
+
+    def run(self, target: str) -> int:
+        return self.run_batch([target])
+
+    def _report_progress(self, target_count: int, failure_count: int, seconds: float) -> None:
+        throughput = target_count / seconds if seconds > 0 else 0.0
+        self.progress_stream.write(
+            f"{target_count} targets in {seconds:.1f}s ({throughput:.2f} targets/s, {failure_count} failed)\n"
+        )
+        self.progress_stream.flush()
+
+    def _report_failure(self, target: str, error: Exception) -> None:
+        self.log_error("Target failed.", extra={"target": target, "error": repr(error)})
+
+    def _to_items(self, targets: list[str], failed_targets: list[str]) -> list[BaseDataModel]:
+        items: list[BaseDataModel] = []
+        for target in targets:
+            try:
+                items.append(UrlData(url=Url(value=target)))
+            except ValidationError as e:
+                self._report_failure(target, e)
+                failed_targets.append(target)
+        return items
+
+    def run_batch(self, targets: Iterable[str]) -> int:
+        target_iterator = iter(targets)
+        target_count = 0
+        failed_targets: list[str] = []
+
+        def on_error(item: BaseDataModel, error: Exception) -> None:
+            target = str(item.url.value) if isinstance(item, UrlData) else str(item.id)
+            self._report_failure(target, error)
+            failed_targets.append(target)
+
+        start = perf_counter()
+        with self.core:
+            while True:
+                batch = list(islice(target_iterator, self.batch_size))
+                if len(batch) == 0:
+                    break
+                self.core.map(
+                    action=self.plan,
+                    items=self._to_items(batch, failed_targets),
+                    max_workers=self.concurrency,
+                    ordered=False,
+                    checkpoint_prefix=self._checkpoint_prefix,
+                    on_error=on_error,
+                    # the targets are independent, so the core's own web agent is one of the workers
+                    use_own_web_agent=True,
+                )
+                target_count += len(batch)
+                self._report_progress(target_count, len(failed_targets), perf_counter() - start)
+        seconds = perf_counter() - start
+        self.log_info(
+            "Finished targets.",
+            extra={"target_count": target_count, "failure_count": len(failed_targets), "seconds": seconds},
+        )
+        return len(failed_targets)
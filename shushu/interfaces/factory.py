@@ -1,18 +1,35 @@
+from collections.abc import Callable
 from logging import Logger
 
 from ..base import BaseComponentFactory
 from ..core import ShushuCore
+from ..plans import compile_plan
 from ..settings import CliInterfaceSettings, InterfaceSettings
 from .base import BaseInterface
-from .cli import CliInterface
+from .cli import CliInterface, load_core_action
 
 
 class InterfaceFactory(BaseComponentFactory[InterfaceSettings, BaseInterface]):
-    def __init__(self, core: ShushuCore, logger: Logger) -> None:
+    """Creates interfaces with the core built by `core_factory`.
+
+    The core is only built once the plan of the interface is loaded and validated, so that an invalid plan fails
+    before the core starts its web agents.
+    """
+
+    def __init__(self, core_factory: Callable[[], ShushuCore], logger: Logger) -> None:
         super(InterfaceFactory, self).__init__(logger=logger)
-        self._core = core
+        self._core_factory = core_factory
 
     def create(self, settings: InterfaceSettings) -> BaseInterface:
         if isinstance(settings, CliInterfaceSettings):
-            return CliInterface(core=self._core, logger=self._logger)
+            action = None if settings.plan_path is None else load_core_action(settings.plan_path)
+            plan = None if action is None else compile_plan(action)
+            return CliInterface(
+                core=self._core_factory(),
+                logger=self._logger,
+                action=action,
+                concurrency=settings.concurrency,
+                batch_size=settings.batch_size,
+                plan=plan,
+            )
         raise TypeError(f"Unsupported settings type: {type(settings)}")
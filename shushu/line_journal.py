@@ -0,0 +1,75 @@
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Optional
+
+READ_BACK_SIZE = 4096
+
+
+class LineJournal:
+    """An append-only file of lines that survives interrupted runs.
+
+    Appended lines are kept in memory until `flush`, so that callers can write the data they describe first. Lines are
+    only read back when they are complete, because an interrupted run leaves a partially written last line, and the
+    partial line is cut off before new lines are appended. The journal is not thread safe, so callers serialize
+    their calls.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._pending: list[str] = []
+        self._writer: Optional[IO[str]] = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def read_lines(self) -> Iterator[str]:
+        """Yields the complete lines of the file, without their newlines."""
+        if not self._path.exists():
+            return
+        with open(self._path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.endswith("\n"):
+                    yield line[:-1]
+
+    def append(self, line: str) -> None:
+        self._pending.append(line)
+
+    def _truncate_partial_line(self) -> None:
+        with open(self._path, "rb+") as f:
+            end = f.seek(0, 2)
+            position = end
+            while position > 0:
+                start = max(0, position - READ_BACK_SIZE)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b"\n")
+                if newline >= 0:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                f.truncate(position)
+
+    def _open_writer(self) -> IO[str]:
+        if self._path.exists():
+            self._truncate_partial_line()
+        return open(self._path, "a", encoding="utf-8")
+
+    def flush(self) -> None:
+        if len(self._pending) == 0:
+            return
+        if self._writer is None:
+            self._writer = self._open_writer()
+        self._writer.write("".join(f"{line}\n" for line in self._pending))
+        self._writer.flush()
+        self._pending.clear()
+
+    def close(self) -> None:
+        """Closes the file. Lines that were not flushed are dropped."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
@@ -1,28 +1,53 @@
 import os
+import sys
 from argparse import ArgumentParser
 
-from ollogger import get_logger
-
 from . import __version__
-from .core import gen_shushu_core
-from .interfaces.factory import InterfaceFactory
-from .settings import GlobalSettings
 
 
 def main() -> None:
     parser = ArgumentParser()
     parser.add_argument("--version", action="version", version=f"shushu {__version__}")
     parser.add_argument("--config-env-file-path", type=str, help="Path to the configuration env file")
-    parser.add_argument("target", type=str, help="The target url to scrape")
+    parser.add_argument("--targets-file", type=str, help="Path to a file of target urls, one per line (- for stdin)")
+    parser.add_argument("--plan", type=str, help="Path to the JSON file of the action to perform for every target")
+    parser.add_argument("--concurrency", type=int, help="Number of targets processed at once")
+    parser.add_argument("target", type=str, nargs="?", help="The target url to scrape")
 
     args = parser.parse_args()
+    if (args.target is None) == (args.targets_file is None):
+        parser.error("either a target or --targets-file is required")
+
+    # the rest of the package is imported only after the arguments are parsed so that --version and usage errors
+    # do not pay for it
+    from ollogger import get_logger
+
+    from .core import gen_shushu_core
+    from .interfaces.cli import read_targets
+    from .interfaces.factory import InterfaceFactory
+    from .settings import GlobalSettings
 
     config_file_env = args.config_env_file_path
     if config_file_env is None:
         config_file_env = os.getenv("SHUSHU_CONFIG_ENV_FILE_PATH", ".env")
     global_settings = GlobalSettings(_env_file=config_file_env)
+    # command line arguments take precedence over the interface settings
+    arguments = {"plan_path": args.plan, "concurrency": args.concurrency}
+    overrides = {key: value for key, value in arguments.items() if value is not None}
+    interface_settings = global_settings.interface_settings
+    if len(overrides) > 0:
+        interface_settings = type(interface_settings)(**{**interface_settings.model_dump(), **overrides})
     logger = get_logger(settings=global_settings.logger_settings)
     logger.info("global settings", extra={"global_settings": global_settings.model_dump()})
-    shushu_core = gen_shushu_core(settings=global_settings.core_settings, logger=logger)
-    interface = InterfaceFactory(core=shushu_core, logger=logger).create(settings=global_settings.interface_settings)
-    interface.run(target=args.target)
+    interface = InterfaceFactory(
+        core_factory=lambda: gen_shushu_core(settings=global_settings.core_settings, logger=logger), logger=logger
+    ).create(settings=interface_settings)
+    if args.targets_file is None:
+        failure_count = interface.run(target=args.target)
+    elif args.targets_file == "-":
+        failure_count = interface.run_batch(read_targets(sys.stdin))
+    else:
+        with open(args.targets_file, "r", encoding="utf-8") as f:
+            failure_count = interface.run_batch(read_targets(f))
+    if failure_count > 0:
+        sys.exit(1)
@@ -1,7 +1,11 @@
-from collections.abc import Sequence
-from typing import Any, Optional
+import json
+import re
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from hashlib import sha256
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Optional, overload
 
-from bs4 import BeautifulSoup, NavigableString, Tag
 from oltl import (
     BaseEntity,
     BaseModel,
@@ -9,23 +13,88 @@ from oltl import (
     Id,
     json_schema_to_model,
 )
-from pydantic import AnyHttpUrl
+from pydantic import AnyHttpUrl, Field, SerializeAsAny, model_validator
 
 from .types import (
     ClassSet,
     ClassString,
+    CompactElementSequenceTypeId,
     DataId,
+    DataSequenceTypeId,
     ElementSequenceTypeId,
     ElementTypeId,
+    HtmlParserType,
     HtmlSource,
     IdTypeId,
     ImageBinary,
     TagString,
     TypeId,
+    UrlDataTypeId,
     UserId,
     UserNameString,
 )
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, Tag
+    from lxml.html import HtmlElement
+
+TEXT_XPATH = ".//text()[not(ancestor::script) and not(ancestor::style)]"
+DOCUMENT_TAG_PATTERN = re.compile(r"(?:\s|<!--.*?-->|<![^>]*>|<\?[^>]*>)*<(html|head|body)[\s/>]", re.I | re.S)
+
+
+def _collapse_blank(text: str) -> str:
+    """Collapses a whitespace-only string the way BeautifulSoup does, so that both parsers return the same text.
+
+    >>> _collapse_blank("\\n    "), _collapse_blank("  "), _collapse_blank(" a ")
+    ('\\n', ' ', ' a ')
+    """
+    if text == "" or not text.isspace():
+        return text
+    return "\n" if "\n" in text else " "
+
+
+def _find_document_tag(html_source: str) -> Optional[str]:
+    """Returns the name of the first tag of `html_source` when it is `html`, `head` or `body`.
+
+    >>> _find_document_tag("<!DOCTYPE html><!-- page --><HTML lang='en'><body></body></HTML>")
+    'html'
+    >>> _find_document_tag(" <body class='k'>x</body>"), _find_document_tag("<p>a</p><body></body>")
+    ('body', None)
+    """
+    match = DOCUMENT_TAG_PATTERN.match(html_source)
+    return None if match is None else match.group(1).lower()
+
+
+def _is_lxml_element(value: Any) -> bool:
+    # fragments_fromstring returns leading text as a string, and comments are elements without a tag name
+    from lxml.html import HtmlElement
+
+    return isinstance(value, HtmlElement) and isinstance(value.tag, str)
+
+
+_html_parser_type = HtmlParserType.HTML_PARSER
+
+
+def get_html_parser_type() -> HtmlParserType:
+    """Returns the parser `Element` answers `classes`, `tag_name`, `text` and `get_attribute` with in this process.
+
+    >>> set_html_parser_type(HtmlParserType.LXML)
+    >>> get_html_parser_type()
+    <HtmlParserType.LXML: 'LXML'>
+    >>> set_html_parser_type(HtmlParserType.HTML_PARSER)
+    """
+    return _html_parser_type
+
+
+def set_html_parser_type(html_parser_type: HtmlParserType) -> None:
+    """Selects the parser of `get_html_parser_type` for this process.
+
+    Python code worker processes select the parser they are started with once, see `PythonCodeWorkerProcess`, so
+    cores pass `CoreSettings.html_parser_type` to their workers instead of selecting it here.
+    """
+    global _html_parser_type
+    _html_parser_type = html_parser_type
+
 
 class Rectangle(BaseModel):
     x: int
@@ -51,6 +120,13 @@ class IdData(BaseDataModel):
     value: Id
 
 
+class UrlData(BaseDataModel):
+    """A URL to work on, such as a target of the CLI, which `OpenMemoryUrlCoreAction` opens as it is."""
+
+    type_id: TypeId = UrlDataTypeId
+    url: Url
+
+
 class Element(BaseDataModel):
     type_id: TypeId = ElementTypeId
     url: Url
@@ -59,15 +135,57 @@ class Element(BaseDataModel):
     location: Optional[Rectangle] = None
 
     @property
-    def parsed_html(self) -> BeautifulSoup:
+    def parsed_html(self) -> "BeautifulSoup":
+        # bs4 is only loaded once an element is inspected
+        from bs4 import BeautifulSoup
+
         self._parsed_html: BeautifulSoup
         if not hasattr(self, "_parsed_html") or self._parsed_html is None:
             setattr(self, "_parsed_html", BeautifulSoup(self.html_source, "html.parser"))
         return self._parsed_html
 
     @property
-    def root(self) -> Tag | None | NavigableString:
-        return self.parsed_html.find(True)
+    def root(self) -> "Tag | None":
+        """Returns the first element of the source parsed by BeautifulSoup, whatever parser is selected.
+
+        It offers the BeautifulSoup API, so code that is meant to run with the lxml parser uses `lxml_root` instead.
+        """
+        from bs4 import Tag
+
+        root = self.parsed_html.find(True)
+        return root if isinstance(root, Tag) else None
+
+    @property
+    def lxml_root(self) -> "HtmlElement | None":
+        """
+        Returns the element parsed by lxml, which is much faster than `parsed_html` but offers the lxml API.
+
+        Like `root`, it is the first element of the source, and `html`, `head` and `body` elements are kept.
+
+        >>> element = Element(url=Url(value="https://example.com"), html_source="<li class='item'>text</li>")
+        >>> element.lxml_root.tag
+        'li'
+        >>> Element(url=Url(value="https://example.com"), html_source="<body><p>a</p></body>").lxml_root.tag
+        'body'
+        """
+        from lxml.etree import ParserError
+        from lxml.html import document_fromstring, fragments_fromstring
+
+        self._lxml_root: HtmlElement | None
+        if not hasattr(self, "_lxml_root"):
+            root = None
+            try:
+                document_tag = _find_document_tag(self.html_source)
+                if document_tag is not None:
+                    # fragments are parsed into an implied body, which would swallow these elements
+                    document = document_fromstring(self.html_source)
+                    root = document if document_tag == "html" else document.find(document_tag)
+                else:
+                    root = next((f for f in fragments_fromstring(self.html_source) if _is_lxml_element(f)), None)
+            except ParserError:
+                root = None
+            setattr(self, "_lxml_root", root)
+        return self._lxml_root
 
     @property
     def classes(self) -> ClassSet:
@@ -87,7 +205,13 @@ class Element(BaseDataModel):
         >>> element.classes
         ClassSet()
         """
-        if isinstance(self.root, NavigableString) or self.root is None:
+        if get_html_parser_type() == HtmlParserType.LXML:
+            lxml_root = self.lxml_root
+            lxml_classes = None if lxml_root is None else lxml_root.get("class")
+            return (
+                ClassSet() if lxml_classes is None else ClassSet(ClassString.from_str(c) for c in lxml_classes.split())
+            )
+        if self.root is None:
             return ClassSet()
         classes = self.root.get("class")
         if classes is None:
@@ -108,7 +232,9 @@ class Element(BaseDataModel):
         >>> element.tag_name
         TagString('div')
         """
-        if isinstance(self.root, NavigableString) or self.root is None:
+        if get_html_parser_type() == HtmlParserType.LXML:
+            return None if self.lxml_root is None else TagString.from_str(self.lxml_root.tag)
+        if self.root is None:
             return None
         return TagString.from_str(self.root.name)
 
@@ -124,16 +250,164 @@ class Element(BaseDataModel):
         >>> element.text
         'text'
         """
-        if isinstance(self.root, NavigableString) or self.root is None:
+        if get_html_parser_type() == HtmlParserType.LXML:
+            return "" if self.lxml_root is None else "".join(map(_collapse_blank, self.lxml_root.xpath(TEXT_XPATH)))
+        if self.root is None:
             return ""
         return self.root.get_text()
 
+    def get_attribute(self, name: str) -> str | None:
+        """
+        Returns the value of an attribute of the element.
+
+        Returns:
+            str | None: The value of the attribute, or None when the element does not have it.
+
+        >>> element = Element(url=Url(value="https://example.com"), html_source="<a href='page1.html'>next</a>")
+        >>> element.get_attribute("href")
+        'page1.html'
+        >>> element.get_attribute("title") is None
+        True
+        """
+        if get_html_parser_type() == HtmlParserType.LXML:
+            return None if self.lxml_root is None else self.lxml_root.get(name)
+        if self.root is None:
+            return None
+        value = self.root.get(name)
+        if value is None or isinstance(value, str):
+            return value
+        return " ".join(value)
+
 
 class ElementSequence(BaseDataModel):
     type_id: TypeId = ElementSequenceTypeId
     elements: Sequence[Element]
 
 
+class CompactElements(Sequence[Element]):
+    """A read-only view of the elements of a `CompactElementSequence` that builds each `Element` when first accessed."""
+
+    __slots__ = ("_sequence",)
+
+    def __init__(self, sequence: "CompactElementSequence") -> None:
+        self._sequence = sequence
+
+    def __len__(self) -> int:
+        return len(self._sequence.offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> Element: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Element]: ...
+
+    def __getitem__(self, index: int | slice) -> Element | Sequence[Element]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._sequence.get_element(index)
+
+
+class CompactElementSequence(BaseDataModel):
+    """The elements of a single page stored as one HTML buffer.
+
+    The HTML sources of the elements are concatenated into `html_buffer`, `offsets` holds where each of them starts
+    followed by the end of the buffer, and all of them share `url`. `elements` builds an `Element` when it is first
+    accessed and keeps it, so an unread sequence costs one string and one list of integers however many elements it
+    has, and it is serialized without an id, timestamps and url per element.
+
+    >>> sequence = CompactElementSequence.from_html_sources(
+    ...     url=Url(value="https://example.com"), html_sources=["<li>a</li>", "<li>b</li>"]
+    ... )
+    >>> sequence.offsets
+    [0, 10, 20]
+    >>> [element.text for element in sequence.elements]
+    ['a', 'b']
+    """
+
+    type_id: TypeId = CompactElementSequenceTypeId
+    url: Optional[Url] = None
+    html_buffer: str = ""
+    offsets: list[int] = Field(default_factory=lambda: [0])
+
+    @model_validator(mode="after")
+    def _validate_offsets(self) -> "CompactElementSequence":
+        if len(self.offsets) == 0 or self.offsets[0] != 0 or self.offsets[-1] != len(self.html_buffer):
+            raise ValueError("offsets must start at 0 and end at the end of html_buffer")
+        if any(start > end for start, end in zip(self.offsets, self.offsets[1:])):
+            raise ValueError("offsets must not decrease")
+        if self.url is None and len(self.offsets) > 1:
+            raise ValueError("url is required when the sequence has elements")
+        return self
+
+    @classmethod
+    def from_html_sources(cls, url: Optional[Url], html_sources: Iterable[str]) -> "CompactElementSequence":
+        parts: list[str] = []
+        offsets = [0]
+        for html_source in html_sources:
+            parts.append(html_source)
+            offsets.append(offsets[-1] + len(html_source))
+        return cls(url=url, html_buffer="".join(parts), offsets=offsets)
+
+    @classmethod
+    def from_element_sequence(cls, element_sequence: ElementSequence) -> "CompactElementSequence":
+        elements = element_sequence.elements
+        url = elements[0].url if len(elements) > 0 else None
+        if any(element.url != url for element in elements):
+            raise ValueError("Elements of a compact element sequence must share their url")
+        return cls.from_html_sources(url=url, html_sources=(str(element.html_source) for element in elements))
+
+    @property
+    def elements(self) -> CompactElements:
+        return CompactElements(self)
+
+    def get_element(self, index: int) -> Element:
+        """Returns the element at `index`.
+
+        Every element is built once and kept, so that it has the same id and timestamps on every access.
+
+        >>> sequence = CompactElementSequence.from_html_sources(
+        ...     url=Url(value="https://example.com"), html_sources=["<li>a</li>", "<li>b</li>"]
+        ... )
+        >>> sequence.elements[0].id == sequence.elements[0].id == sequence.get_element(-2).id
+        True
+        """
+        html_source = self.get_html_source(index)
+        if index < 0:
+            index += len(self.offsets) - 1
+        self._built_elements: dict[int, Element]
+        if not hasattr(self, "_built_elements"):
+            setattr(self, "_built_elements", {})
+        element = self._built_elements.get(index)
+        if element is None:
+            element = Element(url=self.url, html_source=html_source)
+            self._built_elements[index] = element
+        return element
+
+    def get_html_source(self, index: int) -> str:
+        if index < 0:
+            index += len(self.offsets) - 1
+        if not 0 <= index < len(self.offsets) - 1:
+            raise IndexError("element index out of range")
+        return self.html_buffer[self.offsets[index] : self.offsets[index + 1]]
+
+    def to_element_sequence(self) -> ElementSequence:
+        return ElementSequence(elements=list(self.elements))
+
+
+class DataSequence(BaseDataModel):
+    """A sequence of data models of any type, such as the results of a `ParallelCoreAction`.
+
+    >>> class ADataModel(BaseDataModel):
+    ...     type_id: TypeId = TypeId("01HVA7ZG5GKAK9QVBVV5029H3V")
+    ...     a: int
+    >>> '"a":1' in DataSequence(data=[ADataModel(a=1)]).model_dump_json()
+    True
+    """
+
+    type_id: TypeId = DataSequenceTypeId
+    data: Sequence[SerializeAsAny[BaseDataModel]]
+
+
 def json_schema_to_data_model(json_schema: dict[str, Any]) -> type[BaseDataModel]:
     """Create a Pydantic model from a JSON schema.
 
@@ -161,3 +435,102 @@ def json_schema_to_data_model(json_schema: dict[str, Any]) -> type[BaseDataModel
     if not issubclass(dynamic_model, BaseDataModel):
         raise ValueError(f"Expected a subclass of BaseDataModel, but got {dynamic_model}")
     return dynamic_model
+
+
+def json_schema_key(json_schema: dict[str, Any]) -> str:
+    """Returns a stable key of a JSON schema.
+
+    The key is the SHA-256 hash of the canonical (sorted keys, no whitespace) JSON representation of the schema.
+
+    Args:
+        json_schema (dict): The JSON schema.
+
+    Returns:
+        str: The key of the JSON schema.
+
+    >>> json_schema_key({"a": 1, "b": 2}) == json_schema_key({"b": 2, "a": 1})
+    True
+    >>> json_schema_key({"a": 1}) == json_schema_key({"a": 2})
+    False
+    """
+    canonical = json.dumps(json_schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class DataModelCache:
+    """Bounded LRU cache of dynamic data models keyed by `json_schema_key`.
+
+    >>> class ADataModel(BaseDataModel):
+    ...     type_id: TypeId = TypeId("01HVA7ZG5GKAK9QVBVV5029H3V")
+    ...     a: int
+    ...
+    >>> cache = DataModelCache(max_size=1)
+    >>> json_schema = ADataModel.model_json_schema()
+    >>> cache.get_or_create(json_schema) is cache.get_or_create(json_schema)
+    True
+    >>> (cache.hits, cache.misses)
+    (1, 1)
+    >>> cache.get("unknown") is None
+    True
+    >>> (cache.hits, cache.misses)
+    (1, 2)
+    """
+
+    def __init__(self, max_size: int = 128) -> None:
+        if max_size < 1:
+            raise ValueError(f"Cache size must be positive, but got {max_size}")
+        self._max_size = max_size
+        self._models: OrderedDict[str, type[BaseDataModel]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def get(self, key: str) -> Optional[type[BaseDataModel]]:
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._models.move_to_end(key)
+            return model
+
+    def put(self, key: str, model: type[BaseDataModel]) -> None:
+        with self._lock:
+            self._models[key] = model
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_size:
+                self._models.popitem(last=False)
+
+    def get_or_create(self, json_schema: dict[str, Any], key: Optional[str] = None) -> type[BaseDataModel]:
+        if key is None:
+            key = json_schema_key(json_schema)
+        model = self.get(key)
+        if model is None:
+            model = json_schema_to_data_model(json_schema)
+            self.put(key, model)
+        return model
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+data_model_cache = DataModelCache()
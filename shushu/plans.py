@@ -0,0 +1,311 @@
+import ast
+from collections.abc import Callable
+from typing import TYPE_CHECKING, NamedTuple, Optional, Union
+
+from .actions import (
+    BaseCoreAction,
+    ClickSelectedElementAction,
+    CoreAction,
+    DataProcessorAction,
+    DataProcessorCoreAction,
+    GenerateIdCoreAction,
+    MemoryPayload,
+    MinimumEnclosingElementWithMultipleTextsSelector,
+    OpenMemoryUrlCoreAction,
+    OpenUrlAction,
+    PaginateCoreAction,
+    ParallelCoreAction,
+    Payload,
+    PythonCodeDataProcessorAction,
+    SaveDataAction,
+    Selector,
+    SequencialCoreAction,
+    SetSelectorAction,
+    StorageAction,
+    StorageCoreAction,
+    StreamCoreAction,
+    WebAgentAction,
+    WebAgentCoreAction,
+    XPathSelector,
+)
+from .data_processors.base import BaseDataProcessor
+from .exceptions import PlanValidationError
+from .hashing import compute_content_hash
+from .models import BaseDataModel
+from .types import CoreActionId, PaginationMode
+
+if TYPE_CHECKING:
+    from .data_processors.factory import DataProcessorFactory
+
+SUPPORTED_SELECTORS = (XPathSelector, MinimumEnclosingElementWithMultipleTextsSelector)
+
+# creates the data processor of a step for the payload it processes
+DataProcessorBuilder = Callable[[BaseDataModel], BaseDataProcessor]
+
+
+class GenerateIdStep(NamedTuple):
+    action_id: CoreActionId
+
+
+class WebAgentStep(NamedTuple):
+    action_id: CoreActionId
+    action: WebAgentAction
+
+
+class OpenMemoryUrlStep(NamedTuple):
+    action_id: CoreActionId
+    attribute: Optional[str]
+
+
+class StorageStep(NamedTuple):
+    action_id: CoreActionId
+    action: StorageAction
+    payload: Optional[MemoryPayload]
+
+
+class DataProcessorStep(NamedTuple):
+    action_id: CoreActionId
+    action: DataProcessorAction
+    payload: Payload
+    processor: Optional[DataProcessorBuilder] = None
+
+
+class ParallelStep(NamedTuple):
+    action_id: CoreActionId
+    checkpoint_prefix: str
+    payload: MemoryPayload
+    plan: "Plan"
+    max_workers: int
+    ordered: bool
+
+
+class PaginateStep(NamedTuple):
+    action_id: CoreActionId
+    checkpoint_prefix: str
+    plan: "Plan"
+    next_selector: Selector
+    mode: PaginationMode
+    max_pages: Optional[int]
+    prefetch: bool
+
+
+class StreamStep(NamedTuple):
+    action_id: CoreActionId
+    action: DataProcessorAction
+    storage_action: StorageAction
+    storage_payload: MemoryPayload
+    chunk_size: int
+    compact: bool
+    processor: Optional[DataProcessorBuilder] = None
+
+
+PlanStep = Union[
+    GenerateIdStep,
+    WebAgentStep,
+    OpenMemoryUrlStep,
+    StorageStep,
+    DataProcessorStep,
+    ParallelStep,
+    PaginateStep,
+    StreamStep,
+]
+
+
+class Plan(NamedTuple):
+    """A validated `CoreAction` tree lowered into the steps the cores run one after another.
+
+    The data processors of its steps are resolved by `bind_plan` once the core that runs it is known.
+    """
+
+    steps: tuple[PlanStep, ...]
+
+
+def _bind_step(step: PlanStep, data_processor_factory: "DataProcessorFactory") -> PlanStep:
+    if isinstance(step, (DataProcessorStep, StreamStep)) and step.processor is None:
+        return step._replace(processor=data_processor_factory.resolve(step.action))
+    if isinstance(step, (ParallelStep, PaginateStep)):
+        plan = bind_plan(step.plan, data_processor_factory)
+        return step if plan is step.plan else step._replace(plan=plan)
+    return step
+
+
+def bind_plan(plan: Plan, data_processor_factory: "DataProcessorFactory") -> Plan:
+    """Returns `plan` with the data processors of its steps, nested ones included, resolved by the factory.
+
+    A plan whose processors are all resolved is returned as it is.
+    """
+    steps = tuple(_bind_step(step, data_processor_factory) for step in plan.steps)
+    if all(bound is step for bound, step in zip(steps, plan.steps)):
+        return plan
+    return Plan(steps=steps)
+
+
+def action_checkpoint_prefix(action: CoreAction, path: str = "action") -> str:
+    """Returns the prefix of the checkpoint keys of `action` found at `path` of an action tree.
+
+    The prefix is derived from the content of the action without the ids and timestamps in it, so that plans built or
+    parsed again on a restart share the checkpoints of the interrupted run.
+
+    >>> from shushu.actions import GenerateIdCoreAction
+    >>> action_checkpoint_prefix(GenerateIdCoreAction()) == action_checkpoint_prefix(GenerateIdCoreAction())
+    True
+    >>> action_checkpoint_prefix(GenerateIdCoreAction(), "action.actions[1]").startswith("action.actions[1]:")
+    True
+    """
+    return f"{path}:{compute_content_hash(action)}"
+
+
+def _defines_convert(code: str) -> bool:
+    """
+    >>> _defines_convert("def convert(element):\\n    return element")
+    True
+    >>> _defines_convert("from module import function as convert")
+    True
+    >>> _defines_convert("def transform(element):\\n    return element")
+    False
+    """
+    for node in ast.parse(code).body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == "convert":
+            return True
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "convert" for t in node.targets):
+            return True
+        if isinstance(node, (ast.Import, ast.ImportFrom)) and any(
+            (alias.asname or alias.name) == "convert" for alias in node.names
+        ):
+            return True
+    return False
+
+
+def _compile_sequencial(action: SequencialCoreAction, path: str) -> list[PlanStep]:
+    steps: list[PlanStep] = []
+    for index, sub_action in enumerate(action.actions):
+        steps.extend(_compile(sub_action, f"{path}.actions[{index}]"))
+    return steps
+
+
+def _compile_parallel(action: ParallelCoreAction, path: str) -> list[PlanStep]:
+    plan = Plan(steps=tuple(_compile(action.action, f"{path}.action")))
+    return [
+        ParallelStep(
+            action_id=action.id,
+            checkpoint_prefix=action_checkpoint_prefix(action, path),
+            payload=action.payload,
+            plan=plan,
+            max_workers=action.max_workers,
+            ordered=action.ordered,
+        )
+    ]
+
+
+def _compile_paginate(action: PaginateCoreAction, path: str) -> list[PlanStep]:
+    if not isinstance(action.next_selector, SUPPORTED_SELECTORS):
+        raise PlanValidationError(
+            path=f"{path}.next_selector", reason=f"unsupported selector {action.next_selector.type}"
+        )
+    if action.prefetch and action.mode != PaginationMode.OPEN_URL:
+        raise PlanValidationError(
+            path=f"{path}.prefetch", reason=f"prefetch is not supported in {action.mode.value} mode"
+        )
+    plan = Plan(steps=tuple(_compile(action.action, f"{path}.action")))
+    return [
+        PaginateStep(
+            action_id=action.id,
+            checkpoint_prefix=action_checkpoint_prefix(action, path),
+            plan=plan,
+            next_selector=action.next_selector,
+            mode=action.mode,
+            max_pages=action.max_pages,
+            prefetch=action.prefetch,
+        )
+    ]
+
+
+def _compile_open_memory_url(action: OpenMemoryUrlCoreAction, path: str) -> list[PlanStep]:
+    return [OpenMemoryUrlStep(action_id=action.id, attribute=action.attribute)]
+
+
+def _compile_generate_id(action: GenerateIdCoreAction, path: str) -> list[PlanStep]:
+    return [GenerateIdStep(action_id=action.id)]
+
+
+def _compile_web_agent(action: WebAgentCoreAction, path: str) -> list[PlanStep]:
+    web_agent_action = action.action
+    if not isinstance(web_agent_action, (OpenUrlAction, SetSelectorAction, ClickSelectedElementAction)):
+        raise PlanValidationError(path=f"{path}.action", reason=f"unsupported action {web_agent_action.type}")
+    if isinstance(web_agent_action, SetSelectorAction) and not isinstance(
+        web_agent_action.selector, SUPPORTED_SELECTORS
+    ):
+        raise PlanValidationError(
+            path=f"{path}.action.selector", reason=f"unsupported selector {web_agent_action.selector.type}"
+        )
+    return [WebAgentStep(action_id=action.id, action=web_agent_action)]
+
+
+def _compile_storage(action: StorageCoreAction, path: str) -> list[PlanStep]:
+    if not isinstance(action.action, SaveDataAction):
+        raise PlanValidationError(path=f"{path}.action", reason=f"unsupported action {action.action.type}")
+    if action.payload is not None and not isinstance(action.payload, MemoryPayload):
+        raise PlanValidationError(path=f"{path}.payload", reason=f"unsupported payload {action.payload.type}")
+    return [StorageStep(action_id=action.id, action=action.action, payload=action.payload)]
+
+
+def _validate_data_processor_action(action: DataProcessorAction, path: str) -> None:
+    if not isinstance(action, PythonCodeDataProcessorAction):
+        raise PlanValidationError(path=path, reason=f"unsupported action {action.type}")
+    try:
+        defines_convert = _defines_convert(str(action.code))
+    except SyntaxError as e:
+        raise PlanValidationError(path=f"{path}.code", reason=f"invalid python code ({e})")
+    if not defines_convert:
+        raise PlanValidationError(path=f"{path}.code", reason="python code does not define convert")
+
+
+def _compile_data_processor(action: DataProcessorCoreAction, path: str) -> list[PlanStep]:
+    _validate_data_processor_action(action.action, f"{path}.action")
+    return [DataProcessorStep(action_id=action.id, action=action.action, payload=action.payload)]
+
+
+def _compile_stream(action: StreamCoreAction, path: str) -> list[PlanStep]:
+    _validate_data_processor_action(action.action, f"{path}.action")
+    if not isinstance(action.storage_action, SaveDataAction):
+        raise PlanValidationError(
+            path=f"{path}.storage_action", reason=f"unsupported action {action.storage_action.type}"
+        )
+    return [
+        StreamStep(
+            action_id=action.id,
+            action=action.action,
+            storage_action=action.storage_action,
+            storage_payload=action.storage_payload,
+            chunk_size=action.chunk_size,
+            compact=action.compact,
+        )
+    ]
+
+
+_COMPILERS: dict[type[BaseCoreAction], Callable[..., list[PlanStep]]] = {
+    SequencialCoreAction: _compile_sequencial,
+    ParallelCoreAction: _compile_parallel,
+    PaginateCoreAction: _compile_paginate,
+    OpenMemoryUrlCoreAction: _compile_open_memory_url,
+    GenerateIdCoreAction: _compile_generate_id,
+    WebAgentCoreAction: _compile_web_agent,
+    StorageCoreAction: _compile_storage,
+    DataProcessorCoreAction: _compile_data_processor,
+    StreamCoreAction: _compile_stream,
+}
+
+
+def _compile(action: CoreAction, path: str) -> list[PlanStep]:
+    compiler = _COMPILERS.get(type(action))
+    if compiler is None:
+        raise PlanValidationError(path=path, reason=f"unsupported action {action.type}")
+    return compiler(action, path)
+
+
+def compile_plan(action: CoreAction) -> Plan:
+    """Validates an action tree and flattens it into a `Plan`.
+
+    Raises `PlanValidationError` naming the offending action, so that broken plans fail before any page is opened.
+    """
+    return Plan(steps=tuple(_compile(action, "action")))
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Literal, TypeVar, Union
+from typing import Literal, Optional, TypeVar, Union
 
 from ollogger import LoggerSettings
 from oltl.settings import BaseSettings as OltlBaseSettings
@@ -7,6 +7,8 @@ from pydantic import DirectoryPath, Field, FilePath, NewPath
 from pydantic_settings import SettingsConfigDict
 from typing_extensions import Annotated
 
+from .types import HtmlParserType
+
 NewOrExistingPath = Annotated[Union[NewPath, FilePath], "NewOrExistingPath"]
 NewOrExistingDirectoryPath = Annotated[Union[DirectoryPath, NewPath], "NewOrExistingDirectoryPath"]
 SettingsT = TypeVar("SettingsT", bound="BaseSettings")
@@ -26,6 +28,9 @@ class BaseInterfaceSettings(BaseSettings):
 
 class CliInterfaceSettings(BaseInterfaceSettings):
     type: Literal[InterfaceType.CLI] = InterfaceType.CLI
+    plan_path: Optional[FilePath] = None
+    concurrency: int = Field(default=1, ge=1)
+    batch_size: int = Field(default=100, ge=1)
 
 
 InterfaceSettings = Annotated[CliInterfaceSettings, Field(discriminator="type")]
@@ -33,10 +38,26 @@ InterfaceSettings = Annotated[CliInterfaceSettings, Field(discriminator="type")]
 
 class WebAgentType(str, Enum):
     SELENIUM = "SELENIUM"
+    HTTP = "HTTP"
+
+
+class PageCacheMode(str, Enum):
+    READ_WRITE = "READ_WRITE"
+    RECORD = "RECORD"
+    REPLAY = "REPLAY"
+
+
+class PageCacheSettings(BaseSettings):
+    path: NewOrExistingDirectoryPath
+    mode: PageCacheMode = PageCacheMode.READ_WRITE
+    ttl: Optional[float] = Field(default=24 * 60 * 60, gt=0)
+    max_size: int = Field(default=1024 * 1024 * 1024, gt=0)
+    max_memory_size: int = Field(default=64 * 1024 * 1024, ge=0)
 
 
 class BaseWebAgentSettings(BaseSettings):
     type: WebAgentType
+    page_cache: Optional[PageCacheSettings] = None
 
 
 class SeleniumDriverType(str, Enum):
@@ -45,10 +66,30 @@ class SeleniumDriverType(str, Enum):
 
 class BaseSeleniumDriverSettings(BaseSettings):
     type: SeleniumDriverType
+    collect_element_locations: bool = False
+
+
+class PageLoadStrategy(str, Enum):
+    NORMAL = "normal"
+    EAGER = "eager"
+    NONE = "none"
+
+
+class BlockedResourceType(str, Enum):
+    IMAGE = "IMAGE"
+    MEDIA = "MEDIA"
+    FONT = "FONT"
+    STYLESHEET = "STYLESHEET"
 
 
 class ChromeSeleniumDriverSettings(BaseSeleniumDriverSettings):
     type: Literal[SeleniumDriverType.CHROME] = SeleniumDriverType.CHROME
+    page_load_strategy: PageLoadStrategy = PageLoadStrategy.NORMAL
+    blocked_url_patterns: list[str] = Field(default_factory=list)
+    blocked_resource_types: list[BlockedResourceType] = Field(default_factory=list)
+    disable_images: bool = False
+    wait_for_xpath: Optional[str] = None
+    wait_timeout: float = Field(default=10.0, gt=0)
 
 
 SeleniumDriverSettings = Annotated[ChromeSeleniumDriverSettings, Field(discriminator="type")]
@@ -57,30 +98,97 @@ SeleniumDriverSettings = Annotated[ChromeSeleniumDriverSettings, Field(discrimin
 class SeleniumWebAgentSettings(BaseWebAgentSettings):
     type: Literal[WebAgentType.SELENIUM] = WebAgentType.SELENIUM
     driver_settings: SeleniumDriverSettings = Field(default_factory=ChromeSeleniumDriverSettings)
+    driver_pool_size: int = Field(default=0, ge=0)
+    driver_pool_prelaunch: bool = True
+    driver_max_uses: int = Field(default=100, ge=1)
+
+
+class HttpWebAgentSettings(BaseWebAgentSettings):
+    type: Literal[WebAgentType.HTTP] = WebAgentType.HTTP
+    timeout: float = Field(default=30.0, gt=0)
+    max_connections_per_host: int = Field(default=10, ge=1)
+    user_agent: str = "shushu"
 
 
-WebAgentSettings = Annotated[SeleniumWebAgentSettings, Field(discriminator="type")]
+WebAgentSettings = Annotated[Union[SeleniumWebAgentSettings, HttpWebAgentSettings], Field(discriminator="type")]
 
 
 class StorageType(str, Enum):
     LOCAL_FILE = "LOCAL_FILE"
+    JSONL_SEGMENT = "JSONL_SEGMENT"
+    SQLITE = "SQLITE"
+
+
+class SegmentCompression(str, Enum):
+    NONE = "NONE"
+    GZIP = "GZIP"
+    ZSTD = "ZSTD"
+
+
+class DeduplicationMode(str, Enum):
+    SKIP = "SKIP"
+    UPDATE = "UPDATE"
+
+
+class DeduplicationSettings(BaseSettings):
+    index_path: NewOrExistingPath
+    mode: DeduplicationMode = DeduplicationMode.SKIP
 
 
 class BaseStorageSettings(BaseSettings):
     type: StorageType
+    deduplication: Optional[DeduplicationSettings] = None
 
 
 class LocalFileStorageSettings(BaseStorageSettings):
     type: Literal[StorageType.LOCAL_FILE] = StorageType.LOCAL_FILE
     path: NewOrExistingDirectoryPath
+    buffer_size: int = Field(default=0, ge=0)
+    flush_interval: float = Field(default=1.0, gt=0)
+
+
+class JsonlSegmentStorageSettings(BaseStorageSettings):
+    type: Literal[StorageType.JSONL_SEGMENT] = StorageType.JSONL_SEGMENT
+    path: NewOrExistingDirectoryPath
+    max_segment_size: int = Field(default=64 * 1024 * 1024, gt=0)
+    compression: SegmentCompression = SegmentCompression.NONE
+
+
+class SqliteStorageSettings(BaseStorageSettings):
+    type: Literal[StorageType.SQLITE] = StorageType.SQLITE
+    path: NewOrExistingPath
+    batch_size: int = Field(default=500, ge=1)
+
+
+StorageSettings = Annotated[
+    Union[LocalFileStorageSettings, JsonlSegmentStorageSettings, SqliteStorageSettings], Field(discriminator="type")
+]
+
+
+class PythonCodeWorkerPoolSettings(BaseSettings):
+    size: int = Field(default=1, ge=0)
+    max_tasks_per_worker: int = Field(default=1000, ge=1)
+
+
+class TracingSettings(BaseSettings):
+    enabled: bool = False
+    trace_path: Optional[NewOrExistingPath] = None
+    log_spans: bool = True
 
 
-StorageSettings = Annotated[LocalFileStorageSettings, Field(discriminator="type")]
+class CheckpointSettings(BaseSettings):
+    path: NewOrExistingPath
+    resume: bool = True
+    flush_interval: int = Field(default=100, ge=1)
 
 
 class CoreSettings(BaseSettings):
     web_agent_settings: WebAgentSettings = Field(default_factory=SeleniumWebAgentSettings)
     storage_settings: StorageSettings = Field(default_factory=lambda: LocalFileStorageSettings(path="."))
+    python_code_worker_pool_settings: PythonCodeWorkerPoolSettings = Field(default_factory=PythonCodeWorkerPoolSettings)
+    tracing_settings: TracingSettings = Field(default_factory=TracingSettings)
+    checkpoint_settings: Optional[CheckpointSettings] = None
+    html_parser_type: HtmlParserType = HtmlParserType.HTML_PARSER
 
 
 class GlobalSettings(BaseSettings):
@@ -0,0 +1,35 @@
+import asyncio
+from logging import Logger
+from typing import Optional
+
+from ..actions import StorageAction
+from ..base import BaseShushuComponent
+from ..models import BaseDataModel
+from .base import BaseStorage
+
+
+class BaseAsyncStorage(BaseShushuComponent):
+    async def perform(self, action: StorageAction, payload: Optional[BaseDataModel] = None) -> None: ...
+
+    async def flush(self) -> None: ...
+
+
+class ThreadedAsyncStorage(BaseAsyncStorage):
+    """Runs a synchronous storage in worker threads so that writes do not block the event loop.
+
+    Calls are not serialized, so the wrapped storage must be thread-safe.
+    """
+
+    def __init__(self, storage: BaseStorage, logger: Logger):
+        super(ThreadedAsyncStorage, self).__init__(logger=logger)
+        self._storage = storage
+
+    @property
+    def storage(self) -> BaseStorage:
+        return self._storage
+
+    async def perform(self, action: StorageAction, payload: Optional[BaseDataModel] = None) -> None:
+        await asyncio.to_thread(self.storage.perform, action=action, payload=payload)
+
+    async def flush(self) -> None:
+        await asyncio.to_thread(self.storage.flush)
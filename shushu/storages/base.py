@@ -7,3 +7,6 @@ from ..models import BaseDataModel
 
 class BaseStorage(BaseShushuComponent):
     def perform(self, action: StorageAction, payload: Optional[BaseDataModel] = None) -> None: ...
+
+    def flush(self) -> None:
+        """Writes out any data the storage is still holding. Storages without buffers have nothing to do."""
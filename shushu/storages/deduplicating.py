@@ -0,0 +1,104 @@
+import json
+from logging import Logger
+from threading import Lock
+from typing import Any, Optional
+
+from pydantic import TypeAdapter
+
+from ..actions import SaveDataAction, StorageAction
+from ..hashing import compute_content_hash
+from ..line_journal import LineJournal
+from ..models import BaseDataModel
+from ..settings import DeduplicationMode, NewOrExistingPath
+from .base import BaseStorage
+
+
+class DeduplicatingStorage(BaseStorage):
+    """Saves data to another storage unless a data with the same content has been saved before.
+
+    Content hashes of saved data are appended to the index file at `index_path` together with the id and creation time
+    of the first data saved with that content, so that duplicates are recognized across runs. In `SKIP` mode duplicates
+    are dropped. In `UPDATE` mode they are saved with the id and creation time of the first data, which overwrites it
+    with a fresh `updated_at` instead of adding a new record.
+
+    A hash is forgotten again when the wrapped storage fails to save its data, and it is only written to the index
+    when the wrapped storage is flushed, so that the index never claims data that a crash has lost.
+    """
+
+    def __init__(
+        self,
+        storage: BaseStorage,
+        index_path: NewOrExistingPath,
+        logger: Logger,
+        mode: DeduplicationMode = DeduplicationMode.SKIP,
+    ) -> None:
+        super(DeduplicatingStorage, self).__init__(logger=logger)
+        self._storage = storage
+        self._index_path = index_path
+        self._mode = mode
+        self._index: dict[str, dict[str, Any]] = {}
+        self._index_journal = LineJournal(index_path)
+        self._lock = Lock()
+        for line in self._index_journal.read_lines():
+            entry = json.loads(line)
+            self._index[entry.pop("hash")] = entry
+
+    def __del__(self) -> None:
+        # hashes that were never flushed are dropped, so their data is saved again by the next run
+        self._index_journal.close()
+
+    @property
+    def storage(self) -> BaseStorage:
+        return self._storage
+
+    @property
+    def mode(self) -> DeduplicationMode:
+        return self._mode
+
+    def perform(self, action: StorageAction, payload: Optional[BaseDataModel] = None) -> None:
+        if not isinstance(action, SaveDataAction) or payload is None:
+            self.storage.perform(action=action, payload=payload)
+            return
+        content_hash = compute_content_hash(payload)
+        with self._lock:
+            entry = self._index.get(content_hash)
+            if entry is None:
+                # the hash is reserved so that concurrent saves of the same content are recognized as duplicates
+                entry = payload.model_dump(mode="json", include={"id", "created_at"})
+                self._index[content_hash] = entry
+                is_new = True
+            else:
+                is_new = False
+        if not is_new:
+            duplicate = self._deduplicate(payload, entry)
+            if duplicate is not None:
+                self.storage.perform(action=action, payload=duplicate)
+            return
+        try:
+            self.storage.perform(action=action, payload=payload)
+        except BaseException:
+            with self._lock:
+                del self._index[content_hash]
+            raise
+        with self._lock:
+            self._index_journal.append(json.dumps({"hash": content_hash, **entry}))
+
+    def _deduplicate(self, data: BaseDataModel, entry: dict[str, Any]) -> Optional[BaseDataModel]:
+        if self.mode == DeduplicationMode.SKIP:
+            self.log_debug("Skipped duplicate data.", extra={"data_id": str(data.id), "duplicate_of": entry["id"]})
+            return None
+        fields = type(data).model_fields
+        return data.model_copy(
+            update={name: TypeAdapter(fields[name].annotation).validate_python(value) for name, value in entry.items()}
+        )
+
+    def flush(self) -> None:
+        # the data must be stored before the index claims it is
+        self.storage.flush()
+        with self._lock:
+            self._index_journal.flush()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._index_journal.close()
@@ -0,0 +1,19 @@
+from ..exceptions import BaseError
+
+
+class BaseStorageError(BaseError):
+    pass
+
+
+class DataNotFoundError(BaseStorageError):
+    def __init__(self, type_id: str, data_id: str) -> None:
+        super(DataNotFoundError, self).__init__(f"Data {data_id} of type {type_id} is not found.")
+        self.type_id = type_id
+        self.data_id = data_id
+
+
+class CompressionNotAvailableError(BaseStorageError):
+    def __init__(self, compression: str, package: str) -> None:
+        super(CompressionNotAvailableError, self).__init__(
+            f"{compression} compression requires the {package} package to be installed."
+        )
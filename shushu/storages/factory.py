@@ -1,11 +1,49 @@
 from ..base import BaseComponentFactory
-from ..settings import BaseStorageSettings
+from ..settings import (
+    BaseStorageSettings,
+    JsonlSegmentStorageSettings,
+    LocalFileStorageSettings,
+    SqliteStorageSettings,
+)
 from .base import BaseStorage
-from .local_file import LocalFileStorage
 
 
 class StorageFactory(BaseComponentFactory[BaseStorageSettings, BaseStorage]):
     def create(self, settings: BaseStorageSettings) -> BaseStorage:
-        if settings.type == settings.type.LOCAL_FILE:
-            return LocalFileStorage(path=settings.path, logger=self._logger)
+        storage = self._create_storage(settings=settings)
+        if settings.deduplication is None:
+            return storage
+        from .deduplicating import DeduplicatingStorage
+
+        return DeduplicatingStorage(
+            storage=storage,
+            index_path=settings.deduplication.index_path,
+            logger=self._logger,
+            mode=settings.deduplication.mode,
+        )
+
+    def _create_storage(self, settings: BaseStorageSettings) -> BaseStorage:
+        # backends are imported by the branch that needs them so that unused ones are never loaded
+        if isinstance(settings, LocalFileStorageSettings):
+            from .local_file import LocalFileStorage
+
+            return LocalFileStorage(
+                path=settings.path,
+                logger=self._logger,
+                buffer_size=settings.buffer_size,
+                flush_interval=settings.flush_interval,
+            )
+        if isinstance(settings, JsonlSegmentStorageSettings):
+            from .jsonl_segment import JsonlSegmentStorage
+
+            return JsonlSegmentStorage(
+                path=settings.path,
+                logger=self._logger,
+                max_segment_size=settings.max_segment_size,
+                compression=settings.compression,
+            )
+        if isinstance(settings, SqliteStorageSettings):
+            from .sqlite import SqliteStorage
+
+            return SqliteStorage(path=settings.path, logger=self._logger, batch_size=settings.batch_size)
         raise ValueError(f"Unsupported storage type: {settings.type}")
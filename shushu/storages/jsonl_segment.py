@@ -0,0 +1,231 @@
+import gzip
+import re
+import shutil
+from logging import Logger
+from pathlib import Path
+from threading import Lock
+from typing import IO, NamedTuple, Optional
+
+from ..actions import SaveDataAction, StorageAction
+from ..line_journal import LineJournal
+from ..models import BaseDataModel
+from ..settings import NewOrExistingPath, SegmentCompression
+from .base import BaseStorage
+from .exceptions import CompressionNotAvailableError, DataNotFoundError
+
+SEGMENT_NAME_PATTERN = re.compile(r"segment-(\d+)\.jsonl(\.gz|\.zst)?")
+INDEX_FILE_NAME = "index.tsv"
+COMPRESSED_SUFFIXES = {SegmentCompression.GZIP: ".gz", SegmentCompression.ZSTD: ".zst"}
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def _segment_name(segment: int) -> str:
+    """
+    >>> _segment_name(12)
+    'segment-000012.jsonl'
+    """
+    return f"segment-{segment:06d}.jsonl"
+
+
+def _open_compressed_writer(path: Path, compression: SegmentCompression) -> IO[bytes]:
+    if compression == SegmentCompression.GZIP:
+        return gzip.open(path, "wb")
+    try:
+        import zstandard
+    except ImportError:
+        raise CompressionNotAvailableError(compression=compression.value, package="zstandard")
+    writer: IO[bytes] = zstandard.ZstdCompressor().stream_writer(open(path, "wb"), closefd=True)
+    return writer
+
+
+def _open_reader(path: Path) -> IO[bytes]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    if path.suffix == ".zst":
+        try:
+            import zstandard
+        except ImportError:
+            raise CompressionNotAvailableError(compression=SegmentCompression.ZSTD.value, package="zstandard")
+        reader: IO[bytes] = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return reader
+    return open(path, "rb")
+
+
+def _read_range(stream: IO[bytes], offset: int, length: int) -> bytes:
+    # compressed streams can only move forward, so skip by reading instead of seeking
+    remaining = offset
+    while remaining > 0:
+        skipped = stream.read(min(remaining, COPY_CHUNK_SIZE))
+        if not skipped:
+            break
+        remaining -= len(skipped)
+    return stream.read(length)
+
+
+class IndexEntry(NamedTuple):
+    segment: int
+    offset: int
+    length: int
+
+
+class _TypeSegments:
+    """Segments, index and open writers of a single type_id."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.directory.mkdir(exist_ok=True)
+        self.index: dict[str, IndexEntry] = {}
+        self.writer: Optional[IO[bytes]] = None
+        self.index_journal = LineJournal(directory / INDEX_FILE_NAME)
+        for line in self.index_journal.read_lines():
+            data_id, segment, offset, length = line.split("\t")
+            self.index[data_id] = IndexEntry(int(segment), int(offset), int(length))
+        uncompressed: list[int] = []
+        existing: list[int] = [-1]
+        for path in directory.iterdir():
+            match = SEGMENT_NAME_PATTERN.fullmatch(path.name)
+            if match is None:
+                continue
+            existing.append(int(match.group(1)))
+            if match.group(2) is None:
+                uncompressed.append(int(match.group(1)))
+        self.segment = max(uncompressed) if uncompressed and max(uncompressed) == max(existing) else max(existing) + 1
+        segment_path = self.segment_path(self.segment)
+        self.size = segment_path.stat().st_size if segment_path.exists() else 0
+
+    def segment_path(self, segment: int) -> Path:
+        return self.directory / _segment_name(segment)
+
+    def find_segment_path(self, segment: int) -> Path:
+        path = self.segment_path(segment)
+        for suffix in ("", *COMPRESSED_SUFFIXES.values()):
+            candidate = path.with_name(path.name + suffix)
+            if candidate.exists():
+                return candidate
+        raise FileNotFoundError(path)
+
+    def get_writer(self) -> IO[bytes]:
+        if self.writer is None:
+            self.writer = open(self.segment_path(self.segment), "ab")
+        return self.writer
+
+    def flush(self) -> None:
+        # data first so that the index never points past the end of a segment
+        if self.writer is not None:
+            self.writer.flush()
+        self.index_journal.flush()
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self.index_journal.flush()
+        self.index_journal.close()
+
+
+class JsonlSegmentStorage(BaseStorage):
+    """Appends data as JSON Lines to rotating segment files per type.
+
+    Records of a type go to `<path>/<type_id>/segment-NNNNNN.jsonl`. A segment is closed once it would grow beyond
+    `max_segment_size` bytes and is then compressed when `compression` is set. `<path>/<type_id>/index.tsv` maps every
+    id to its segment, offset and length so that `get_json` reads a single record without scanning. Records in a
+    compressed segment are found by decompressing the segment up to the record.
+    """
+
+    def __init__(
+        self,
+        path: NewOrExistingPath,
+        logger: Logger,
+        max_segment_size: int = 64 * 1024 * 1024,
+        compression: SegmentCompression = SegmentCompression.NONE,
+    ) -> None:
+        super(JsonlSegmentStorage, self).__init__(logger=logger)
+        self._types: dict[str, _TypeSegments] = {}
+        self._lock = Lock()
+        self._path = path
+        if not self._path.exists():
+            self._path.mkdir(parents=True)
+        self._max_segment_size = max_segment_size
+        self._compression = compression
+
+    def __del__(self) -> None:
+        self.close()
+
+    @property
+    def max_segment_size(self) -> int:
+        return self._max_segment_size
+
+    @property
+    def compression(self) -> SegmentCompression:
+        return self._compression
+
+    def _get_type_segments(self, type_id: str) -> _TypeSegments:
+        type_segments = self._types.get(type_id)
+        if type_segments is None:
+            type_segments = _TypeSegments(self._path / type_id)
+            self._types[type_id] = type_segments
+        return type_segments
+
+    def perform(self, action: StorageAction, payload: BaseDataModel | None = None) -> None:
+        if isinstance(action, SaveDataAction):
+            return self._save_data(payload)
+        raise NotImplementedError()
+
+    def _save_data(self, data: BaseDataModel | None) -> None:
+        if data is None:
+            raise ValueError("No data to save")
+        line = data.model_dump_json().encode("utf-8") + b"\n"
+        with self._lock:
+            type_segments = self._get_type_segments(str(data.type_id))
+            if type_segments.size > 0 and type_segments.size + len(line) > self.max_segment_size:
+                self._rotate(type_segments)
+            offset = type_segments.size
+            type_segments.get_writer().write(line)
+            type_segments.size += len(line)
+            entry = IndexEntry(segment=type_segments.segment, offset=offset, length=len(line) - 1)
+            type_segments.index[str(data.id)] = entry
+            type_segments.index_journal.append(f"{data.id}\t{entry.segment}\t{entry.offset}\t{entry.length}")
+
+    def _rotate(self, type_segments: _TypeSegments) -> None:
+        type_segments.flush()
+        if type_segments.writer is not None:
+            type_segments.writer.close()
+            type_segments.writer = None
+        closed_path = type_segments.segment_path(type_segments.segment)
+        if self.compression != SegmentCompression.NONE and closed_path.exists():
+            compressed_path = closed_path.with_name(closed_path.name + COMPRESSED_SUFFIXES[self.compression])
+            with open(closed_path, "rb") as src, _open_compressed_writer(compressed_path, self.compression) as dst:
+                shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+            closed_path.unlink()
+        self.log_debug(
+            "Rotated segment.",
+            extra={"directory": str(type_segments.directory), "segment": type_segments.segment},
+        )
+        type_segments.segment += 1
+        type_segments.size = 0
+
+    def get_json(self, type_id: str, data_id: str) -> str:
+        """Returns the JSON of a saved data."""
+        with self._lock:
+            type_segments = self._get_type_segments(str(type_id))
+            entry = type_segments.index.get(str(data_id))
+            if entry is None:
+                raise DataNotFoundError(type_id=str(type_id), data_id=str(data_id))
+            if entry.segment == type_segments.segment:
+                type_segments.flush()
+            path = type_segments.find_segment_path(entry.segment)
+        with _open_reader(path) as f:
+            if path.suffix == ".jsonl":
+                f.seek(entry.offset)
+                return f.read(entry.length).decode("utf-8")
+            return _read_range(f, entry.offset, entry.length).decode("utf-8")
+
+    def flush(self) -> None:
+        with self._lock:
+            for type_segments in self._types.values():
+                type_segments.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            for type_segments in self._types.values():
+                type_segments.close()
@@ -1,4 +1,6 @@
 from logging import Logger
+from threading import Lock
+from time import monotonic
 
 from shushu.actions import SaveDataAction, StorageAction
 from shushu.models import BaseDataModel
@@ -8,11 +10,35 @@ from .base import BaseStorage
 
 
 class LocalFileStorage(BaseStorage):
-    def __init__(self, path: NewOrExistingPath, logger: Logger):
+    """Saves every data as `<path>/<type_id>/<id>.json`.
+
+    With a positive `buffer_size`, serialized data is queued and written in batches grouped by type, when the buffer
+    holds `buffer_size` records, when `flush_interval` seconds have passed since the last flush (checked as data is
+    queued) or when `flush` is called.
+    """
+
+    def __init__(
+        self, path: NewOrExistingPath, logger: Logger, buffer_size: int = 0, flush_interval: float = 1.0
+    ) -> None:
         super(LocalFileStorage, self).__init__(logger=logger)
         self._path = path
         if not self._path.exists():
             self._path.mkdir(parents=True)
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+        self._known_directories: set[str] = set()
+        self._buffer: dict[str, list[tuple[str, str]]] = {}
+        self._buffered_count = 0
+        self._last_flushed_at = monotonic()
+        self._lock = Lock()
+
+    @property
+    def buffer_size(self) -> int:
+        return self._buffer_size
+
+    @property
+    def flush_interval(self) -> float:
+        return self._flush_interval
 
     def perform(self, action: StorageAction, payload: BaseDataModel | None = None) -> None:
         if isinstance(action, SaveDataAction):
@@ -22,9 +48,41 @@ class LocalFileStorage(BaseStorage):
     def _save_data(self, data: BaseDataModel | None) -> None:
         if data is None:
             raise ValueError("No data to save")
-        type_id = data.type_id
-        dir_to_save = self._path / str(type_id)
-        if not dir_to_save.exists():
-            dir_to_save.mkdir()
-        with open(dir_to_save / f"{data.id}.json", "w", encoding="utf-8") as f:
-            f.write(data.model_dump_json())
+        type_id = str(data.type_id)
+        if self.buffer_size == 0:
+            self._write_batch(type_id, [(str(data.id), data.model_dump_json())])
+            return
+        with self._lock:
+            self._buffer.setdefault(type_id, []).append((str(data.id), data.model_dump_json()))
+            self._buffered_count += 1
+            if self._buffered_count < self.buffer_size and monotonic() - self._last_flushed_at < self.flush_interval:
+                return
+            batches = self._take_buffer()
+        self._write_batches(batches)
+
+    def _take_buffer(self) -> dict[str, list[tuple[str, str]]]:
+        batches = self._buffer
+        self._buffer = {}
+        self._buffered_count = 0
+        self._last_flushed_at = monotonic()
+        return batches
+
+    def _write_batch(self, type_id: str, records: list[tuple[str, str]]) -> None:
+        dir_to_save = self._path / type_id
+        if type_id not in self._known_directories:
+            dir_to_save.mkdir(exist_ok=True)
+            self._known_directories.add(type_id)
+        for data_id, serialized in records:
+            with open(dir_to_save / f"{data_id}.json", "w", encoding="utf-8") as f:
+                f.write(serialized)
+
+    def _write_batches(self, batches: dict[str, list[tuple[str, str]]]) -> None:
+        for type_id, records in batches.items():
+            self._write_batch(type_id, records)
+        if batches:
+            self.log_debug("Flushed buffered data.", extra={"record_count": sum(len(r) for r in batches.values())})
+
+    def flush(self) -> None:
+        with self._lock:
+            batches = self._take_buffer()
+        self._write_batches(batches)
@@ -0,0 +1,106 @@
+import sqlite3
+from logging import Logger
+from threading import Lock
+from typing import Optional
+
+from ..actions import SaveDataAction, StorageAction
+from ..models import BaseDataModel
+from ..settings import NewOrExistingPath
+from .base import BaseStorage
+from .exceptions import DataNotFoundError
+
+CREATE_TABLE_STATEMENT = """
+CREATE TABLE IF NOT EXISTS data (
+    id TEXT PRIMARY KEY,
+    type_id TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    body TEXT NOT NULL
+)
+"""
+CREATE_INDEX_STATEMENT = "CREATE INDEX IF NOT EXISTS data_type_id ON data (type_id)"
+UPSERT_STATEMENT = """
+INSERT INTO data (id, type_id, created_at, updated_at, body) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET type_id = excluded.type_id, updated_at = excluded.updated_at, body = excluded.body
+"""
+SELECT_STATEMENT = "SELECT body FROM data WHERE type_id = ? AND id = ?"
+
+Row = tuple[str, str, int, int, str]
+
+
+class SqliteStorage(BaseStorage):
+    """Stores data in the `data` table of a SQLite database file.
+
+    Records are upserted by id in transactions of up to `batch_size` records. The database runs in WAL mode so that
+    readers can query it while a crawl is writing.
+    """
+
+    def __init__(self, path: NewOrExistingPath, logger: Logger, batch_size: int = 500) -> None:
+        super(SqliteStorage, self).__init__(logger=logger)
+        self._pending: list[Row] = []
+        self._lock = Lock()
+        self._path = path
+        self._batch_size = batch_size
+        self._connection: Optional[sqlite3.Connection] = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(CREATE_TABLE_STATEMENT)
+            self._connection.execute(CREATE_INDEX_STATEMENT)
+
+    def __del__(self) -> None:
+        self.close()
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            raise ValueError("Storage is closed")
+        return self._connection
+
+    def perform(self, action: StorageAction, payload: BaseDataModel | None = None) -> None:
+        if isinstance(action, SaveDataAction):
+            return self._save_data(payload)
+        raise NotImplementedError()
+
+    def _save_data(self, data: BaseDataModel | None) -> None:
+        if data is None:
+            raise ValueError("No data to save")
+        row = (str(data.id), str(data.type_id), int(data.created_at), int(data.updated_at), data.model_dump_json())
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._write_pending()
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+        with self.connection:
+            self.connection.executemany(UPSERT_STATEMENT, self._pending)
+        self.log_debug("Wrote data.", extra={"record_count": len(self._pending)})
+        self._pending = []
+
+    def get_json(self, type_id: str, data_id: str) -> str:
+        """Returns the JSON of a saved data."""
+        with self._lock:
+            self._write_pending()
+            row = self.connection.execute(SELECT_STATEMENT, (str(type_id), str(data_id))).fetchone()
+        if row is None:
+            raise DataNotFoundError(type_id=str(type_id), data_id=str(data_id))
+        body: str = row[0]
+        return body
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write_pending()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is None:
+                return
+            self._write_pending()
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,157 @@
+import json
+import os
+from logging import Logger
+from pathlib import Path
+from threading import Lock, get_ident
+from time import perf_counter_ns
+from types import TracebackType
+from typing import Any, NamedTuple, Optional
+
+from .base import BaseShushuComponent
+
+
+class SpanRecord(NamedTuple):
+    name: str
+    category: str
+    start_us: float
+    duration_us: float
+    thread_id: int
+    attributes: dict[str, Any]
+    error: Optional[str]
+
+
+class Span:
+    """Measures the block it is entered for. Attributes can be added with `set` until the block ends."""
+
+    __slots__ = ("_tracer", "_name", "_category", "_attributes", "_start_ns")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, attributes: dict[str, Any]) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._attributes = attributes
+        self._start_ns = 0
+
+    def set(self, key: str, value: Any) -> None:
+        self._attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self._start_ns = perf_counter_ns()
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None:
+        end_ns = perf_counter_ns()
+        error = None if __exc_type is None else f"{__exc_type.__name__}: {__exc_value}"
+        self._tracer._finish(
+            SpanRecord(
+                name=self._name,
+                category=self._category,
+                start_us=(self._start_ns - self._tracer.origin_ns) / 1000,
+                duration_us=(end_ns - self._start_ns) / 1000,
+                thread_id=get_ident(),
+                attributes=self._attributes,
+                error=error,
+            )
+        )
+
+
+class _NullSpan(Span):
+    __slots__ = ()
+
+    def __init__(self) -> None: ...
+
+    def set(self, key: str, value: Any) -> None: ...
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None: ...
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer(BaseShushuComponent):
+    """Records spans of the work done by the core and its components.
+
+    Finished spans are logged with their duration and attributes when `log_spans` is set, and are written to
+    `trace_path` as Chrome trace events (viewable in chrome://tracing or Perfetto) when the tracer is closed.
+    A disabled tracer hands out a shared span that does nothing.
+    """
+
+    def __init__(
+        self, logger: Logger, enabled: bool = True, trace_path: Optional[Path] = None, log_spans: bool = True
+    ) -> None:
+        super(Tracer, self).__init__(logger=logger)
+        self._enabled = enabled
+        self._trace_path = trace_path
+        self._log_spans = log_spans
+        self._records: list[SpanRecord] = []
+        self._lock = Lock()
+        self.origin_ns = perf_counter_ns()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def trace_path(self) -> Optional[Path]:
+        return self._trace_path
+
+    @property
+    def records(self) -> list[SpanRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def span(self, name: str, category: str, **attributes: Any) -> Span:
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(tracer=self, name=name, category=category, attributes=attributes)
+
+    def _finish(self, record: SpanRecord) -> None:
+        if self._log_spans:
+            extra = {"span_name": record.name, "category": record.category, "duration_ms": record.duration_us / 1000}
+            if record.error is not None:
+                extra["error"] = record.error
+            self.log_info("Finished span.", extra={**extra, **record.attributes})
+        if self.trace_path is not None:
+            with self._lock:
+                self._records.append(record)
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        pid = os.getpid()
+        events = []
+        for record in self.records:
+            args = dict(record.attributes)
+            if record.error is not None:
+                args["error"] = record.error
+            events.append(
+                {
+                    "name": record.name,
+                    "cat": record.category,
+                    "ph": "X",
+                    "ts": record.start_us,
+                    "dur": record.duration_us,
+                    "pid": pid,
+                    "tid": record.thread_id,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def close(self) -> None:
+        if self.trace_path is None:
+            return
+        with open(self.trace_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+        self.log_info("Wrote trace.", extra={"trace_path": str(self.trace_path), "span_count": len(self._records)})
@@ -60,6 +60,20 @@ class CoreActionType(str, Enum):
     STORAGE = "STORAGE"
     GENERATE_ID = "GENERATE_ID"
     SEQUENCIAL = "SEQUENCIAL"
+    PARALLEL = "PARALLEL"
+    OPEN_MEMORY_URL = "OPEN_MEMORY_URL"
+    PAGINATE = "PAGINATE"
+    STREAM = "STREAM"
+
+
+class HtmlParserType(str, Enum):
+    HTML_PARSER = "HTML_PARSER"
+    LXML = "LXML"
+
+
+class PaginationMode(str, Enum):
+    OPEN_URL = "OPEN_URL"
+    CLICK = "CLICK"
 
 
 class WebAgentActionType(str, Enum):
@@ -90,4 +104,7 @@ class DataProcessorType(str, Enum):
 
 ElementTypeId = TypeId("01HVRW8WGGA24A44DYMG86C5X4")
 ElementSequenceTypeId = TypeId("01HVRW90TDQTE16481BCEQ7A88")
+CompactElementSequenceTypeId = TypeId("01M57MWYD7X6H143BKXH26QNE0")
 IdTypeId = TypeId("01HVA7ZG5GKAK9QVBVV5029H3V")
+DataSequenceTypeId = TypeId("01M57K84NJMMF2YDEP5VXQGZH7")
+UrlDataTypeId = TypeId("01M57N51HTG66R5ZSKBPFNNBHN")
@@ -0,0 +1,125 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import AbstractAsyncContextManager
+from logging import Logger
+from types import TracebackType
+from typing import Any, TypeVar
+
+from ..actions import WebAgentAction
+from ..base import BaseShushuComponent
+from ..models import CompactElementSequence, Element, ElementSequence
+from .base import BaseWebAgent
+
+AsyncWebAgentT = TypeVar("AsyncWebAgentT", bound="BaseAsyncWebAgent")
+T = TypeVar("T")
+
+
+class BaseAsyncWebAgent(BaseShushuComponent, AbstractAsyncContextManager["BaseAsyncWebAgent"], ABC):
+    def __init__(self, logger: Logger):
+        super(BaseAsyncWebAgent, self).__init__(logger=logger)
+
+    @abstractmethod
+    async def _start(self) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def _end(self) -> None:
+        raise NotImplementedError()
+
+    async def __aenter__(self: AsyncWebAgentT) -> AsyncWebAgentT:
+        await self._start()
+        return self
+
+    async def __aexit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None:
+        await self._end()
+
+    @abstractmethod
+    async def perform(self, action: WebAgentAction) -> None:
+        raise NotImplementedError()
+
+    async def prefetch(self, url: str) -> None:
+        """Hints that `url` is about to be opened so that it can be loaded in the background."""
+
+    @abstractmethod
+    async def get_selected_element(self) -> Element:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_selected_elements(self) -> ElementSequence:
+        raise NotImplementedError()
+
+    async def get_selected_elements_compact(self) -> CompactElementSequence:
+        return CompactElementSequence.from_element_sequence(await self.get_selected_elements())
+
+    async def iter_selected_elements(self, chunk_size: int) -> AsyncIterator[ElementSequence]:
+        """Yields the selected elements in sequences of at most `chunk_size` elements."""
+        elements = (await self.get_selected_elements()).elements
+        for start in range(0, len(elements), chunk_size):
+            yield ElementSequence(elements=elements[start : start + chunk_size])
+
+    async def iter_selected_elements_compact(self, chunk_size: int) -> AsyncIterator[CompactElementSequence]:
+        async for chunk in self.iter_selected_elements(chunk_size):
+            yield CompactElementSequence.from_element_sequence(chunk)
+
+
+class ThreadedAsyncWebAgent(BaseAsyncWebAgent):
+    """Runs a synchronous web agent in worker threads so that it does not block the event loop.
+
+    Calls are serialized because a synchronous web agent holds a single page.
+    """
+
+    def __init__(self, web_agent: BaseWebAgent, logger: Logger):
+        super(ThreadedAsyncWebAgent, self).__init__(logger=logger)
+        self._web_agent = web_agent
+        self._lock = asyncio.Lock()
+
+    @property
+    def web_agent(self) -> BaseWebAgent:
+        return self._web_agent
+
+    async def _call(self, func: Callable[..., T], *args: Any) -> T:
+        async with self._lock:
+            return await asyncio.to_thread(func, *args)
+
+    async def _start(self) -> None:
+        await self._call(self.web_agent.__enter__)
+
+    async def _end(self) -> None:
+        await self._call(self.web_agent.__exit__, None, None, None)
+
+    async def perform(self, action: WebAgentAction) -> None:
+        await self._call(self.web_agent.perform, action)
+
+    async def prefetch(self, url: str) -> None:
+        await self._call(self.web_agent.prefetch, url)
+
+    async def get_selected_element(self) -> Element:
+        return await self._call(self.web_agent.get_selected_element)
+
+    async def get_selected_elements(self) -> ElementSequence:
+        return await self._call(self.web_agent.get_selected_elements)
+
+    async def get_selected_elements_compact(self) -> CompactElementSequence:
+        return await self._call(self.web_agent.get_selected_elements_compact)
+
+    async def _iterate(self, iterator: Iterator[T]) -> AsyncIterator[T]:
+        # every chunk is produced in a worker thread, so the chunks are serialized with the other calls
+        while True:
+            chunk = await self._call(next, iterator, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    async def iter_selected_elements(self, chunk_size: int) -> AsyncIterator[ElementSequence]:
+        async for chunk in self._iterate(self.web_agent.iter_selected_elements(chunk_size)):
+            yield chunk
+
+    async def iter_selected_elements_compact(self, chunk_size: int) -> AsyncIterator[CompactElementSequence]:
+        async for chunk in self._iterate(self.web_agent.iter_selected_elements_compact(chunk_size)):
+            yield chunk
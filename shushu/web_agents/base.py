@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from contextlib import AbstractContextManager
 from logging import Logger
 from types import TracebackType
@@ -6,7 +7,7 @@ from typing import TypeVar
 
 from ..actions import WebAgentAction
 from ..base import BaseShushuComponent
-from ..models import Element, ElementSequence
+from ..models import CompactElementSequence, Element, ElementSequence
 
 WebAgentT = TypeVar("WebAgentT", bound="BaseWebAgent")
 
@@ -39,6 +40,12 @@ class BaseWebAgent(BaseShushuComponent, AbstractContextManager["BaseWebAgent"],
     def perform(self, action: WebAgentAction) -> None:
         raise NotImplementedError()
 
+    def prefetch(self, url: str) -> None:
+        """Hints that `url` is about to be opened so that it can be loaded in the background.
+
+        Web agents that cannot load a page without leaving the current one ignore the hint.
+        """
+
     @abstractmethod
     def get_selected_element(self) -> Element:
         raise NotImplementedError()
@@ -46,3 +53,20 @@ class BaseWebAgent(BaseShushuComponent, AbstractContextManager["BaseWebAgent"],
     @abstractmethod
     def get_selected_elements(self) -> ElementSequence:
         raise NotImplementedError()
+
+    def get_selected_elements_compact(self) -> CompactElementSequence:
+        return CompactElementSequence.from_element_sequence(self.get_selected_elements())
+
+    def iter_selected_elements(self, chunk_size: int) -> Iterator[ElementSequence]:
+        """Yields the selected elements in sequences of at most `chunk_size` elements.
+
+        This default splits `get_selected_elements`. Web agents that can serialize the matches one by one override it
+        so that only the elements of the current chunk are held.
+        """
+        elements = self.get_selected_elements().elements
+        for start in range(0, len(elements), chunk_size):
+            yield ElementSequence(elements=elements[start : start + chunk_size])
+
+    def iter_selected_elements_compact(self, chunk_size: int) -> Iterator[CompactElementSequence]:
+        for chunk in self.iter_selected_elements(chunk_size):
+            yield CompactElementSequence.from_element_sequence(chunk)
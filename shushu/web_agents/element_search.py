@@ -0,0 +1,54 @@
+from collections.abc import Iterator
+from typing import Optional
+
+from lxml.html import HtmlElement
+
+from ..types import QueryString
+
+INVISIBLE_TAGS = frozenset({"head", "title", "script", "style", "noscript", "template"})
+
+
+def iter_visible_texts(element: HtmlElement) -> Iterator[str]:
+    if not isinstance(element.tag, str) or element.tag in INVISIBLE_TAGS:
+        return
+    if element.text:
+        yield element.text
+    for child in element:
+        yield from iter_visible_texts(child)
+        if child.tail:
+            yield child.tail
+
+
+def _contains_all(element: HtmlElement, target_strings: list[QueryString]) -> bool:
+    text = "".join(iter_visible_texts(element))
+    return all(target_string in text for target_string in target_strings)
+
+
+def find_minimum_enclosing_element_with_multiple_texts(
+    element: HtmlElement, target_strings: list[QueryString]
+) -> Optional[HtmlElement]:
+    """Finds the deepest element under `element` whose visible text contains all target strings.
+
+    Like the browser implementation, it descends into the first child that still contains all target strings.
+
+    >>> from lxml.html import document_fromstring
+    >>> document = document_fromstring(
+    ...     "<html><body><ul><li><a>foo</a><p>2024</p></li><li><a>bar</a><p>2024</p></li></ul></body></html>"
+    ... )
+    >>> find_minimum_enclosing_element_with_multiple_texts(document, ["bar", "2024"]).tag
+    'li'
+    >>> find_minimum_enclosing_element_with_multiple_texts(document, ["foo", "bar"]).tag
+    'ul'
+    >>> find_minimum_enclosing_element_with_multiple_texts(document, ["baz"]) is None
+    True
+    """
+    if not _contains_all(element, target_strings):
+        return None
+    current = element
+    while True:
+        for child in current:
+            if isinstance(child.tag, str) and _contains_all(child, target_strings):
+                current = child
+                break
+        else:
+            return current
@@ -8,3 +8,26 @@ class WebAgentError(BaseError):
 class SeleniumDriverNotReadyError(WebAgentError):
     def __init__(self) -> None:
         super(SeleniumDriverNotReadyError, self).__init__("Selenium driver is not ready")
+
+
+class HttpWebAgentNotReadyError(WebAgentError):
+    def __init__(self) -> None:
+        super(HttpWebAgentNotReadyError, self).__init__("HTTP web agent is not ready")
+
+
+class NoPageOpenedError(WebAgentError):
+    def __init__(self) -> None:
+        super(NoPageOpenedError, self).__init__("No page is opened")
+
+
+class HttpStatusError(WebAgentError):
+    def __init__(self, url: str, status: int) -> None:
+        super(HttpStatusError, self).__init__(f"Request to {url} failed with status {status}")
+        self.url = url
+        self.status = status
+
+
+class PageNotCachedError(WebAgentError):
+    def __init__(self, url: str) -> None:
+        super(PageNotCachedError, self).__init__(f"Page {url} is not in the page cache")
+        self.url = url
@@ -1,19 +1,114 @@
 from logging import Logger
+from typing import TYPE_CHECKING, Optional
 
 from ..base import BaseComponentFactory
-from ..settings import BaseWebAgentSettings, SeleniumWebAgentSettings
+from ..settings import (
+    BaseWebAgentSettings,
+    HttpWebAgentSettings,
+    PageCacheMode,
+    SeleniumWebAgentSettings,
+)
 from .base import BaseWebAgent
-from .selenium import SeleniumWebAgent
+from .page_cache import SELENIUM_CACHE_OPTIONS, PageCache
+
+if TYPE_CHECKING:
+    from .selenium_drivers.pool import SeleniumDriverPool
 
 
 class WebAgentFactory(BaseComponentFactory[BaseWebAgentSettings, BaseWebAgent]):
+    """Creates web agents, sharing page caches and selenium driver pools between agents with the same settings.
+
+    The factory owns the driver pools, so `close` must be called once the agents it created are closed.
+    """
+
     def __init__(self, logger: Logger) -> None:
         super(WebAgentFactory, self).__init__(logger=logger)
+        self._driver_pools: dict[str, "SeleniumDriverPool"] = {}
+        self._page_caches: dict[str, PageCache] = {}
+
+    def _get_page_cache(self, settings: BaseWebAgentSettings) -> Optional[PageCache]:
+        if settings.page_cache is None:
+            return None
+        key = settings.page_cache.model_dump_json()
+        if key not in self._page_caches:
+            self._page_caches[key] = PageCache(
+                path=settings.page_cache.path,
+                logger=self.logger,
+                mode=settings.page_cache.mode,
+                ttl=settings.page_cache.ttl,
+                max_size=settings.page_cache.max_size,
+                max_memory_size=settings.page_cache.max_memory_size,
+            )
+        return self._page_caches[key]
+
+    def _get_driver_pool(self, settings: SeleniumWebAgentSettings) -> "SeleniumDriverPool":
+        # agents created with the same settings share one pool so that parallel agents do not launch extra browsers
+        key = settings.model_dump_json()
+        if key not in self._driver_pools:
+            from .selenium_drivers.pool import SeleniumDriverPool
+
+            driver_pool = SeleniumDriverPool(
+                driver_settings=settings.driver_settings,
+                size=settings.driver_pool_size,
+                max_uses_per_driver=settings.driver_max_uses,
+                logger=self.logger,
+            )
+            if settings.driver_pool_prelaunch:
+                driver_pool.prelaunch()
+            self._driver_pools[key] = driver_pool
+        return self._driver_pools[key]
+
+    def get_capacity(self, settings: BaseWebAgentSettings) -> Optional[int]:
+        """Returns how many agents created with `settings` can be open at once, or None when there is no limit.
+
+        Pooled selenium agents block on opening while all drivers of their pool are leased.
+        """
+        if not isinstance(settings, SeleniumWebAgentSettings) or settings.driver_pool_size == 0:
+            return None
+        if settings.page_cache is not None and settings.page_cache.mode == PageCacheMode.REPLAY:
+            return None
+        return settings.driver_pool_size
+
+    def close(self) -> None:
+        """Quits the drivers of the pools. Drivers still leased are quit when their web agents are garbage collected."""
+        for driver_pool in self._driver_pools.values():
+            driver_pool.close()
+        self._driver_pools.clear()
 
     def create(self, settings: BaseWebAgentSettings) -> BaseWebAgent:
+        # web agents are imported by the branch that needs them so that selenium is only loaded when it is used
+        page_cache = self._get_page_cache(settings)
         if isinstance(settings, SeleniumWebAgentSettings):
+            if page_cache is not None and page_cache.mode == PageCacheMode.REPLAY:
+                from .http import HttpWebAgent
+
+                # pages rendered by a browser are replayed without launching one
+                default_settings = HttpWebAgentSettings()
+                return HttpWebAgent(
+                    timeout=default_settings.timeout,
+                    max_connections_per_host=default_settings.max_connections_per_host,
+                    user_agent=default_settings.user_agent,
+                    logger=self.logger,
+                    page_cache=page_cache,
+                    cache_options=SELENIUM_CACHE_OPTIONS,
+                )
+            from .selenium import SeleniumWebAgent
+
+            driver_pool = self._get_driver_pool(settings) if settings.driver_pool_size > 0 else None
             return SeleniumWebAgent(
                 driver_settings=settings.driver_settings,
                 logger=self.logger,
+                driver_pool=driver_pool,
+                page_cache=page_cache,
+            )
+        if isinstance(settings, HttpWebAgentSettings):
+            from .http import HttpWebAgent
+
+            return HttpWebAgent(
+                timeout=settings.timeout,
+                max_connections_per_host=settings.max_connections_per_host,
+                user_agent=settings.user_agent,
+                logger=self.logger,
+                page_cache=page_cache,
             )
         raise ValueError(f"Unsupported web agent settings: {settings}")
@@ -0,0 +1,225 @@
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging import Logger
+from typing import Mapping, Optional
+from urllib.parse import urljoin
+
+from lxml.html import HtmlElement, HTMLParser, document_fromstring, tostring
+from urllib3 import PoolManager, Timeout
+
+from ..actions import (
+    ClickSelectedElementAction,
+    MinimumEnclosingElementWithMultipleTextsSelector,
+    OpenUrlAction,
+    Selector,
+    SetSelectorAction,
+    WebAgentAction,
+    XPathSelector,
+)
+from ..models import CompactElementSequence, Element, ElementSequence, Url
+from .base import BaseWebAgent
+from .element_search import find_minimum_enclosing_element_with_multiple_texts
+from .exceptions import HttpStatusError, HttpWebAgentNotReadyError, NoPageOpenedError
+from .page_cache import CachedPage, PageCache
+from .selenium_drivers.exceptions import NoElementFoundError, NoElementSelectedError
+
+
+def _get_charset(content_type: Optional[str]) -> Optional[str]:
+    """Returns the charset parameter of a Content-Type header value.
+
+    >>> _get_charset('text/html; charset="Shift_JIS"')
+    'Shift_JIS'
+    >>> _get_charset("text/html") is None
+    True
+    """
+    if content_type is None:
+        return None
+    for parameter in content_type.split(";")[1:]:
+        key, _, value = parameter.strip().partition("=")
+        if key.lower() == "charset" and value.strip("\"' "):
+            return value.strip("\"' ")
+    return None
+
+
+class HttpWebAgent(BaseWebAgent):
+    """A web agent that fetches pages over plain HTTP and evaluates selectors on the parsed HTML.
+
+    It does not run JavaScript, so it is only suitable for server-rendered pages. Pages passed to `prefetch` are
+    fetched in a background thread and handed over when they are opened.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        max_connections_per_host: int,
+        user_agent: str,
+        logger: Logger,
+        page_cache: Optional[PageCache] = None,
+        cache_options: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        super(HttpWebAgent, self).__init__(logger=logger)
+        self._page_cache = page_cache
+        self._cache_options = {"user_agent": user_agent} if cache_options is None else cache_options
+        self._timeout = timeout
+        self._max_connections_per_host = max_connections_per_host
+        self._user_agent = user_agent
+        self._pool_manager: Optional[PoolManager] = None
+        self._document: Optional[HtmlElement] = None
+        self._current_url: Optional[str] = None
+        self._selector: Optional[Selector] = None
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+        self._prefetched_pages: dict[str, Future[CachedPage]] = {}
+
+    @property
+    def page_cache(self) -> Optional[PageCache]:
+        return self._page_cache
+
+    @property
+    def cache_options(self) -> Mapping[str, str]:
+        return self._cache_options
+
+    @property
+    def pool_manager(self) -> PoolManager:
+        if self._pool_manager is None:
+            raise HttpWebAgentNotReadyError()
+        return self._pool_manager
+
+    @property
+    def document(self) -> HtmlElement:
+        if self._document is None:
+            raise NoPageOpenedError()
+        return self._document
+
+    @property
+    def current_url(self) -> str:
+        if self._current_url is None:
+            raise NoPageOpenedError()
+        return self._current_url
+
+    @property
+    def selector(self) -> Selector:
+        if self._selector is None:
+            raise NoElementSelectedError()
+        return self._selector
+
+    def _start(self) -> None:
+        self._pool_manager = PoolManager(
+            maxsize=self._max_connections_per_host,
+            timeout=Timeout(total=self._timeout),
+            headers={"User-Agent": self._user_agent},
+        )
+
+    def _end(self) -> None:
+        for future in self._prefetched_pages.values():
+            future.cancel()
+        self._prefetched_pages.clear()
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=True)
+        self._prefetch_executor = None
+        if self._pool_manager is not None:
+            self._pool_manager.clear()
+        self._pool_manager = None
+        self._document = None
+        self._current_url = None
+        self._selector = None
+
+    def _fetch(self, url: str) -> CachedPage:
+        response = self.pool_manager.request("GET", url)
+        if response.status >= 400:
+            raise HttpStatusError(url=url, status=response.status)
+        current_url = url if response.url is None else urljoin(url, response.url)
+        return CachedPage(url=current_url, content=response.data, content_type=response.headers.get("Content-Type"))
+
+    def _load_page(self, url: str) -> CachedPage:
+        page = None if self.page_cache is None else self.page_cache.get(url, self.cache_options)
+        if page is None:
+            page = self._fetch(url)
+            if self.page_cache is not None:
+                self.page_cache.put(url, page, self.cache_options)
+        return page
+
+    def prefetch(self, url: str) -> None:
+        if url in self._prefetched_pages:
+            return
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shushu-prefetch")
+        self._prefetched_pages[url] = self._prefetch_executor.submit(self._load_page, url)
+        self.log_debug("Prefetching page.", extra={"url": url})
+
+    def _open_url(self, url: str) -> None:
+        future = self._prefetched_pages.pop(url, None)
+        page = self._load_page(url) if future is None else future.result()
+        charset = _get_charset(page.content_type)
+        parser = HTMLParser(encoding=charset) if charset is not None else None
+        self._document = document_fromstring(page.content, parser=parser, base_url=page.url)
+        self._current_url = page.url
+
+    def perform(self, action: WebAgentAction) -> None:
+        if isinstance(action, OpenUrlAction):
+            self._open_url(str(action.url.value))
+            return
+        if isinstance(action, SetSelectorAction):
+            self._selector = action.selector
+            return
+        if isinstance(action, ClickSelectedElementAction):
+            href = self._get_raw_selected_element().get("href")
+            if href is None:
+                # only links can be followed without a browser
+                raise NotImplementedError()
+            self._open_url(urljoin(self.current_url, href))
+            return
+        raise NotImplementedError()
+
+    def _get_raw_selected_elements(self) -> list[HtmlElement]:
+        selector = self.selector
+        if isinstance(selector, XPathSelector):
+            return [e for e in self.document.xpath(selector.xpath) if isinstance(e, HtmlElement)]
+        if isinstance(selector, MinimumEnclosingElementWithMultipleTextsSelector):
+            element = find_minimum_enclosing_element_with_multiple_texts(self.document, selector.target_strings)
+            return [] if element is None else [element]
+        raise NotImplementedError()
+
+    def _get_raw_selected_element(self) -> HtmlElement:
+        elements = self._get_raw_selected_elements()
+        if len(elements) == 0:
+            raise NoElementFoundError()
+        return elements[0]
+
+    @classmethod
+    def _to_html_source(cls, element: HtmlElement) -> str:
+        html_source: str = tostring(element, encoding="unicode", with_tail=False)
+        return html_source
+
+    def get_selected_element(self) -> Element:
+        return Element(
+            url=Url(value=self.current_url), html_source=self._to_html_source(self._get_raw_selected_element())
+        )
+
+    def get_selected_elements(self) -> ElementSequence:
+        elements = self._get_raw_selected_elements()
+        url = Url(value=self.current_url)
+        return ElementSequence(elements=[Element(url=url, html_source=self._to_html_source(e)) for e in elements])
+
+    def get_selected_elements_compact(self) -> CompactElementSequence:
+        # the sources go straight into the buffer without building an Element per match
+        return CompactElementSequence.from_html_sources(
+            url=Url(value=self.current_url),
+            html_sources=(self._to_html_source(e) for e in self._get_raw_selected_elements()),
+        )
+
+    def _iter_raw_selected_element_chunks(self, chunk_size: int) -> Iterator[tuple[Url, list[HtmlElement]]]:
+        # the matches are references into the parsed document, so only the chunk being yielded is serialized
+        url = Url(value=self.current_url)
+        elements = self._get_raw_selected_elements()
+        for start in range(0, len(elements), chunk_size):
+            yield url, elements[start : start + chunk_size]
+
+    def iter_selected_elements(self, chunk_size: int) -> Iterator[ElementSequence]:
+        for url, elements in self._iter_raw_selected_element_chunks(chunk_size):
+            yield ElementSequence(elements=[Element(url=url, html_source=self._to_html_source(e)) for e in elements])
+
+    def iter_selected_elements_compact(self, chunk_size: int) -> Iterator[CompactElementSequence]:
+        for url, elements in self._iter_raw_selected_element_chunks(chunk_size):
+            yield CompactElementSequence.from_html_sources(
+                url=url, html_sources=(self._to_html_source(e) for e in elements)
+            )
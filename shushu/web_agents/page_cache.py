@@ -0,0 +1,170 @@
+import json
+import os
+from collections import OrderedDict
+from hashlib import sha256
+from logging import Logger
+from threading import Lock
+from time import time
+from typing import Mapping, NamedTuple, Optional
+
+from ..base import BaseShushuComponent
+from ..settings import NewOrExistingDirectoryPath, PageCacheMode
+from .exceptions import PageNotCachedError
+
+PAGE_FILE_SUFFIX = ".page"
+SELENIUM_CACHE_OPTIONS = {"renderer": "selenium"}
+
+
+class CachedPage(NamedTuple):
+    url: str
+    content: bytes
+    content_type: Optional[str]
+
+
+def _cache_key(url: str, options: Mapping[str, str]) -> str:
+    """Returns the file name stem of a page.
+
+    >>> _cache_key("http://localhost/", {"user_agent": "a"}) == _cache_key("http://localhost/", {"user_agent": "a"})
+    True
+    >>> _cache_key("http://localhost/", {"user_agent": "a"}) == _cache_key("http://localhost/", {"user_agent": "b"})
+    False
+    """
+    return sha256(json.dumps([url, sorted(options.items())]).encode("utf-8")).hexdigest()
+
+
+class PageCache(BaseShushuComponent):
+    """Keeps fetched pages as `<path>/<key>.page` files keyed by URL and the request options of the agent.
+
+    In `READ_WRITE` mode pages younger than `ttl` seconds are served from the cache and missing pages are stored after
+    they are fetched. `RECORD` mode fetches every page and stores it. `REPLAY` mode serves every page from the cache
+    regardless of its age and raises `PageNotCachedError` for missing pages, so that a crawl runs without network
+    access.
+    Once the files grow beyond `max_size` bytes, the least recently used pages are removed. Up to `max_memory_size`
+    bytes of recently used pages are also kept in memory.
+    Only `HttpWebAgent` is served from the cache. `SeleniumWebAgent` records the pages it renders, which are replayed
+    by an `HttpWebAgent` in `REPLAY` mode.
+    """
+
+    def __init__(
+        self,
+        path: NewOrExistingDirectoryPath,
+        logger: Logger,
+        mode: PageCacheMode = PageCacheMode.READ_WRITE,
+        ttl: Optional[float] = None,
+        max_size: int = 1024 * 1024 * 1024,
+        max_memory_size: int = 64 * 1024 * 1024,
+    ) -> None:
+        super(PageCache, self).__init__(logger=logger)
+        self._path = path
+        if not self._path.exists():
+            self._path.mkdir(parents=True)
+        self._mode = mode
+        self._ttl = ttl
+        self._max_size = max_size
+        self._max_memory_size = max_memory_size
+        self._memory: OrderedDict[str, tuple[float, CachedPage]] = OrderedDict()
+        self._memory_size = 0
+        self._lock = Lock()
+        self._size = sum(p.stat().st_size for p in self._path.glob(f"*{PAGE_FILE_SUFFIX}"))
+
+    @property
+    def mode(self) -> PageCacheMode:
+        return self._mode
+
+    @property
+    def ttl(self) -> Optional[float]:
+        return self._ttl
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def max_memory_size(self) -> int:
+        return self._max_memory_size
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return self.mode == PageCacheMode.REPLAY or self.ttl is None or time() - stored_at < self.ttl
+
+    def get(self, url: str, options: Mapping[str, str]) -> Optional[CachedPage]:
+        """Returns the cached page of `url`, or None when the page has to be fetched."""
+        if self.mode == PageCacheMode.RECORD:
+            return None
+        key = _cache_key(url, options)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._touch(key)
+            else:
+                entry = self._read(key)
+                if entry is not None:
+                    self._remember(key, *entry)
+            if entry is not None and self._is_fresh(entry[0]):
+                self.log_debug("Page cache hit.", extra={"url": url})
+                return entry[1]
+        if self.mode == PageCacheMode.REPLAY:
+            raise PageNotCachedError(url=url)
+        return None
+
+    def put(self, url: str, page: CachedPage, options: Mapping[str, str]) -> None:
+        if self.mode == PageCacheMode.REPLAY:
+            return
+        key = _cache_key(url, options)
+        stored_at = time()
+        header = json.dumps({"url": page.url, "content_type": page.content_type, "stored_at": stored_at})
+        path = self._path / f"{key}{PAGE_FILE_SUFFIX}"
+        temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with self._lock:
+            previous_size = path.stat().st_size if path.exists() else 0
+            with open(temporary_path, "wb") as f:
+                f.write(header.encode("utf-8") + b"\n")
+                f.write(page.content)
+            os.replace(temporary_path, path)
+            self._size += path.stat().st_size - previous_size
+            self._remember(key, stored_at, page)
+            if self._size > self.max_size:
+                self._evict()
+
+    def _read(self, key: str) -> Optional[tuple[float, CachedPage]]:
+        path = self._path / f"{key}{PAGE_FILE_SUFFIX}"
+        try:
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        self._touch(key)
+        return header["stored_at"], CachedPage(url=header["url"], content=content, content_type=header["content_type"])
+
+    def _touch(self, key: str) -> None:
+        # the modification time orders pages by their last use for the eviction
+        try:
+            os.utime(self._path / f"{key}{PAGE_FILE_SUFFIX}")
+        except FileNotFoundError:
+            pass
+
+    def _remember(self, key: str, stored_at: float, page: CachedPage) -> None:
+        if key in self._memory:
+            self._memory_size -= len(self._memory.pop(key)[1].content)
+        if len(page.content) > self.max_memory_size:
+            return
+        self._memory[key] = (stored_at, page)
+        self._memory_size += len(page.content)
+        while self._memory_size > self.max_memory_size:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted.content)
+
+    def _evict(self) -> None:
+        paths = sorted(self._path.glob(f"*{PAGE_FILE_SUFFIX}"), key=lambda p: p.stat().st_mtime)
+        evicted_count = 0
+        for path in paths:
+            if self._size <= self.max_size:
+                break
+            self._size -= path.stat().st_size
+            path.unlink()
+            evicted = self._memory.pop(path.name[: -len(PAGE_FILE_SUFFIX)], None)
+            if evicted is not None:
+                self._memory_size -= len(evicted[1].content)
+            evicted_count += 1
+        self.log_debug("Evicted cached pages.", extra={"evicted_count": evicted_count, "cache_size": self._size})
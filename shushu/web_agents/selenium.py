@@ -1,20 +1,46 @@
+from collections.abc import Iterator
 from logging import Logger
+from typing import Optional
 
-from ..actions import WebAgentAction
+from ..actions import ClickSelectedElementAction, OpenUrlAction, WebAgentAction
 from ..models import Element, ElementSequence
-from ..settings import SeleniumDriverSettings
+from ..settings import PageCacheMode, SeleniumDriverSettings
 from .base import BaseWebAgent
 from .exceptions import SeleniumDriverNotReadyError
+from .page_cache import SELENIUM_CACHE_OPTIONS, CachedPage, PageCache
 from .selenium_drivers.base import BaseSeleniumDriver
 from .selenium_drivers.factory import SeleniumDriverFactory
+from .selenium_drivers.pool import SeleniumDriverPool
 
 
 class SeleniumWebAgent(BaseWebAgent):
-    def __init__(self, driver_settings: SeleniumDriverSettings, logger: Logger) -> None:
+    """A web agent that drives a browser through a selenium driver.
+
+    Pages are always loaded by the browser. With a `page_cache` the rendered pages are recorded, never read, so that
+    they can be replayed by an `HttpWebAgent`.
+    """
+
+    def __init__(
+        self,
+        driver_settings: SeleniumDriverSettings,
+        logger: Logger,
+        driver_pool: Optional[SeleniumDriverPool] = None,
+        page_cache: Optional[PageCache] = None,
+    ) -> None:
         super(SeleniumWebAgent, self).__init__(logger=logger)
         self._driver_settings = driver_settings
+        self._driver_pool = driver_pool
+        self._page_cache = page_cache
         self._driver: BaseSeleniumDriver | None = None
 
+    @property
+    def driver_pool(self) -> Optional[SeleniumDriverPool]:
+        return self._driver_pool
+
+    @property
+    def page_cache(self) -> Optional[PageCache]:
+        return self._page_cache
+
     @property
     def driver(self) -> BaseSeleniumDriver:
         if self._driver is None:
@@ -22,17 +48,37 @@ class SeleniumWebAgent(BaseWebAgent):
         return self._driver
 
     def _start(self) -> None:
+        if self.driver_pool is not None:
+            self._driver = self.driver_pool.acquire()
+            return
         self._driver = SeleniumDriverFactory(logger=self._logger).create(settings=self._driver_settings)
 
     def _end(self) -> None:
+        if self.driver_pool is not None and self._driver is not None:
+            self.driver_pool.release(self._driver)
         del self._driver
         self._driver = None
 
     def perform(self, action: WebAgentAction) -> None:
-        return self.driver.perform(action=action)
+        self.driver.perform(action=action)
+        if self.page_cache is not None and isinstance(action, (OpenUrlAction, ClickSelectedElementAction)):
+            self._record_page(str(action.url.value) if isinstance(action, OpenUrlAction) else self.driver.current_url)
+
+    def _record_page(self, url: str) -> None:
+        if self.page_cache is None or self.page_cache.mode == PageCacheMode.REPLAY:
+            return
+        page = CachedPage(
+            url=self.driver.current_url,
+            content=self.driver.page_source.encode("utf-8"),
+            content_type="text/html; charset=utf-8",
+        )
+        self.page_cache.put(url, page, SELENIUM_CACHE_OPTIONS)
 
     def get_selected_element(self) -> Element:
         return self.driver.get_selected_element()
 
     def get_selected_elements(self) -> ElementSequence:
         return self.driver.get_selected_elements()
+
+    def iter_selected_elements(self, chunk_size: int) -> Iterator[ElementSequence]:
+        return self.driver.iter_selected_elements(chunk_size)
@@ -1,7 +1,9 @@
 from abc import abstractmethod
+from collections.abc import Callable, Iterator
 from logging import Logger
+from typing import Any, ClassVar, Optional
 
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
@@ -10,32 +12,139 @@ from ...actions import (
     ClickSelectedElementAction,
     MinimumEnclosingElementWithMultipleTextsSelector,
     OpenUrlAction,
-    RectangleSelector,
     Selector,
     SetSelectorAction,
     WebAgentAction,
     XPathSelector,
 )
 from ...base import BaseShushuComponent
-from ...models import Element, ElementSequence, Url
-from ...types import QueryString
+from ...models import Element, ElementSequence, Rectangle, Url
+from ...types import QueryString, XPath
 from .exceptions import NoElementFoundError, NoElementSelectedError
 
+# Evaluates an XPath and collects outerHTML (and optionally page coordinates) of the matched elements at once. From
+# the snapshot index in arguments[2], at most arguments[3] elements are collected (all of them when it is null), and
+# the index to continue from is returned with them (null when the snapshot is exhausted).
+SELECT_ELEMENTS_SCRIPT = """
+const snapshot = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const withLocations = arguments[1];
+const count = arguments[3];
+const items = [];
+let i = arguments[2];
+for (; i < snapshot.snapshotLength && (count === null || items.length < count); i++) {
+    const node = snapshot.snapshotItem(i);
+    if (node.nodeType !== Node.ELEMENT_NODE) {
+        continue;
+    }
+    let location = null;
+    if (withLocations) {
+        const rect = node.getBoundingClientRect();
+        location = [
+            Math.round(rect.left + window.scrollX),
+            Math.round(rect.top + window.scrollY),
+            Math.round(rect.width),
+            Math.round(rect.height),
+        ];
+    }
+    items.push([node.outerHTML, location]);
+}
+return [items, i < snapshot.snapshotLength ? i : null];
+"""
+
+# Finds the deepest element whose rendered text contains all target strings, descending into the first matching child
+# like `_find_minimum_enclosing_element_with_multiple_texts` does. textContent is a cheap superset of the rendered text
+# and prunes non-matching subtrees before innerText forces layout; it is compared case-insensitively because
+# text-transform changes innerText, and skipped for targets with whitespace because innerText rewrites whitespace.
+# Elements without boxes have no text, as for WebElement.text, although their innerText falls back to textContent, and
+# elements that are not HTML elements, such as SVG, have no innerText and are matched on their textContent.
+MINIMUM_ENCLOSING_ELEMENT_SCRIPT = """
+const targets = arguments[0];
+const loweredTargets = targets.map((target) => target.toLowerCase());
+const prunable = targets.every((target) => !/\\s/.test(target));
+const containsAll = (text, strings) => strings.every((target) => text.includes(target));
+const renderedText = (element) => {
+    if (element.getClientRects().length === 0) {
+        return "";
+    }
+    return element instanceof HTMLElement ? element.innerText : element.textContent;
+};
+const matches = (element) =>
+    (!prunable || containsAll(element.textContent.toLowerCase(), loweredTargets)) &&
+    containsAll(renderedText(element), targets);
+let current = document.documentElement;
+if (current === null || !matches(current)) {
+    return null;
+}
+descend: while (true) {
+    for (const child of current.children) {
+        if (matches(child)) {
+            current = child;
+            continue descend;
+        }
+    }
+    return current;
+}
+"""
+
+SelectedItem = tuple[str, Optional[Rectangle]]
+
 
 class BaseSeleniumDriver(BaseShushuComponent):
-    def __init__(self, logger: Logger) -> None:
+    def __init__(self, logger: Logger, collect_element_locations: bool = False) -> None:
         super(BaseSeleniumDriver, self).__init__(logger=logger)
+        self._is_quit = False
         self._init_driver()
         self._driver: WebDriver
         self._selector: Selector | None = None
+        self._collect_element_locations = collect_element_locations
 
     def __del__(self) -> None:
+        self.quit()
+
+    def quit(self) -> None:
+        if self._is_quit:
+            return
+        self._is_quit = True
         self._driver.quit()
 
+    def is_alive(self) -> bool:
+        if self._is_quit:
+            return False
+        try:
+            self._driver.window_handles
+        except WebDriverException:
+            return False
+        return True
+
+    def _clear_browsing_data(self) -> None:
+        self._driver.delete_all_cookies()
+        try:
+            self._driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            # storage is not accessible on some pages such as about:blank
+            ...
+
+    def reset(self) -> None:
+        """Forgets the state of the previous user so that the driver can be handed to another one."""
+        self._clear_browsing_data()
+        self._driver.get("about:blank")
+        self._selector = None
+
+    def _wait_for_page(self) -> None:
+        """Waits until an opened or clicked page is ready. Drivers that rely on the page load strategy do nothing."""
+
     @abstractmethod
     def _init_driver(self) -> None:
         raise NotImplementedError()
 
+    @property
+    def current_url(self) -> str:
+        return self._driver.current_url
+
+    @property
+    def page_source(self) -> str:
+        return self._driver.page_source
+
     @property
     def selector(self) -> Selector:
         if self._selector is None:
@@ -60,27 +169,53 @@ class BaseSeleniumDriver(BaseShushuComponent):
             ...
         return element
 
+    def _find_minimum_enclosing_element_by_script(self, target_strings: list[QueryString]) -> Optional[WebElement]:
+        """Runs the search in a single WebDriver round trip. Returns None when the script is not usable."""
+        try:
+            result = self._driver.execute_script(MINIMUM_ENCLOSING_ELEMENT_SCRIPT, target_strings)
+        except WebDriverException as e:
+            self.log_debug("Falling back to element-wise search.", extra={"reason": str(e)})
+            return None
+        if result is None:
+            raise NoSuchElementException()
+        if not isinstance(result, WebElement):
+            return None
+        return result
+
+    def _open_url(self, action: OpenUrlAction) -> None:
+        self._driver.get(url=str(action.url.value))
+        self._wait_for_page()
+
+    def _set_selector(self, action: SetSelectorAction) -> None:
+        self._selector = action.selector
+
+    def _click_selected_element(self, action: ClickSelectedElementAction) -> None:
+        raw_element = self._get_raw_selected_element()
+        if raw_element is None:
+            raise NoElementFoundError()
+        raw_element.click()
+        self._wait_for_page()
+
+    _action_handlers: ClassVar[dict[type, Callable[["BaseSeleniumDriver", Any], None]]] = {
+        OpenUrlAction: _open_url,
+        SetSelectorAction: _set_selector,
+        ClickSelectedElementAction: _click_selected_element,
+    }
+
     def perform(self, action: WebAgentAction) -> None:
-        if isinstance(action, OpenUrlAction):
-            self._driver.get(url=str(action.url.value))
-            return
-        if isinstance(action, SetSelectorAction):
-            self._selector = action.selector
-            return
-        if isinstance(action, ClickSelectedElementAction):
-            raw_element = self._get_raw_selected_element()
-            if raw_element is None:
-                raise NoElementFoundError()
-            raw_element.click()
-            return
-        RectangleSelector,
-        raise NotImplementedError()
+        handler = self._action_handlers.get(type(action))
+        if handler is None:
+            raise NotImplementedError()
+        handler(self, action)
 
     def _get_raw_selected_element(self) -> WebElement:
         try:
             if isinstance(self.selector, XPathSelector):
                 return self._driver.find_element(By.XPATH, self.selector.xpath)
             elif isinstance(self.selector, MinimumEnclosingElementWithMultipleTextsSelector):
+                element = self._find_minimum_enclosing_element_by_script(self.selector.target_strings)
+                if element is not None:
+                    return element
                 return self._find_minimum_enclosing_element_with_multiple_texts(
                     self._driver.find_element(By.XPATH, "/*"), self.selector.target_strings
                 )
@@ -96,15 +231,96 @@ class BaseSeleniumDriver(BaseShushuComponent):
             html_source=element.get_attribute("outerHTML"),
         )
 
-    def get_selected_elements(self) -> ElementSequence:
-        if self._selector is None:
-            raise NoElementSelectedError()
+    @classmethod
+    def _to_selected_item(cls, item: Any) -> SelectedItem:
+        html_source, location = item
+        if not isinstance(html_source, str):
+            raise TypeError(f"Unexpected outerHTML: {html_source}")
+        if location is None:
+            return (html_source, None)
+        x, y, width, height = location
+        return (html_source, Rectangle(x=x, y=y, width=width, height=height))
+
+    def _select_elements_by_script(
+        self, xpath: XPath, start: int = 0, count: Optional[int] = None
+    ) -> Optional[tuple[list[SelectedItem], Optional[int]]]:
+        """Selects up to `count` elements from the `start`-th match in a single WebDriver round trip.
+
+        Returns the elements and the index of the match to continue from, which is None after the last match, or None
+        when the script is not usable.
+        """
         try:
-            if isinstance(self._selector, XPathSelector):
-                elements = self._driver.find_elements(By.XPATH, self._selector.xpath)
-            else:
-                raise NotImplementedError()
+            result = self._driver.execute_script(
+                SELECT_ELEMENTS_SCRIPT, xpath, self._collect_element_locations, start, count
+            )
+        except WebDriverException as e:
+            self.log_debug("Falling back to find_elements.", extra={"reason": str(e)})
+            return None
+        if not isinstance(result, list) or len(result) != 2:
+            return None
+        items, next_start = result
+        if not isinstance(items, list) or not (next_start is None or isinstance(next_start, int)):
+            return None
+        try:
+            return [self._to_selected_item(item) for item in items], next_start
+        except (TypeError, ValueError) as e:
+            self.log_debug("Falling back to find_elements.", extra={"reason": str(e)})
+            return None
+
+    def _select_elements_by_find_elements(self, xpath: XPath) -> list[SelectedItem]:
+        """Selects elements with one round trip per element (plus one more per location)."""
+        try:
+            elements = self._driver.find_elements(By.XPATH, xpath)
         except NoSuchElementException:
             raise NoElementFoundError()
+        items: list[SelectedItem] = []
+        for element in elements:
+            location = None
+            if self._collect_element_locations:
+                rect = element.rect
+                location = Rectangle(
+                    x=round(rect["x"]), y=round(rect["y"]), width=round(rect["width"]), height=round(rect["height"])
+                )
+            items.append((element.get_attribute("outerHTML"), location))
+        return items
+
+    def _get_selected_xpath(self) -> XPath:
+        if self._selector is None:
+            raise NoElementSelectedError()
+        if not isinstance(self._selector, XPathSelector):
+            raise NotImplementedError()
+        return self._selector.xpath
+
+    @classmethod
+    def _to_element_sequence(cls, url: Url, items: list[SelectedItem]) -> ElementSequence:
+        return ElementSequence(
+            elements=[Element(url=url, html_source=html_source, location=location) for html_source, location in items]
+        )
+
+    def get_selected_elements(self) -> ElementSequence:
+        xpath = self._get_selected_xpath()
+        result = self._select_elements_by_script(xpath)
+        items = self._select_elements_by_find_elements(xpath) if result is None else result[0]
+        return self._to_element_sequence(Url(value=self._driver.current_url), items)
+
+    def iter_selected_elements(self, chunk_size: int) -> Iterator[ElementSequence]:
+        """Yields the selected elements in sequences of at most `chunk_size` elements, fetching one chunk at a time.
+
+        Every chunk evaluates the XPath again, so the page should not change while the chunks are consumed.
+        """
+        xpath = self._get_selected_xpath()
         url = Url(value=self._driver.current_url)
-        return ElementSequence(elements=[Element(url=url, html_source=d.get_attribute("outerHTML")) for d in elements])
+        start: Optional[int] = 0
+        yielded_count = 0
+        while start is not None:
+            result = self._select_elements_by_script(xpath, start, chunk_size)
+            if result is None:
+                # find_elements returns elements only, so the elements yielded so far are its first ones
+                items = self._select_elements_by_find_elements(xpath)[yielded_count:]
+                for offset in range(0, len(items), chunk_size):
+                    yield self._to_element_sequence(url, items[offset : offset + chunk_size])
+                return
+            items, start = result
+            if len(items) > 0:
+                yielded_count += len(items)
+                yield self._to_element_sequence(url, items)
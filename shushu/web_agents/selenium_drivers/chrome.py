@@ -1,13 +1,85 @@
+from logging import Logger
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver import Chrome
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.expected_conditions import presence_of_element_located
+from selenium.webdriver.support.wait import WebDriverWait
 
+from ...settings import BlockedResourceType, ChromeSeleniumDriverSettings
 from .base import BaseSeleniumDriver
 
+# Network.setBlockedURLs only matches URLs, so resource types are blocked by their usual file extensions
+RESOURCE_TYPE_EXTENSIONS = {
+    BlockedResourceType.IMAGE: ["png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"],
+    BlockedResourceType.MEDIA: ["mp4", "webm", "ogg", "mp3", "wav", "m4a", "mov", "m3u8"],
+    BlockedResourceType.FONT: ["woff", "woff2", "ttf", "otf", "eot"],
+    BlockedResourceType.STYLESHEET: ["css"],
+}
+
+
+def get_blocked_url_patterns(settings: ChromeSeleniumDriverSettings) -> list[str]:
+    """Returns the URL patterns to block for the settings.
+
+    >>> get_blocked_url_patterns(
+    ...     ChromeSeleniumDriverSettings(
+    ...         blocked_url_patterns=["*://ads.example.com/*"], blocked_resource_types=[BlockedResourceType.FONT]
+    ...     )
+    ... )[:3]
+    ['*://ads.example.com/*', '*.woff', '*.woff?*']
+    """
+    patterns = list(settings.blocked_url_patterns)
+    for resource_type in settings.blocked_resource_types:
+        for extension in RESOURCE_TYPE_EXTENSIONS[resource_type]:
+            patterns.extend([f"*.{extension}", f"*.{extension}?*"])
+    return patterns
+
 
 class ChromeSeleniumDriver(BaseSeleniumDriver):
+    def __init__(self, settings: ChromeSeleniumDriverSettings, logger: Logger) -> None:
+        self._settings = settings
+        super(ChromeSeleniumDriver, self).__init__(
+            logger=logger, collect_element_locations=settings.collect_element_locations
+        )
+
+    @property
+    def settings(self) -> ChromeSeleniumDriverSettings:
+        return self._settings
+
     def _init_driver(self) -> None:
         options = Options()
         options.add_argument("--disable-gpu")
         options.add_argument("--headless")
+        options.page_load_strategy = self.settings.page_load_strategy.value
+        if self.settings.disable_images:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
 
         self._driver = Chrome(options=options)
+        blocked_url_patterns = get_blocked_url_patterns(self.settings)
+        if blocked_url_patterns:
+            self._driver.execute_cdp_cmd("Network.enable", {})
+            self._driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns})
+
+    def _wait_for_page(self) -> None:
+        if self.settings.wait_for_xpath is None:
+            return
+        try:
+            WebDriverWait(self._driver, self.settings.wait_timeout).until(
+                presence_of_element_located((By.XPATH, self.settings.wait_for_xpath))
+            )
+        except TimeoutException:
+            # selectors report the missing elements, so a page without them is not an error here
+            self.log_warning(
+                "Timed out waiting for page.",
+                extra={"xpath": self.settings.wait_for_xpath, "timeout": self.settings.wait_timeout},
+            )
+
+    def _clear_browsing_data(self) -> None:
+        try:
+            # clears cookies and storages of every origin, not only of the current page
+            self._driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": "*", "storageTypes": "all"})
+            self._driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except WebDriverException:
+            super(ChromeSeleniumDriver, self)._clear_browsing_data()
@@ -0,0 +1,105 @@
+from logging import Logger
+from queue import Empty, LifoQueue
+from typing import Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from ...base import BaseShushuComponent
+from ...settings import BaseSeleniumDriverSettings
+from .base import BaseSeleniumDriver
+from .factory import SeleniumDriverFactory
+
+
+class SeleniumDriverPool(BaseShushuComponent):
+    """A pool of launched selenium drivers leased to web agents.
+
+    Drivers are launched on their first lease unless they are launched up front with `prelaunch`. They are checked for
+    health before every lease, reset between leases and replaced after `max_uses_per_driver` leases or when they are
+    broken. The owner of the pool closes it once every lease is returned.
+    """
+
+    def __init__(
+        self, driver_settings: BaseSeleniumDriverSettings, size: int, max_uses_per_driver: int, logger: Logger
+    ) -> None:
+        super(SeleniumDriverPool, self).__init__(logger=logger)
+        if size < 1:
+            raise ValueError(f"Pool size must be positive, but got {size}")
+        self._driver_settings = driver_settings
+        self._size = size
+        self._max_uses_per_driver = max_uses_per_driver
+        self._use_counts: dict[BaseSeleniumDriver, int] = {}
+        self._idle_drivers: LifoQueue[Optional[BaseSeleniumDriver]] = LifoQueue()
+        for _ in range(size):
+            self._idle_drivers.put(None)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def max_uses_per_driver(self) -> int:
+        return self._max_uses_per_driver
+
+    def _discard(self, driver: BaseSeleniumDriver) -> None:
+        self._use_counts.pop(driver, None)
+        try:
+            driver.quit()
+        except WebDriverException as e:
+            self.log_warning("Failed to quit selenium driver.", extra={"reason": str(e)})
+
+    def acquire(self) -> BaseSeleniumDriver:
+        """Leases a driver. Blocks while all drivers are leased."""
+        driver = self._idle_drivers.get()
+        if driver is not None and driver.is_alive():
+            self._use_counts[driver] += 1
+            return driver
+        if driver is not None:
+            self.log_debug("Replacing unhealthy selenium driver.")
+            self._discard(driver)
+        try:
+            driver = SeleniumDriverFactory(logger=self.logger).create(settings=self._driver_settings)
+        except BaseException:
+            self._idle_drivers.put(None)
+            raise
+        self.log_debug("Launched selenium driver.")
+        self._use_counts[driver] = 1
+        return driver
+
+    def prelaunch(self) -> None:
+        """Launches the drivers that are not launched yet, so that no lease pays for launching a browser."""
+        drivers: list[BaseSeleniumDriver] = []
+        try:
+            for _ in range(self.size):
+                drivers.append(self.acquire())
+        finally:
+            for driver in drivers:
+                self._use_counts[driver] -= 1
+                self._idle_drivers.put(driver)
+        self.log_info("Launched selenium drivers.", extra={"driver_count": len(drivers)})
+
+    def release(self, driver: BaseSeleniumDriver) -> None:
+        use_count = self._use_counts.get(driver, 0)
+        if use_count < self.max_uses_per_driver:
+            try:
+                driver.reset()
+            except WebDriverException as e:
+                self.log_debug("Failed to reset selenium driver.", extra={"reason": str(e)})
+            else:
+                self._idle_drivers.put(driver)
+                return
+        self.log_debug("Recycling selenium driver.", extra={"use_count": use_count})
+        self._discard(driver)
+        self._idle_drivers.put(None)
+
+    def close(self) -> None:
+        drained = 0
+        while True:
+            try:
+                driver = self._idle_drivers.get_nowait()
+            except Empty:
+                break
+            if driver is not None:
+                self._discard(driver)
+            drained += 1
+        for _ in range(drained):
+            self._idle_drivers.put(None)
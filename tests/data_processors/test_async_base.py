@@ -0,0 +1,20 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+
+from shushu.data_processors.async_base import ThreadedAsyncDataProcessor
+from shushu.data_processors.base import BaseDataProcessor
+
+
+def test_threaded_async_data_processor_delegates_to_data_processor(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    data_processor = mocker.MagicMock(spec=BaseDataProcessor)
+    sut = ThreadedAsyncDataProcessor(data_processor=data_processor, logger=logger_fixture)
+
+    actual = asyncio.run(sut.perform())
+
+    assert actual == data_processor.perform.return_value
+    assert sut.payload == data_processor.payload
+    data_processor.perform.assert_called_once_with()
@@ -8,7 +8,7 @@ from shushu.models import Element, Url
 
 
 def test_factory_create_python_code_data_processor(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
-    PythonCodeDataProcessor = mocker.patch("shushu.data_processors.factory.PythonCodeDataProcessor")
+    PythonCodeDataProcessor = mocker.patch("shushu.data_processors.python_code.PythonCodeDataProcessor")
     payload = Element(url=Url(value="http://localhost:8000"), html_source="<div>test</div>")
     src = """\
 def convert(element: Element) -> Element:
@@ -21,4 +21,6 @@ def convert(element: Element) -> Element:
     sut = DataProcessorFactory(logger=logger_fixture)
     actual = sut.create(action=action, payload=payload)
     assert PythonCodeDataProcessor.return_value == actual
-    PythonCodeDataProcessor.assert_called_once_with(code=src, payload=payload, logger=logger_fixture)
+    PythonCodeDataProcessor.assert_called_once_with(
+        code=src, payload=payload, logger=logger_fixture, worker_pool=None, html_parser_type=None
+    )
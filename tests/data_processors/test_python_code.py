@@ -3,8 +3,14 @@ from unittest.mock import MagicMock
 import pytest
 from pytest_mock import MockerFixture
 
+from shushu.data_processors.exceptions import PythonCodeError
 from shushu.data_processors.python_code import PythonCodeDataProcessor
-from shushu.models import BaseDataModel, Element, ElementSequence, Url
+from shushu.data_processors.python_code_protocol import (
+    PythonCodeWorkerRequest,
+    PythonCodeWorkerResponse,
+)
+from shushu.data_processors.python_code_worker_pool import PythonCodeWorkerPool
+from shushu.models import BaseDataModel, Element, ElementSequence, Url, data_model_cache
 from shushu.types import CodeString, TypeId
 
 
@@ -81,3 +87,116 @@ def convert(data: DataModel) -> DataModel:
     sut = PythonCodeDataProcessor(code=src, payload=payload, logger=logger_fixture)
     with pytest.raises(TypeError):
         sut.perform()
+
+
+def test_python_code_data_processor_perform_with_worker_pool(logger_fixture: MagicMock) -> None:
+    payload = Element(url=Url(value="http://localhost:8000"), html_source="<div>test</div>")
+    src = CodeString(
+        """\
+from shushu.models import BaseDataModel, Element
+from shushu.types import TypeId
+
+class DataModel(BaseDataModel):
+    type_id: TypeId = TypeId("01HVVFMAGJ8898QE22XAMT9ZQ8")
+    value: str
+
+def convert(element: Element) -> DataModel:
+    return DataModel(value=element.text)
+"""
+    )
+    worker_pool = PythonCodeWorkerPool(size=1, max_tasks_per_worker=10, logger=logger_fixture)
+    try:
+        actuals = [
+            PythonCodeDataProcessor(code=src, payload=payload, logger=logger_fixture, worker_pool=worker_pool).perform()
+            for _ in range(2)
+        ]
+    finally:
+        worker_pool.close()
+    for actual in actuals:
+        assert hasattr(actual, "value")
+        assert actual.value == "test"
+        assert actual.type_id == "01HVVFMAGJ8898QE22XAMT9ZQ8"
+
+
+def test_python_code_data_processor_perform_with_worker_pool_raises_python_code_error(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    payload = Element(url=Url(value="http://localhost:8000"), html_source="<div>test</div>")
+    worker_pool = mocker.MagicMock(spec=PythonCodeWorkerPool)
+    worker_pool.execute.return_value = PythonCodeWorkerResponse(error="Traceback ...")
+    sut = PythonCodeDataProcessor(
+        code=CodeString("def convert(x):\n    raise RuntimeError()\n"),
+        payload=payload,
+        logger=logger_fixture,
+        worker_pool=worker_pool,
+    )
+    with pytest.raises(PythonCodeError):
+        sut.perform()
+    worker_pool.execute.assert_called_once_with(
+        PythonCodeWorkerRequest(
+            code="def convert(x):\n    raise RuntimeError()\n",
+            payload_type="Element",
+            payload=payload.model_dump_json().encode("utf-8"),
+        )
+    )
+
+
+def test_python_code_data_processor_reuses_cached_data_model(logger_fixture: MagicMock) -> None:
+    payload = Element(url=Url(value="http://localhost:8000"), html_source="<div>test</div>")
+    src = CodeString(
+        """\
+from shushu.models import BaseDataModel, Element
+from shushu.types import TypeId
+
+class CachedDataModel(BaseDataModel):
+    type_id: TypeId = TypeId("01M57JHR94V4X54HZ4R6T0XHR3")
+    cached_value: str
+
+def convert(element: Element) -> CachedDataModel:
+    return CachedDataModel(cached_value=element.text)
+"""
+    )
+    data_model_cache.clear()
+    worker_pool = PythonCodeWorkerPool(size=1, max_tasks_per_worker=10, logger=logger_fixture)
+    try:
+        actuals = [
+            PythonCodeDataProcessor(code=src, payload=payload, logger=logger_fixture, worker_pool=worker_pool).perform()
+            for _ in range(3)
+        ]
+    finally:
+        worker_pool.close()
+    assert len({type(actual) for actual in actuals}) == 1
+    assert data_model_cache.misses == 1
+    assert data_model_cache.hits == 2
+
+
+def test_python_code_data_processor_perform_large_payload(logger_fixture: MagicMock) -> None:
+    payload = ElementSequence(
+        elements=[
+            Element(url=Url(value="http://localhost:8000"), html_source=f"<div>{i}{'x' * 1000}</div>")
+            for i in range(1000)
+        ]
+    )
+    src = CodeString(
+        """\
+from shushu.models import BaseDataModel, ElementSequence
+from shushu.types import TypeId
+
+class DataModel(BaseDataModel):
+    type_id: TypeId = TypeId("01HVVGH8C2CYRBJ2KVWXJFTS7H")
+    count: int
+    total_length: int
+
+def convert(element_sequence: ElementSequence) -> DataModel:
+    return DataModel(
+        count=len(element_sequence.elements),
+        total_length=sum(len(element.text) for element in element_sequence.elements),
+    )
+"""
+    )
+    sut = PythonCodeDataProcessor(code=src, payload=payload, logger=logger_fixture)
+    actual = sut.perform()
+    assert hasattr(actual, "count")
+    assert actual.count == 1000
+    assert hasattr(actual, "total_length")
+    assert actual.total_length == sum(len(f"{i}{'x' * 1000}") for i in range(1000))
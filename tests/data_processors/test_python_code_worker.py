@@ -0,0 +1,111 @@
+import json
+from io import BytesIO
+
+from shushu.data_processors.python_code_protocol import (
+    PythonCodeWorkerRequest,
+    read_response,
+    write_request,
+)
+from shushu.data_processors.python_code_worker import PythonCodeWorker
+from shushu.models import (
+    BaseDataModel,
+    CompactElementSequence,
+    Element,
+    Url,
+    json_schema_key,
+)
+from shushu.types import TypeId
+
+SRC = """\
+from shushu.models import BaseDataModel, Element
+from shushu.types import TypeId
+
+class DataModel(BaseDataModel):
+    type_id: TypeId = TypeId("01HVVFMAGJ8898QE22XAMT9ZQ8")
+    value: str
+
+def convert(element: Element) -> DataModel:
+    return DataModel(value=element.text)
+"""
+
+
+def _request(code: str = SRC) -> PythonCodeWorkerRequest:
+    payload = Element(url=Url(value="http://localhost:8000"), html_source="<div>test</div>")
+    return PythonCodeWorkerRequest(code=code, payload_type="Element", payload=payload.model_dump_json().encode())
+
+
+def test_python_code_worker_handle_converts_payload() -> None:
+    sut = PythonCodeWorker()
+    actual = sut.handle(_request())
+    assert actual.error is None
+    assert json.loads(actual.data)["value"] == "test"
+    json_schema = json.loads(actual.json_schema)
+    assert json_schema["properties"]["value"]["type"] == "string"
+    assert actual.schema_key == json_schema_key(json_schema)
+
+
+def test_python_code_worker_reuses_json_schema() -> None:
+    class DataModel(BaseDataModel):
+        type_id: TypeId = TypeId("01HVVFMAGJ8898QE22XAMT9ZQ8")
+        value: str
+
+    sut = PythonCodeWorker()
+    first = sut.get_json_schema(DataModel)
+    assert sut.get_json_schema(DataModel) is first
+    assert json.loads(first[1]) == DataModel.model_json_schema()
+    assert first[0] == json_schema_key(DataModel.model_json_schema())
+
+
+def test_python_code_worker_reuses_compiled_code() -> None:
+    sut = PythonCodeWorker()
+    assert sut.get_converter(SRC) is sut.get_converter(SRC)
+
+
+def test_python_code_worker_evicts_old_code() -> None:
+    sut = PythonCodeWorker(max_cached_codes=1)
+    first = sut.get_converter(SRC)
+    sut.get_converter(SRC + "\n# another code\n")
+    assert sut.get_converter(SRC) is not first
+
+
+def test_python_code_worker_handle_returns_error() -> None:
+    sut = PythonCodeWorker()
+    actual = sut.handle(_request(code="def convert(element):\n    raise RuntimeError('boom')\n"))
+    assert actual.error is not None
+    assert "RuntimeError: boom" in actual.error
+
+
+def test_python_code_worker_serve_answers_each_request() -> None:
+    reader = BytesIO()
+    write_request(reader, _request())
+    write_request(reader, _request())
+    reader.seek(0)
+    writer = BytesIO()
+    PythonCodeWorker().serve(reader=reader, writer=writer)
+    writer.seek(0)
+    responses = [read_response(writer), read_response(writer)]
+    assert all(response is not None and json.loads(response.data)["value"] == "test" for response in responses)
+    assert read_response(writer) is None
+
+
+def test_python_code_worker_handle_converts_compact_element_sequence() -> None:
+    code = """\
+from shushu.models import BaseDataModel, CompactElementSequence
+from shushu.types import TypeId
+
+class Texts(BaseDataModel):
+    type_id: TypeId = TypeId("01HVVFMAGJ8898QE22XAMT9ZQ8")
+    values: list[str]
+
+def convert(element_sequence: CompactElementSequence) -> Texts:
+    return Texts(values=[element.text for element in element_sequence.elements])
+"""
+    payload = CompactElementSequence.from_html_sources(
+        url=Url(value="http://localhost:8000"), html_sources=["<li>a</li>", "<li>b</li>"]
+    )
+    request = PythonCodeWorkerRequest(
+        code=code, payload_type="CompactElementSequence", payload=payload.model_dump_json().encode()
+    )
+    actual = PythonCodeWorker().handle(request)
+    assert actual.error is None
+    assert json.loads(actual.data)["values"] == ["a", "b"]
@@ -0,0 +1,101 @@
+import json
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from shushu.data_processors.exceptions import PythonCodeWorkerError
+from shushu.data_processors.python_code_protocol import PythonCodeWorkerRequest
+from shushu.data_processors.python_code_worker_pool import PythonCodeWorkerPool
+from shushu.models import Element, Url, get_html_parser_type
+from shushu.types import HtmlParserType
+
+SRC = """\
+import os
+
+from shushu.models import BaseDataModel, Element
+from shushu.types import TypeId
+
+class DataModel(BaseDataModel):
+    type_id: TypeId = TypeId("01HVVFMAGJ8898QE22XAMT9ZQ8")
+    value: str
+    pid: int
+
+def convert(element: Element) -> DataModel:
+    if element.text == "crash":
+        os._exit(1)
+    print("printed text must not break the protocol")
+    return DataModel(value=element.text, pid=os.getpid())
+"""
+
+
+def _execute(sut: PythonCodeWorkerPool, text: str) -> Any:
+    payload = Element(url=Url(value="http://localhost:8000"), html_source=f"<div>{text}</div>")
+    response = sut.execute(
+        PythonCodeWorkerRequest(code=SRC, payload_type="Element", payload=payload.model_dump_json().encode("utf-8"))
+    )
+    return json.loads(response.data)
+
+
+def test_python_code_worker_pool_reuses_worker(logger_fixture: MagicMock) -> None:
+    sut = PythonCodeWorkerPool(size=1, max_tasks_per_worker=10, logger=logger_fixture)
+    try:
+        datas = [_execute(sut, f"test{i}") for i in range(3)]
+    finally:
+        sut.close()
+    assert [d["value"] for d in datas] == ["test0", "test1", "test2"]
+    assert len({d["pid"] for d in datas}) == 1
+
+
+def test_python_code_worker_pool_recycles_worker_after_max_tasks(logger_fixture: MagicMock) -> None:
+    sut = PythonCodeWorkerPool(size=1, max_tasks_per_worker=2, logger=logger_fixture)
+    try:
+        datas = [_execute(sut, f"test{i}") for i in range(3)]
+    finally:
+        sut.close()
+    assert datas[0]["pid"] == datas[1]["pid"]
+    assert datas[1]["pid"] != datas[2]["pid"]
+
+
+def test_python_code_worker_pool_replaces_crashed_worker(logger_fixture: MagicMock) -> None:
+    sut = PythonCodeWorkerPool(size=1, max_tasks_per_worker=10, logger=logger_fixture)
+    try:
+        with pytest.raises(PythonCodeWorkerError):
+            _execute(sut, "crash")
+        assert _execute(sut, "alive")["value"] == "alive"
+    finally:
+        sut.close()
+
+
+def test_python_code_worker_pool_rejects_non_positive_size(logger_fixture: MagicMock) -> None:
+    with pytest.raises(ValueError):
+        PythonCodeWorkerPool(size=0, max_tasks_per_worker=10, logger=logger_fixture)
+
+
+PARSER_SRC = """\
+from shushu.models import BaseDataModel, Element, get_html_parser_type
+from shushu.types import TypeId
+
+class DataModel(BaseDataModel):
+    type_id: TypeId = TypeId("01HVVFMAGJ8898QE22XAMT9ZQ8")
+    value: str
+
+def convert(element: Element) -> DataModel:
+    return DataModel(value=get_html_parser_type().value)
+"""
+
+
+def test_python_code_worker_pools_use_their_own_html_parser(logger_fixture: MagicMock) -> None:
+    payload = Element(url=Url(value="http://localhost:8000"), html_source="<div>text</div>").model_dump_json()
+    request = PythonCodeWorkerRequest(code=PARSER_SRC, payload_type="Element", payload=payload.encode("utf-8"))
+    pools = [
+        PythonCodeWorkerPool(size=1, max_tasks_per_worker=10, logger=logger_fixture, html_parser_type=html_parser_type)
+        for html_parser_type in [HtmlParserType.LXML, HtmlParserType.HTML_PARSER]
+    ]
+    try:
+        values = [json.loads(pool.execute(request).data)["value"] for pool in pools]
+    finally:
+        for pool in pools:
+            pool.close()
+    assert values == ["LXML", "HTML_PARSER"]
+    assert get_html_parser_type() == HtmlParserType.HTML_PARSER
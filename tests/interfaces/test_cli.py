@@ -0,0 +1,132 @@
+import io
+from pathlib import Path
+from time import sleep
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from shushu.actions import (
+    OpenMemoryUrlCoreAction,
+    SaveDataAction,
+    SequencialCoreAction,
+    StorageCoreAction,
+)
+from shushu.core import ShushuCore
+from shushu.exceptions import PlanValidationError
+from shushu.interfaces.cli import CliInterface, load_core_action
+from shushu.models import UrlData
+from shushu.plans import action_checkpoint_prefix, compile_plan
+from shushu.storages.base import BaseStorage
+from shushu.web_agents.base import BaseWebAgent
+
+
+def test_cli_interface_runs_targets_in_batches(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    core = mocker.MagicMock(spec=ShushuCore)
+    action = SequencialCoreAction(actions=[OpenMemoryUrlCoreAction(), StorageCoreAction(action=SaveDataAction())])
+    progress_stream = io.StringIO()
+    sut = CliInterface(
+        core=core, logger=logger_fixture, action=action, concurrency=3, batch_size=2, progress_stream=progress_stream
+    )
+    targets = [f"http://localhost:8080/page{i}.html" for i in range(5)]
+
+    sut.run_batch(iter(targets))
+
+    core.__enter__.assert_called_once_with()
+    core.__exit__.assert_called_once_with(None, None, None)
+    assert core.map.call_count == 3
+    for call in core.map.call_args_list:
+        assert call.kwargs["action"] == compile_plan(action)
+        assert call.kwargs["max_workers"] == 3
+        assert call.kwargs["checkpoint_prefix"] == action_checkpoint_prefix(action)
+        assert call.kwargs["use_own_web_agent"]
+    items = [item for call in core.map.call_args_list for item in call.kwargs["items"]]
+    assert all(isinstance(item, UrlData) for item in items)
+    assert [str(item.url.value) for item in items] == targets
+    assert [line.split(" ")[0] for line in progress_stream.getvalue().splitlines()] == ["2", "4", "5"]
+
+
+def test_cli_interface_continues_after_failed_targets(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    web_agent.perform.side_effect = [None, RuntimeError("404"), None]
+    core = ShushuCore(web_agent=web_agent, storage=mocker.MagicMock(spec=BaseStorage), logger=logger_fixture)
+    progress_stream = io.StringIO()
+    sut = CliInterface(core=core, logger=logger_fixture, batch_size=2, progress_stream=progress_stream)
+    targets = ["http://localhost:8080/a", "http://localhost:8080/b", "not a url", "http://localhost:8080/c"]
+
+    assert sut.run_batch(targets) == 2
+
+    opened = [str(call.args[0].url.value) for call in web_agent.perform.call_args_list]
+    assert opened == ["http://localhost:8080/a", "http://localhost:8080/b", "http://localhost:8080/c"]
+    failed = [call.kwargs["extra"]["target"] for call in logger_fixture.error.call_args_list]
+    assert sorted(failed) == ["http://localhost:8080/b", "not a url"]
+    assert progress_stream.getvalue().splitlines()[-1].endswith("2 failed)")
+
+
+def test_cli_interface_reuses_web_agents_across_batches(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    # the targets take a while, so both workers are busy at once
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    web_agent.perform.side_effect = lambda action: sleep(0.05)
+    worker_web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    worker_web_agent.__enter__.return_value = worker_web_agent
+    worker_web_agent.perform.side_effect = lambda action: sleep(0.05)
+    web_agent_factory = mocker.MagicMock(return_value=worker_web_agent)
+    core = ShushuCore(
+        web_agent=web_agent,
+        storage=mocker.MagicMock(spec=BaseStorage),
+        logger=logger_fixture,
+        web_agent_factory=web_agent_factory,
+    )
+    sut = CliInterface(core=core, logger=logger_fixture, concurrency=2, batch_size=2, progress_stream=io.StringIO())
+
+    assert sut.run_batch([f"http://localhost:8080/page{i}.html" for i in range(6)]) == 0
+
+    web_agent_factory.assert_called_once_with()
+    assert web_agent.perform.call_count == 3
+    assert worker_web_agent.perform.call_count == 3
+    worker_web_agent.__exit__.assert_called_once_with(None, None, None)
+
+
+def test_cli_interface_resumes_plans_parsed_again(
+    mocker: MockerFixture, logger_fixture: MagicMock, tmp_path: Path
+) -> None:
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text('{"type": "SEQUENCIAL", "actions": [{"type": "OPEN_MEMORY_URL"}]}', encoding="utf-8")
+    prefixes = []
+    for _ in range(2):
+        core = mocker.MagicMock(spec=ShushuCore)
+        sut = CliInterface(
+            core=core, logger=logger_fixture, action=load_core_action(plan_path), progress_stream=io.StringIO()
+        )
+        sut.run("http://localhost:8080/")
+        prefixes.append(core.map.call_args.kwargs["checkpoint_prefix"])
+    assert prefixes[0] == prefixes[1]
+
+
+def test_cli_interface_run_opens_a_single_target(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    core = mocker.MagicMock(spec=ShushuCore)
+    sut = CliInterface(core=core, logger=logger_fixture, progress_stream=io.StringIO())
+
+    sut.run("http://localhost:8080/")
+
+    assert isinstance(sut.action, OpenMemoryUrlCoreAction)
+    (item,) = core.map.call_args.kwargs["items"]
+    assert str(item.url.value) == "http://localhost:8080/"
+
+
+def test_cli_interface_validates_plan_before_entering_core(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    core = mocker.MagicMock(spec=ShushuCore)
+    action = StorageCoreAction(action=SaveDataAction(), payload={"type": "SELECTED_ELEMENT"})
+    with pytest.raises(PlanValidationError):
+        CliInterface(core=core, logger=logger_fixture, action=action, progress_stream=io.StringIO())
+
+    core.__enter__.assert_not_called()
+
+
+def test_load_core_action(tmp_path: Path) -> None:
+    action = SequencialCoreAction(actions=[OpenMemoryUrlCoreAction(), StorageCoreAction(action=SaveDataAction())])
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text(action.model_dump_json(), encoding="utf-8")
+    assert load_core_action(plan_path) == action
+    plan_path.write_text('{"type": "OPEN_MEMORY_URL"}', encoding="utf-8")
+    assert isinstance(load_core_action(plan_path), OpenMemoryUrlCoreAction)
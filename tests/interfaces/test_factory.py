@@ -1,9 +1,17 @@
 from logging import Logger
+from pathlib import Path
 
+import pytest
 from pytest_mock import MockerFixture
 
+from shushu.actions import (
+    OpenMemoryUrlCoreAction,
+    SaveDataAction,
+    StorageCoreAction,
+)
 from shushu.core import ShushuCore
 from shushu.interfaces.factory import InterfaceFactory
+from shushu.plans import PlanValidationError, compile_plan
 from shushu.settings import CliInterfaceSettings
 
 
@@ -12,6 +20,34 @@ def test_interaface_factory_creates_cli(mocker: MockerFixture) -> None:
     core = mocker.MagicMock(spec=ShushuCore)
     CliInterface = mocker.patch("shushu.interfaces.factory.CliInterface")
     settings = CliInterfaceSettings()
-    actual = InterfaceFactory(core=core, logger=logger).create(settings=settings)
+    actual = InterfaceFactory(core_factory=lambda: core, logger=logger).create(settings=settings)
     assert CliInterface.return_value == actual
-    CliInterface.assert_called_once_with(core=core, logger=logger)
+    CliInterface.assert_called_once_with(
+        core=core, logger=logger, action=None, concurrency=1, batch_size=100, plan=None
+    )
+
+
+def test_interaface_factory_creates_cli_with_plan(mocker: MockerFixture, tmp_path: Path) -> None:
+    logger = mocker.MagicMock(spec=Logger)
+    core = mocker.MagicMock(spec=ShushuCore)
+    CliInterface = mocker.patch("shushu.interfaces.factory.CliInterface")
+    action = OpenMemoryUrlCoreAction(attribute="link")
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text(action.model_dump_json(), encoding="utf-8")
+    settings = CliInterfaceSettings(plan_path=plan_path, concurrency=4)
+    InterfaceFactory(core_factory=lambda: core, logger=logger).create(settings=settings)
+    CliInterface.assert_called_once_with(
+        core=core, logger=logger, action=action, concurrency=4, batch_size=100, plan=compile_plan(action)
+    )
+
+
+def test_interaface_factory_validates_plan_before_creating_core(mocker: MockerFixture, tmp_path: Path) -> None:
+    logger = mocker.MagicMock(spec=Logger)
+    core_factory = mocker.MagicMock()
+    action = StorageCoreAction(action=SaveDataAction(), payload={"type": "SELECTED_ELEMENT"})
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text(action.model_dump_json(), encoding="utf-8")
+    settings = CliInterfaceSettings(plan_path=plan_path)
+    with pytest.raises(PlanValidationError):
+        InterfaceFactory(core_factory=core_factory, logger=logger).create(settings=settings)
+    core_factory.assert_not_called()
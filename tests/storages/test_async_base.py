@@ -0,0 +1,29 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+
+from shushu.actions import SaveDataAction
+from shushu.models import IdData
+from shushu.storages.async_base import ThreadedAsyncStorage
+from shushu.storages.base import BaseStorage
+
+
+def test_threaded_async_storage_delegates_to_storage(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    storage = mocker.MagicMock(spec=BaseStorage)
+    sut = ThreadedAsyncStorage(storage=storage, logger=logger_fixture)
+    action = SaveDataAction()
+    data = IdData(value="01HWDAHQ897SHJ888X4GW7PWF5")
+
+    asyncio.run(sut.perform(action=action, payload=data))
+
+    storage.perform.assert_called_once_with(action=action, payload=data)
+
+
+def test_threaded_async_storage_flushes_storage(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    storage = mocker.MagicMock(spec=BaseStorage)
+    sut = ThreadedAsyncStorage(storage=storage, logger=logger_fixture)
+
+    asyncio.run(sut.flush())
+
+    storage.flush.assert_called_once_with()
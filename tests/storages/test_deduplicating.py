@@ -0,0 +1,127 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+
+import pytest
+
+from shushu.actions import SaveDataAction
+from shushu.hashing import compute_content_hash
+from shushu.models import BaseDataModel, Element, ElementSequence, Url
+from shushu.settings import DeduplicationMode
+from shushu.storages.base import BaseStorage
+from shushu.storages.deduplicating import DeduplicatingStorage
+from shushu.storages.local_file import LocalFileStorage
+from shushu.types import TypeId
+
+TYPE_ID = "01HW5QHEQ53AZ7HNNRM56RKD4P"
+
+
+class DeduplicatedDataModel(BaseDataModel):
+    type_id: TypeId = TypeId(TYPE_ID)
+    some_value: int
+
+
+def _create_sut(tempdir: str, logger: MagicMock, mode: DeduplicationMode) -> DeduplicatingStorage:
+    storage = LocalFileStorage(path=Path(tempdir) / "data", logger=logger)
+    return DeduplicatingStorage(storage=storage, index_path=Path(tempdir) / "hashes.jsonl", logger=logger, mode=mode)
+
+
+def test_deduplicating_storage_skips_duplicates(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        sut = _create_sut(tempdir, logger_fixture, DeduplicationMode.SKIP)
+        first = DeduplicatedDataModel(some_value=1)
+        sut.perform(action=SaveDataAction(), payload=first)
+        sut.perform(action=SaveDataAction(), payload=DeduplicatedDataModel(some_value=1))
+        sut.perform(action=SaveDataAction(), payload=DeduplicatedDataModel(some_value=2))
+        sut.close()
+        assert len(list((Path(tempdir) / "data" / TYPE_ID).iterdir())) == 2
+        assert (Path(tempdir) / "data" / TYPE_ID / f"{first.id}.json").exists()
+
+
+def test_deduplicating_storage_updates_first_data(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        sut = _create_sut(tempdir, logger_fixture, DeduplicationMode.UPDATE)
+        first = DeduplicatedDataModel(some_value=1)
+        sut.perform(action=SaveDataAction(), payload=first)
+        second = DeduplicatedDataModel(some_value=1, created_at=first.created_at + 10, updated_at=first.updated_at + 10)
+        sut.perform(action=SaveDataAction(), payload=second)
+        sut.close()
+        paths = list((Path(tempdir) / "data" / TYPE_ID).iterdir())
+        assert [path.name for path in paths] == [f"{first.id}.json"]
+        actual = DeduplicatedDataModel.model_validate_json(paths[0].read_text(encoding="utf-8"))
+        assert actual.id == first.id
+        assert actual.created_at == first.created_at
+        assert actual.updated_at == second.updated_at
+
+
+def test_deduplicating_storage_loads_index_of_previous_run(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        sut = _create_sut(tempdir, logger_fixture, DeduplicationMode.SKIP)
+        sut.perform(action=SaveDataAction(), payload=DeduplicatedDataModel(some_value=1))
+        sut.close()
+        with open(Path(tempdir) / "hashes.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"hash": "interrupted')
+        sut = _create_sut(tempdir, logger_fixture, DeduplicationMode.SKIP)
+        sut.perform(action=SaveDataAction(), payload=DeduplicatedDataModel(some_value=1))
+        sut.perform(action=SaveDataAction(), payload=DeduplicatedDataModel(some_value=2))
+        sut.close()
+        sut = _create_sut(tempdir, logger_fixture, DeduplicationMode.SKIP)
+        sut.perform(action=SaveDataAction(), payload=DeduplicatedDataModel(some_value=2))
+        sut.close()
+        assert len(list((Path(tempdir) / "data" / TYPE_ID).iterdir())) == 2
+
+
+def test_deduplicating_storage_flushes_wrapped_storage(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        storage = MagicMock()
+        sut = DeduplicatingStorage(storage=storage, index_path=Path(tempdir) / "hashes.jsonl", logger=logger_fixture)
+        sut.flush()
+        storage.flush.assert_called_once_with()
+        sut.close()
+
+
+def test_deduplicating_storage_saves_again_after_failed_write(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        storage = MagicMock(spec=BaseStorage)
+        storage.perform.side_effect = [OSError("disk full"), None]
+        sut = DeduplicatingStorage(storage=storage, index_path=Path(tempdir) / "hashes.jsonl", logger=logger_fixture)
+        with pytest.raises(OSError):
+            sut.perform(action=SaveDataAction(), payload=DeduplicatedDataModel(some_value=1))
+        sut.perform(action=SaveDataAction(), payload=DeduplicatedDataModel(some_value=1))
+        sut.perform(action=SaveDataAction(), payload=DeduplicatedDataModel(some_value=1))
+        sut.close()
+        assert storage.perform.call_count == 2
+        assert len((Path(tempdir) / "hashes.jsonl").read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_deduplicating_storage_writes_index_after_flushing_wrapped_storage(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        index_path = Path(tempdir) / "hashes.jsonl"
+        index_lines_at_flush: list[int] = []
+        storage = MagicMock(spec=BaseStorage)
+        storage.flush.side_effect = lambda: index_lines_at_flush.append(
+            len(index_path.read_text(encoding="utf-8").splitlines()) if index_path.exists() else 0
+        )
+        sut = DeduplicatingStorage(storage=storage, index_path=index_path, logger=logger_fixture)
+        sut.perform(action=SaveDataAction(), payload=DeduplicatedDataModel(some_value=1))
+        assert not index_path.exists()
+        sut.flush()
+        sut.close()
+        assert index_lines_at_flush == [0, 1]
+        assert len(index_path.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_deduplicating_storage_skips_duplicates_with_nested_entities(logger_fixture: MagicMock) -> None:
+    def element_sequence() -> ElementSequence:
+        return ElementSequence(elements=[Element(url=Url(value="http://localhost:8080/"), html_source="<p>a</p>")])
+
+    assert compute_content_hash(element_sequence()) == compute_content_hash(element_sequence())
+    with TemporaryDirectory() as tempdir:
+        storage = MagicMock(spec=BaseStorage)
+        sut = DeduplicatingStorage(storage=storage, index_path=Path(tempdir) / "hashes.jsonl", logger=logger_fixture)
+        sut.perform(action=SaveDataAction(), payload=element_sequence())
+        sut.close()
+        sut = DeduplicatingStorage(storage=storage, index_path=Path(tempdir) / "hashes.jsonl", logger=logger_fixture)
+        sut.perform(action=SaveDataAction(), payload=element_sequence())
+        sut.close()
+        assert storage.perform.call_count == 1
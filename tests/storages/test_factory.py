@@ -2,13 +2,66 @@ from unittest.mock import MagicMock
 
 from pytest_mock import MockerFixture
 
-from shushu.settings import LocalFileStorageSettings
+from shushu.settings import (
+    DeduplicationMode,
+    DeduplicationSettings,
+    JsonlSegmentStorageSettings,
+    LocalFileStorageSettings,
+    SegmentCompression,
+    SqliteStorageSettings,
+)
 from shushu.storages.factory import StorageFactory
 
 
 def test_factory_create_local_file_storage(logger_fixture: MagicMock, mocker: MockerFixture) -> None:
-    LocalFileStorage = mocker.patch("shushu.storages.factory.LocalFileStorage")
+    LocalFileStorage = mocker.patch("shushu.storages.local_file.LocalFileStorage")
     settings = LocalFileStorageSettings(path="path")
     actual = StorageFactory(logger=logger_fixture).create(settings=settings)
     assert actual == LocalFileStorage.return_value
-    LocalFileStorage.assert_called_once_with(path=settings.path, logger=logger_fixture)
+    LocalFileStorage.assert_called_once_with(
+        path=settings.path, logger=logger_fixture, buffer_size=0, flush_interval=1.0
+    )
+
+
+def test_factory_create_buffered_local_file_storage(logger_fixture: MagicMock, mocker: MockerFixture) -> None:
+    LocalFileStorage = mocker.patch("shushu.storages.local_file.LocalFileStorage")
+    settings = LocalFileStorageSettings(path="path", buffer_size=100, flush_interval=5.0)
+    StorageFactory(logger=logger_fixture).create(settings=settings)
+    LocalFileStorage.assert_called_once_with(
+        path=settings.path, logger=logger_fixture, buffer_size=100, flush_interval=5.0
+    )
+
+
+def test_factory_create_jsonl_segment_storage(logger_fixture: MagicMock, mocker: MockerFixture) -> None:
+    JsonlSegmentStorage = mocker.patch("shushu.storages.jsonl_segment.JsonlSegmentStorage")
+    settings = JsonlSegmentStorageSettings(path="path", max_segment_size=1024, compression=SegmentCompression.GZIP)
+    actual = StorageFactory(logger=logger_fixture).create(settings=settings)
+    assert actual == JsonlSegmentStorage.return_value
+    JsonlSegmentStorage.assert_called_once_with(
+        path=settings.path, logger=logger_fixture, max_segment_size=1024, compression=SegmentCompression.GZIP
+    )
+
+
+def test_factory_create_sqlite_storage(logger_fixture: MagicMock, mocker: MockerFixture) -> None:
+    SqliteStorage = mocker.patch("shushu.storages.sqlite.SqliteStorage")
+    settings = SqliteStorageSettings(path="data.sqlite3", batch_size=10)
+    actual = StorageFactory(logger=logger_fixture).create(settings=settings)
+    assert actual == SqliteStorage.return_value
+    SqliteStorage.assert_called_once_with(path=settings.path, logger=logger_fixture, batch_size=10)
+
+
+def test_factory_wraps_storage_with_deduplication(logger_fixture: MagicMock, mocker: MockerFixture) -> None:
+    LocalFileStorage = mocker.patch("shushu.storages.local_file.LocalFileStorage")
+    DeduplicatingStorage = mocker.patch("shushu.storages.deduplicating.DeduplicatingStorage")
+    settings = LocalFileStorageSettings(
+        path="path", deduplication=DeduplicationSettings(index_path="hashes.jsonl", mode=DeduplicationMode.UPDATE)
+    )
+    actual = StorageFactory(logger=logger_fixture).create(settings=settings)
+    assert actual == DeduplicatingStorage.return_value
+    assert settings.deduplication is not None
+    DeduplicatingStorage.assert_called_once_with(
+        storage=LocalFileStorage.return_value,
+        index_path=settings.deduplication.index_path,
+        logger=logger_fixture,
+        mode=DeduplicationMode.UPDATE,
+    )
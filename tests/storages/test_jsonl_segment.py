@@ -0,0 +1,77 @@
+import gzip
+import json
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+
+import pytest
+
+from shushu.actions import SaveDataAction
+from shushu.models import BaseDataModel
+from shushu.settings import SegmentCompression
+from shushu.storages.exceptions import DataNotFoundError
+from shushu.storages.jsonl_segment import JsonlSegmentStorage
+from shushu.types import TypeId
+
+TYPE_ID = "01HW5QHEQ53AZ7HNNRM56RKD4P"
+
+
+class SegmentDataModel(BaseDataModel):
+    type_id: TypeId = TypeId(TYPE_ID)
+    some_value: str
+
+
+def _save_all(storage: JsonlSegmentStorage, count: int) -> list[SegmentDataModel]:
+    data = [SegmentDataModel(some_value=f"value-{i:04d}" * 4) for i in range(count)]
+    for datum in data:
+        storage.perform(action=SaveDataAction(), payload=datum)
+    return data
+
+
+def test_jsonl_segment_storage_appends_records_to_one_segment(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        storage = JsonlSegmentStorage(path=Path(tempdir), logger=logger_fixture)
+        data = _save_all(storage, 3)
+        storage.flush()
+        with open(os.path.join(tempdir, TYPE_ID, "segment-000000.jsonl"), "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert [json.loads(line)["some_value"] for line in lines] == [d.some_value for d in data]
+        assert SegmentDataModel.model_validate_json(storage.get_json(TYPE_ID, str(data[1].id))) == data[1]
+        storage.close()
+
+
+def test_jsonl_segment_storage_rotates_and_compresses_segments(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        storage = JsonlSegmentStorage(
+            path=Path(tempdir), logger=logger_fixture, max_segment_size=400, compression=SegmentCompression.GZIP
+        )
+        data = _save_all(storage, 10)
+        names = sorted(os.listdir(os.path.join(tempdir, TYPE_ID)))
+        assert "segment-000000.jsonl.gz" in names
+        assert "segment-000000.jsonl" not in names
+        with gzip.open(os.path.join(tempdir, TYPE_ID, "segment-000000.jsonl.gz"), "rt", encoding="utf-8") as f:
+            assert json.loads(f.readline())["id"] == str(data[0].id)
+        for datum in data:
+            assert SegmentDataModel.model_validate_json(storage.get_json(TYPE_ID, str(datum.id))) == datum
+        storage.close()
+
+
+def test_jsonl_segment_storage_reopens_index_and_active_segment(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        storage = JsonlSegmentStorage(path=Path(tempdir), logger=logger_fixture, max_segment_size=400)
+        first = _save_all(storage, 5)
+        storage.close()
+        reopened = JsonlSegmentStorage(path=Path(tempdir), logger=logger_fixture, max_segment_size=400)
+        second = _save_all(reopened, 5)
+        for datum in first + second:
+            assert SegmentDataModel.model_validate_json(reopened.get_json(TYPE_ID, str(datum.id))) == datum
+        reopened.close()
+
+
+def test_jsonl_segment_storage_raises_error_for_unknown_id(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        storage = JsonlSegmentStorage(path=Path(tempdir), logger=logger_fixture)
+        with pytest.raises(DataNotFoundError):
+            storage.get_json(TYPE_ID, "01HWDAHQ897SHJ888X4GW7PWF5")
+        storage.close()
@@ -3,6 +3,8 @@ from pathlib import Path
 from tempfile import TemporaryDirectory
 from unittest.mock import MagicMock
 
+from pytest_mock import MockerFixture
+
 from shushu.actions import SaveDataAction
 from shushu.models import BaseDataModel
 from shushu.storages.local_file import LocalFileStorage
@@ -21,3 +23,53 @@ def test_local_file_storage_perform_save_data_action(logger_fixture: MagicMock)
         fn = os.listdir(my_data_base_dir)[0]
         with open(os.path.join(my_data_base_dir, fn), "r", encoding="utf-8") as f:
             assert MyDataModel.model_validate_json(f.read()).some_value == 123
+
+
+class BufferedDataModel(BaseDataModel):
+    type_id: TypeId = TypeId("01HW5QHEQ53AZ7HNNRM56RKD4P")
+    some_value: int
+
+
+def test_buffered_local_file_storage_writes_when_buffer_is_full(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        storage = LocalFileStorage(path=Path(tempdir), logger=logger_fixture, buffer_size=3, flush_interval=3600.0)
+        data_dir = os.path.join(tempdir, "01HW5QHEQ53AZ7HNNRM56RKD4P")
+        for value in range(2):
+            storage.perform(action=SaveDataAction(), payload=BufferedDataModel(some_value=value))
+        assert not os.path.exists(data_dir)
+        storage.perform(action=SaveDataAction(), payload=BufferedDataModel(some_value=2))
+        assert len(os.listdir(data_dir)) == 3
+
+
+def test_buffered_local_file_storage_writes_on_flush(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        storage = LocalFileStorage(path=Path(tempdir), logger=logger_fixture, buffer_size=100, flush_interval=3600.0)
+        data = BufferedDataModel(some_value=123)
+        storage.perform(action=SaveDataAction(), payload=data)
+        storage.flush()
+        with open(os.path.join(tempdir, str(data.type_id), f"{data.id}.json"), "r", encoding="utf-8") as f:
+            assert BufferedDataModel.model_validate_json(f.read()) == data
+        storage.flush()
+
+
+def test_buffered_local_file_storage_writes_after_flush_interval(
+    logger_fixture: MagicMock, mocker: MockerFixture
+) -> None:
+    monotonic = mocker.patch("shushu.storages.local_file.monotonic", return_value=100.0)
+    with TemporaryDirectory() as tempdir:
+        storage = LocalFileStorage(path=Path(tempdir), logger=logger_fixture, buffer_size=100, flush_interval=1.0)
+        data_dir = os.path.join(tempdir, "01HW5QHEQ53AZ7HNNRM56RKD4P")
+        storage.perform(action=SaveDataAction(), payload=BufferedDataModel(some_value=1))
+        assert not os.path.exists(data_dir)
+        monotonic.return_value = 101.5
+        storage.perform(action=SaveDataAction(), payload=BufferedDataModel(some_value=2))
+        assert len(os.listdir(data_dir)) == 2
+
+
+def test_local_file_storage_creates_type_directory_once(logger_fixture: MagicMock, mocker: MockerFixture) -> None:
+    with TemporaryDirectory() as tempdir:
+        storage = LocalFileStorage(path=Path(tempdir), logger=logger_fixture)
+        mkdir = mocker.spy(Path, "mkdir")
+        for value in range(3):
+            storage.perform(action=SaveDataAction(), payload=BufferedDataModel(some_value=value))
+        assert mkdir.call_count == 1
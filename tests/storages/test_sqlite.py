@@ -0,0 +1,81 @@
+import sqlite3
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+
+import pytest
+
+from shushu.actions import SaveDataAction
+from shushu.models import BaseDataModel
+from shushu.storages.exceptions import DataNotFoundError
+from shushu.storages.sqlite import SqliteStorage
+from shushu.types import TypeId
+
+TYPE_ID = "01HW5QHEQ53AZ7HNNRM56RKD4P"
+
+
+class SqliteDataModel(BaseDataModel):
+    type_id: TypeId = TypeId(TYPE_ID)
+    some_value: int
+
+
+def _count_rows(path: Path) -> int:
+    with sqlite3.connect(path) as connection:
+        count: int = connection.execute("SELECT COUNT(*) FROM data").fetchone()[0]
+    connection.close()
+    return count
+
+
+def test_sqlite_storage_writes_records_in_batches(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        path = Path(tempdir) / "data.sqlite3"
+        storage = SqliteStorage(path=path, logger=logger_fixture, batch_size=3)
+        data = [SqliteDataModel(some_value=i) for i in range(4)]
+        for datum in data[:2]:
+            storage.perform(action=SaveDataAction(), payload=datum)
+        assert _count_rows(path) == 0
+        storage.perform(action=SaveDataAction(), payload=data[2])
+        assert _count_rows(path) == 3
+        storage.perform(action=SaveDataAction(), payload=data[3])
+        storage.flush()
+        assert _count_rows(path) == 4
+        assert SqliteDataModel.model_validate_json(storage.get_json(TYPE_ID, str(data[3].id))) == data[3]
+        storage.close()
+
+
+def test_sqlite_storage_upserts_records_by_id(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        path = Path(tempdir) / "data.sqlite3"
+        storage = SqliteStorage(path=path, logger=logger_fixture, batch_size=1)
+        datum = SqliteDataModel(some_value=1)
+        storage.perform(action=SaveDataAction(), payload=datum)
+        updated = datum.model_copy(update={"some_value": 2})
+        storage.perform(action=SaveDataAction(), payload=updated)
+        assert SqliteDataModel.model_validate_json(storage.get_json(TYPE_ID, str(datum.id))).some_value == 2
+        assert _count_rows(path) == 1
+        storage.close()
+
+
+def test_sqlite_storage_uses_wal_mode(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        storage = SqliteStorage(path=Path(tempdir) / "data.sqlite3", logger=logger_fixture)
+        assert storage.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        storage.close()
+
+
+def test_sqlite_storage_raises_error_for_unknown_id(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        storage = SqliteStorage(path=Path(tempdir) / "data.sqlite3", logger=logger_fixture)
+        with pytest.raises(DataNotFoundError):
+            storage.get_json(TYPE_ID, "01HWDAHQ897SHJ888X4GW7PWF5")
+        storage.close()
+
+
+def test_sqlite_storage_writes_pending_records_on_close(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        path = Path(tempdir) / "data.sqlite3"
+        storage = SqliteStorage(path=path, logger=logger_fixture, batch_size=100)
+        storage.perform(action=SaveDataAction(), payload=SqliteDataModel(some_value=1))
+        storage.close()
+        storage.close()
+        assert _count_rows(path) == 1
@@ -0,0 +1,315 @@
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from shushu.actions import (
+    DataProcessorCoreAction,
+    MemoryPayload,
+    OpenMemoryUrlCoreAction,
+    OpenUrlAction,
+    PaginateCoreAction,
+    ParallelCoreAction,
+    PythonCodeDataProcessorAction,
+    SaveDataAction,
+    SelectedElementPayload,
+    SequencialCoreAction,
+    StorageCoreAction,
+    StreamCoreAction,
+    WebAgentCoreAction,
+    XPathSelector,
+)
+from shushu.async_core import AsyncShushuCore, gen_async_shushu_core
+from shushu.checkpoints import CheckpointJournal
+from shushu.data_processors.python_code_worker_pool import PythonCodeWorkerPool
+from shushu.models import (
+    BaseDataModel,
+    CompactElementSequence,
+    DataSequence,
+    Element,
+    Url,
+)
+from shushu.settings import CoreSettings
+from shushu.storages.async_base import BaseAsyncStorage, ThreadedAsyncStorage
+from shushu.types import TypeId
+from shushu.web_agents.async_base import BaseAsyncWebAgent, ThreadedAsyncWebAgent
+from shushu.web_agents.selenium_drivers.exceptions import NoElementFoundError
+
+
+class LinkData(BaseDataModel):
+    type_id: TypeId = TypeId("01M57K84NJ5KS5YZ93328T1KPF")
+    link: str
+
+
+class Links(BaseDataModel):
+    type_id: TypeId = TypeId("01M57K84NJ3CSV3N45V2NPWHC5")
+    links: Sequence[LinkData]
+
+
+def _links(count: int) -> Links:
+    return Links(links=[LinkData(link=f"http://example.com/page{i}.html") for i in range(count)])
+
+
+def test_gen_async_shushu_core(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    WebAgentFactory = mocker.patch("shushu.core.WebAgentFactory")
+    StorageFactory = mocker.patch("shushu.core.StorageFactory")
+    settings = CoreSettings()
+
+    actual = gen_async_shushu_core(settings=settings, logger=logger_fixture)
+
+    assert isinstance(actual.web_agent, ThreadedAsyncWebAgent)
+    assert actual.web_agent.web_agent == WebAgentFactory.return_value.create.return_value
+    assert isinstance(actual.storage, ThreadedAsyncStorage)
+    assert actual.storage.storage == StorageFactory.return_value.create.return_value
+    assert isinstance(actual.python_code_worker_pool, PythonCodeWorkerPool)
+    assert actual.web_agent_factory is not None
+    WebAgentFactory.return_value.create.assert_called_once_with(settings=settings.web_agent_settings)
+    StorageFactory.return_value.create.assert_called_once_with(settings=settings.storage_settings)
+
+
+def test_gen_async_shushu_core_closes_web_agent_factory(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    WebAgentFactory = mocker.patch("shushu.core.WebAgentFactory")
+    mocker.patch("shushu.core.StorageFactory")
+    sut = gen_async_shushu_core(settings=CoreSettings(), logger=logger_fixture)
+
+    async def run() -> None:
+        async with sut:
+            WebAgentFactory.return_value.close.assert_not_called()
+
+    asyncio.run(run())
+
+    WebAgentFactory.return_value.close.assert_called_once_with()
+
+
+def test_async_shushu_core_performs_web_agent_and_storage_actions(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    web_agent = mocker.MagicMock(spec=BaseAsyncWebAgent)
+    storage = mocker.MagicMock(spec=BaseAsyncStorage)
+    python_code_worker_pool = mocker.MagicMock(spec=PythonCodeWorkerPool)
+    sut = AsyncShushuCore(
+        web_agent=web_agent, storage=storage, python_code_worker_pool=python_code_worker_pool, logger=logger_fixture
+    )
+    open_url = WebAgentCoreAction(action=OpenUrlAction(url=Url(value="http://example.com")))
+    save = StorageCoreAction(action=SaveDataAction(), payload=MemoryPayload(attribute="links", expand=True))
+
+    async def run() -> None:
+        async with sut:
+            sut.set_memory(_links(2))
+            await sut.perform(SequencialCoreAction(actions=[open_url, save]))
+
+    asyncio.run(run())
+
+    web_agent.__aenter__.assert_awaited_once_with()
+    web_agent.__aexit__.assert_awaited_once_with(None, None, None)
+    web_agent.perform.assert_awaited_once_with(open_url.action)
+    assert [call.kwargs["payload"].link for call in storage.perform.await_args_list] == [
+        "http://example.com/page0.html",
+        "http://example.com/page1.html",
+    ]
+    python_code_worker_pool.close.assert_called_once_with()
+    storage.flush.assert_awaited_once_with()
+
+
+def test_async_shushu_core_performs_data_processor_action(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseAsyncWebAgent)
+    selected_element = Element(url=Url(value="http://example.com"), html_source="<html>aaa</html>")
+    web_agent.get_selected_element.return_value = selected_element
+    storage = mocker.MagicMock(spec=BaseAsyncStorage)
+    DataProcessorFactory = mocker.patch("shushu.core.DataProcessorFactory")
+    data_processor = DataProcessorFactory.return_value.resolve.return_value.return_value
+    sut = AsyncShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    action = DataProcessorCoreAction(
+        action=PythonCodeDataProcessorAction(code="def convert(x): return x"), payload=SelectedElementPayload()
+    )
+
+    asyncio.run(sut.perform(action))
+
+    DataProcessorFactory.assert_called_once_with(
+        logger=logger_fixture, python_code_worker_pool=None, html_parser_type=None
+    )
+    DataProcessorFactory.return_value.resolve.assert_called_once_with(action.action)
+    DataProcessorFactory.return_value.resolve.return_value.assert_called_once_with(selected_element)
+    assert sut.get_memory() == data_processor.perform.return_value
+
+
+def test_async_shushu_core_performs_parallel_action(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseAsyncWebAgent)
+    storage = mocker.MagicMock(spec=BaseAsyncStorage)
+    created_web_agents: list[MagicMock] = []
+    in_flight: list[str] = []
+    max_in_flight: list[int] = []
+
+    async def perform(action: OpenUrlAction) -> None:
+        in_flight.append(str(action.url.value))
+        max_in_flight.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(str(action.url.value))
+
+    def create_web_agent() -> BaseAsyncWebAgent:
+        child_web_agent = mocker.MagicMock(spec=BaseAsyncWebAgent)
+        child_web_agent.__aenter__.return_value = child_web_agent
+        child_web_agent.perform.side_effect = perform
+        created_web_agents.append(child_web_agent)
+        return child_web_agent
+
+    sut = AsyncShushuCore(
+        web_agent=web_agent, storage=storage, logger=logger_fixture, web_agent_factory=create_web_agent
+    )
+    sut.set_memory(_links(8))
+    action = ParallelCoreAction(
+        payload=MemoryPayload(attribute="links"), action=OpenMemoryUrlCoreAction(attribute="link"), max_workers=3
+    )
+
+    async def run() -> None:
+        async with sut:
+            await sut.perform(action)
+            sut.set_memory(_links(8))
+            await sut.perform(action)
+            for created_web_agent in created_web_agents:
+                created_web_agent.__aexit__.assert_not_awaited()
+
+    asyncio.run(run())
+
+    actual = sut.get_memory()
+    assert isinstance(actual, DataSequence)
+    assert [item.link for item in actual.data] == [f"http://example.com/page{i}.html" for i in range(8)]
+    assert len(created_web_agents) == 3
+    assert max(max_in_flight) == 3
+    for created_web_agent in created_web_agents:
+        created_web_agent.__aexit__.assert_awaited_once_with(None, None, None)
+    web_agent.perform.assert_not_called()
+
+
+def test_async_shushu_core_parallel_action_propagates_errors(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseAsyncWebAgent)
+    storage = mocker.MagicMock(spec=BaseAsyncStorage)
+    child_web_agent = mocker.MagicMock(spec=BaseAsyncWebAgent)
+    child_web_agent.__aenter__.return_value = child_web_agent
+    child_web_agent.perform.side_effect = RuntimeError("failed to open")
+    sut = AsyncShushuCore(
+        web_agent=web_agent, storage=storage, logger=logger_fixture, web_agent_factory=lambda: child_web_agent
+    )
+    sut.set_memory(_links(4))
+    action = ParallelCoreAction(
+        payload=MemoryPayload(attribute="links"),
+        action=OpenMemoryUrlCoreAction(attribute="link"),
+        max_workers=2,
+        ordered=False,
+    )
+
+    async def run() -> None:
+        async with sut:
+            await sut.perform(action)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    child_web_agent.__aexit__.assert_awaited_with(None, None, None)
+
+
+def test_async_shushu_core_paginates_until_next_link_is_missing(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    web_agent = mocker.MagicMock(spec=BaseAsyncWebAgent)
+    web_agent.get_selected_element.side_effect = [
+        Element(url=Url(value="http://example.com/index.html"), html_source='<a href="index1.html">next</a>'),
+        NoElementFoundError(),
+    ]
+    storage = mocker.MagicMock(spec=BaseAsyncStorage)
+    sut = AsyncShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    action = PaginateCoreAction(
+        action=StorageCoreAction(action=SaveDataAction()), next_selector=XPathSelector(xpath="//a"), prefetch=True
+    )
+
+    asyncio.run(sut.perform(action))
+
+    assert storage.perform.await_count == 2
+    web_agent.prefetch.assert_awaited_once_with("http://example.com/index1.html")
+    (open_url,) = [call.args[0] for call in web_agent.perform.call_args_list if isinstance(call.args[0], OpenUrlAction)]
+    assert str(open_url.url.value) == "http://example.com/index1.html"
+
+
+def test_async_shushu_core_stops_paginating_at_an_already_visited_page(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    web_agent = mocker.MagicMock(spec=BaseAsyncWebAgent)
+    web_agent.get_selected_element.return_value = Element(
+        url=Url(value="http://example.com/index.html"), html_source='<a href="index.html">next</a>'
+    )
+    storage = mocker.MagicMock(spec=BaseAsyncStorage)
+    sut = AsyncShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    action = PaginateCoreAction(
+        action=StorageCoreAction(action=SaveDataAction()), next_selector=XPathSelector(xpath="//a")
+    )
+
+    asyncio.run(sut.perform(action))
+
+    assert storage.perform.await_count == 1
+    web_agent.perform.assert_awaited_once()
+
+
+def test_async_shushu_core_paginates_every_item_of_a_map_with_a_checkpoint_journal(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    web_agent = mocker.MagicMock(spec=BaseAsyncWebAgent)
+    web_agent.get_selected_element.side_effect = [
+        Element(url=Url(value="http://example.com/page0.html"), html_source='<a href="page0-2.html">next</a>'),
+        NoElementFoundError(),
+        Element(url=Url(value="http://example.com/page1.html"), html_source='<a href="page1-2.html">next</a>'),
+        NoElementFoundError(),
+    ]
+    storage = mocker.MagicMock(spec=BaseAsyncStorage)
+    paginate = PaginateCoreAction(
+        action=StorageCoreAction(action=SaveDataAction()), next_selector=XPathSelector(xpath="//a")
+    )
+    action = ParallelCoreAction(
+        payload=MemoryPayload(attribute="links"),
+        action=SequencialCoreAction(actions=[OpenMemoryUrlCoreAction(attribute="link"), paginate]),
+    )
+    with TemporaryDirectory() as tempdir:
+        journal = CheckpointJournal(path=Path(tempdir) / "checkpoints.log", logger=logger_fixture)
+        sut = AsyncShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture, checkpoint_journal=journal)
+        sut.set_memory(_links(2))
+
+        async def run() -> None:
+            async with sut:
+                await sut.perform(action)
+
+        asyncio.run(run())
+        assert len(journal) == 6
+
+    assert storage.perform.await_count == 4
+
+
+def test_async_shushu_core_streams_compact_chunks_to_storage(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    chunks = [
+        CompactElementSequence.from_html_sources(url=Url(value="http://example.com"), html_sources=["<li>a</li>"]),
+        CompactElementSequence.from_html_sources(url=Url(value="http://example.com"), html_sources=["<li>b</li>"]),
+    ]
+
+    async def iter_selected_elements_compact(chunk_size: int) -> AsyncIterator[CompactElementSequence]:
+        for chunk in chunks:
+            yield chunk
+
+    web_agent = mocker.MagicMock(spec=BaseAsyncWebAgent)
+    web_agent.iter_selected_elements_compact = mocker.MagicMock(side_effect=iter_selected_elements_compact)
+    storage = mocker.MagicMock(spec=BaseAsyncStorage)
+    DataProcessorFactory = mocker.patch("shushu.core.DataProcessorFactory")
+    DataProcessorFactory.return_value.resolve.return_value.return_value.perform.side_effect = [_links(2), _links(1)]
+    sut = AsyncShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    action = StreamCoreAction(
+        action=PythonCodeDataProcessorAction(code="def convert(x):\n    return x"),
+        storage_payload=MemoryPayload(attribute="links", expand=True),
+        chunk_size=1,
+        compact=True,
+    )
+
+    asyncio.run(sut.perform(action))
+
+    web_agent.iter_selected_elements_compact.assert_called_once_with(1)
+    assert [call.args[0] for call in DataProcessorFactory.return_value.resolve.return_value.call_args_list] == chunks
+    assert storage.perform.await_count == 3
@@ -0,0 +1,33 @@
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from benchmarks.end_to_end import run
+from shushu.web_agents.http import HttpWebAgent
+from shushu.web_agents.selenium_drivers.base import BaseSeleniumDriver
+
+
+def _http_backed_driver(mocker: MockerFixture, logger: MagicMock) -> MagicMock:
+    agent = HttpWebAgent(timeout=5.0, max_connections_per_host=2, user_agent="test-agent", logger=logger)
+    agent.__enter__()
+    driver = mocker.MagicMock(spec=BaseSeleniumDriver)
+    driver.perform.side_effect = agent.perform
+    driver.get_selected_element.side_effect = agent.get_selected_element
+    driver.get_selected_elements.side_effect = agent.get_selected_elements
+    driver.quit.side_effect = lambda: agent.__exit__(None, None, None)
+    return driver
+
+
+@pytest.mark.parametrize("agent,max_workers", [("HTTP", 1), ("SELENIUM", 1), ("SELENIUM", 2)])
+def test_end_to_end_benchmark_scrapes_all_detail_pages(
+    mocker: MockerFixture, logger_fixture: MagicMock, agent: str, max_workers: int
+) -> None:
+    SeleniumDriverFactory = mocker.patch("shushu.web_agents.selenium_drivers.pool.SeleniumDriverFactory")
+    SeleniumDriverFactory.return_value.create.side_effect = lambda settings: _http_backed_driver(mocker, logger_fixture)
+    result: dict[str, Any] = run(
+        agent=agent, pages=1, rows_per_page=3, paragraphs_per_detail=2, max_workers=max_workers, python_code_workers=1
+    )
+    assert result["pages_opened"] == 4
+    assert result["stages"]
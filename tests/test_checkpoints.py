@@ -0,0 +1,51 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+
+from shushu.checkpoints import CheckpointJournal
+
+
+def test_checkpoint_journal_resumes_completed_keys(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        path = Path(tempdir) / "checkpoints.log"
+        sut = CheckpointJournal(path=path, logger=logger_fixture)
+        sut.mark_completed("action:a")
+        sut.mark_completed("action:b")
+        sut.close()
+        # an interrupted run leaves a partially written last line
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("action:c")
+
+        resumed = CheckpointJournal(path=path, logger=logger_fixture)
+        assert resumed.is_completed("action:a")
+        assert resumed.is_completed("action:b")
+        assert not resumed.is_completed("action:c")
+        resumed.mark_completed("action:d")
+        resumed.close()
+
+        with open(path, "r", encoding="utf-8") as f:
+            assert f.read() == "action:a\naction:b\naction:d\n"
+
+
+def test_checkpoint_journal_writes_keys_only_on_flush(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        path = Path(tempdir) / "checkpoints.log"
+        sut = CheckpointJournal(path=path, logger=logger_fixture, flush_interval=2)
+        assert not sut.mark_completed("action:a")
+        assert not sut.mark_completed("action:a")
+        assert not path.exists()
+        assert sut.mark_completed("action:b")
+        sut.flush()
+        with open(path, "r", encoding="utf-8") as f:
+            assert f.read() == "action:a\naction:b\n"
+        sut.close()
+
+
+def test_checkpoint_journal_starts_afresh_without_resume(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        path = Path(tempdir) / "checkpoints.log"
+        path.write_text("action:a\n", encoding="utf-8")
+        sut = CheckpointJournal(path=path, logger=logger_fixture, resume=False)
+        assert len(sut) == 0
+        assert not path.exists()
+        sut.close()
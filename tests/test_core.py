@@ -1,15 +1,23 @@
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
 from unittest.mock import MagicMock
 
+import pytest
 from oltl import Id
 from pytest_mock import MockerFixture
 
+import shushu.core
 from shushu.actions import (
     ClickSelectedElementAction,
     DataProcessorCoreAction,
     GenerateIdCoreAction,
     MemoryPayload,
+    OpenMemoryUrlCoreAction,
     OpenUrlAction,
+    PaginateCoreAction,
+    ParallelCoreAction,
     PythonCodeDataProcessorAction,
     SaveDataAction,
     SelectedElementPayload,
@@ -17,17 +25,39 @@ from shushu.actions import (
     SequencialCoreAction,
     SetSelectorAction,
     StorageCoreAction,
+    StreamCoreAction,
     WebAgentCoreAction,
     XPathSelector,
 )
+from shushu.checkpoints import CheckpointJournal
 from shushu.core import ShushuCore, gen_shushu_core
-from shushu.models import BaseDataModel, Element, IdData, Url
-from shushu.settings import CoreSettings
+from shushu.data_processors.python_code_worker_pool import PythonCodeWorkerPool
+from shushu.exceptions import PlanValidationError
+from shushu.models import (
+    BaseDataModel,
+    DataSequence,
+    Element,
+    ElementSequence,
+    IdData,
+    Url,
+    UrlData,
+    get_html_parser_type,
+)
+from shushu.plans import action_checkpoint_prefix, compile_plan
+from shushu.settings import (
+    CheckpointSettings,
+    CoreSettings,
+    PythonCodeWorkerPoolSettings,
+    SeleniumWebAgentSettings,
+)
 from shushu.storages.base import BaseStorage
 from shushu.storages.factory import StorageFactory
-from shushu.types import TypeId
+from shushu.tracing import Tracer
+from shushu.types import HtmlParserType, PaginationMode, TypeId
 from shushu.web_agents.base import BaseWebAgent
 from shushu.web_agents.factory import WebAgentFactory
+from shushu.web_agents.selenium_drivers.base import BaseSeleniumDriver
+from shushu.web_agents.selenium_drivers.exceptions import NoElementFoundError
 
 
 def test_gen_shushu_core(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
@@ -49,6 +79,86 @@ def test_gen_shushu_core(mocker: MockerFixture, logger_fixture: MagicMock) -> No
     WebAgentFactoryClass.assert_called_once_with(logger=logger_fixture)
     storage_factory.create.assert_called_once_with(settings=settings.storage_settings)
     StorageFactoryClass.assert_called_once_with(logger=logger_fixture)
+    assert actual.web_agent_factory is not None
+    web_agent_factory.create.reset_mock()
+    assert actual.web_agent_factory() == web_agent
+    web_agent_factory.create.assert_called_once_with(settings=settings.web_agent_settings)
+
+
+def test_gen_shushu_core_creates_python_code_worker_pool(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    mocker.patch("shushu.core.WebAgentFactory")
+    mocker.patch("shushu.core.StorageFactory")
+    PythonCodeWorkerPool = mocker.patch("shushu.data_processors.python_code_worker_pool.PythonCodeWorkerPool")
+    settings = CoreSettings(
+        python_code_worker_pool_settings=PythonCodeWorkerPoolSettings(size=3, max_tasks_per_worker=5)
+    )
+    actual = gen_shushu_core(settings=settings, logger=logger_fixture)
+    assert actual.python_code_worker_pool == PythonCodeWorkerPool.return_value
+    PythonCodeWorkerPool.assert_called_once_with(
+        size=3, max_tasks_per_worker=5, logger=logger_fixture, html_parser_type=HtmlParserType.HTML_PARSER
+    )
+
+
+def test_gen_shushu_core_keeps_the_html_parser_to_itself(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    mocker.patch("shushu.core.WebAgentFactory")
+    mocker.patch("shushu.core.StorageFactory")
+    cores = [
+        gen_shushu_core(settings=CoreSettings(html_parser_type=html_parser_type), logger=logger_fixture)
+        for html_parser_type in [HtmlParserType.LXML, HtmlParserType.HTML_PARSER]
+    ]
+    assert [core.html_parser_type for core in cores] == [HtmlParserType.LXML, HtmlParserType.HTML_PARSER]
+    assert get_html_parser_type() == HtmlParserType.HTML_PARSER
+
+
+def test_gen_shushu_core_without_python_code_worker_pool(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    mocker.patch("shushu.core.WebAgentFactory")
+    mocker.patch("shushu.core.StorageFactory")
+    PythonCodeWorkerPool = mocker.patch("shushu.data_processors.python_code_worker_pool.PythonCodeWorkerPool")
+    settings = CoreSettings(python_code_worker_pool_settings=PythonCodeWorkerPoolSettings(size=0))
+    actual = gen_shushu_core(settings=settings, logger=logger_fixture)
+    assert actual.python_code_worker_pool is None
+    PythonCodeWorkerPool.assert_not_called()
+
+
+def test_shushu_core_closes_python_code_worker_pool_on_exit(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    storage = mocker.MagicMock(spec=BaseStorage)
+    python_code_worker_pool = mocker.MagicMock(spec=PythonCodeWorkerPool)
+    sut = ShushuCore(
+        web_agent=web_agent, storage=storage, python_code_worker_pool=python_code_worker_pool, logger=logger_fixture
+    )
+    with sut:
+        python_code_worker_pool.close.assert_not_called()
+    python_code_worker_pool.close.assert_called_once_with()
+
+
+def test_shushu_core_calls_closers_on_exit(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    storage = mocker.MagicMock(spec=BaseStorage)
+    closer = mocker.MagicMock()
+    closer.side_effect = lambda: web_agent.__exit__.assert_called_once_with(None, None, None)
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture, closers=[closer])
+    with sut:
+        closer.assert_not_called()
+    closer.assert_called_once_with()
+
+
+def test_gen_shushu_core_closes_web_agent_factory(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    WebAgentFactory = mocker.patch("shushu.core.WebAgentFactory")
+    mocker.patch("shushu.core.StorageFactory")
+    settings = CoreSettings(python_code_worker_pool_settings=PythonCodeWorkerPoolSettings(size=0))
+    with gen_shushu_core(settings=settings, logger=logger_fixture):
+        WebAgentFactory.return_value.close.assert_not_called()
+    WebAgentFactory.return_value.close.assert_called_once_with()
+
+
+def test_shushu_core_flushes_storage_on_exit(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    storage = mocker.MagicMock(spec=BaseStorage)
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    with sut:
+        storage.flush.assert_not_called()
+    storage.flush.assert_called_once_with()
 
 
 def test_shushu_core_performs_web_agent_action(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
@@ -159,10 +269,13 @@ def convert(x: Url) -> Data:
 
     web_agent.perform.assert_not_called()
     storage.perform.assert_not_called()
-    data_processor_factory.create.assert_called_once_with(action=action.action, payload=some_data)
-    DataProcessorFactory.assert_called_once_with(logger=logger_fixture)
-    assert sut.get_memory() == data_processor_factory.create.return_value.perform.return_value
-    data_processor_factory.create.return_value.perform.assert_called_once_with()
+    data_processor_factory.resolve.assert_called_once_with(action.action)
+    data_processor_factory.resolve.return_value.assert_called_once_with(some_data)
+    DataProcessorFactory.assert_called_once_with(
+        logger=logger_fixture, python_code_worker_pool=None, html_parser_type=None
+    )
+    assert sut.get_memory() == data_processor_factory.resolve.return_value.return_value.perform.return_value
+    data_processor_factory.resolve.return_value.return_value.perform.assert_called_once_with()
 
 
 def test_shushu_core_performs_data_processor_action_selected_element_payload(
@@ -191,10 +304,13 @@ def convert(x: Element) -> Data:
 
     web_agent.perform.assert_not_called()
     storage.perform.assert_not_called()
-    data_processor_factory.create.assert_called_once_with(action=action.action, payload=selected_element)
-    DataProcessorFactory.assert_called_once_with(logger=logger_fixture)
-    assert sut.get_memory() == data_processor_factory.create.return_value.perform.return_value
-    data_processor_factory.create.return_value.perform.assert_called_once_with()
+    data_processor_factory.resolve.assert_called_once_with(action.action)
+    data_processor_factory.resolve.return_value.assert_called_once_with(selected_element)
+    DataProcessorFactory.assert_called_once_with(
+        logger=logger_fixture, python_code_worker_pool=None, html_parser_type=None
+    )
+    assert sut.get_memory() == data_processor_factory.resolve.return_value.return_value.perform.return_value
+    data_processor_factory.resolve.return_value.return_value.perform.assert_called_once_with()
     web_agent.get_selected_element.assert_called_once_with()
 
 
@@ -227,13 +343,46 @@ def convert(x: list[Element]) -> Data:
 
     web_agent.perform.assert_not_called()
     storage.perform.assert_not_called()
-    data_processor_factory.create.assert_called_once_with(action=action.action, payload=selected_elements)
-    DataProcessorFactory.assert_called_once_with(logger=logger_fixture)
-    assert sut.get_memory() == data_processor_factory.create.return_value.perform.return_value
-    data_processor_factory.create.return_value.perform.assert_called_once_with()
+    data_processor_factory.resolve.assert_called_once_with(action.action)
+    data_processor_factory.resolve.return_value.assert_called_once_with(selected_elements)
+    DataProcessorFactory.assert_called_once_with(
+        logger=logger_fixture, python_code_worker_pool=None, html_parser_type=None
+    )
+    assert sut.get_memory() == data_processor_factory.resolve.return_value.return_value.perform.return_value
+    data_processor_factory.resolve.return_value.return_value.perform.assert_called_once_with()
     web_agent.get_selected_elements.assert_called_once_with()
 
 
+def test_shushu_core_performs_data_processor_action_compact_selected_elements_payload(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    storage = mocker.MagicMock(spec=BaseStorage)
+    DataProcessorFactory = mocker.patch("shushu.core.DataProcessorFactory")
+    data_processor_factory = DataProcessorFactory.return_value
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    action = DataProcessorCoreAction(
+        action=PythonCodeDataProcessorAction(
+            code="""
+from shushu.models import CompactElementSequence, BaseDataModel
+class Data(BaseDataModel):
+    texts: list[str]
+def convert(x: CompactElementSequence) -> Data:
+    return Data(texts=[d.text for d in x.elements])
+"""
+        ),
+        payload=SelectedElementsPayload(compact=True),
+    )
+    sut.perform(action)
+
+    web_agent.get_selected_elements.assert_not_called()
+    web_agent.get_selected_elements_compact.assert_called_once_with()
+    data_processor_factory.resolve.assert_called_once_with(action.action)
+    data_processor_factory.resolve.return_value.assert_called_once_with(
+        web_agent.get_selected_elements_compact.return_value
+    )
+
+
 def test_shushu_core_performs_generate_id_action(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
     web_agent = mocker.MagicMock(spec=BaseWebAgent)
     storage = mocker.MagicMock(spec=BaseStorage)
@@ -266,3 +415,469 @@ def test_shushu_core_performs_sequential_core_actions(mocker: MockerFixture, log
         web_agent.__enter__.assert_called_once_with()
         web_agent.__exit__.assert_not_called()
     web_agent.__exit__.assert_called_once_with(None, None, None)
+
+
+class LinkData(BaseDataModel):
+    type_id: TypeId = TypeId("01M57K84NJ5KS5YZ93328T1KPF")
+    link: str
+
+
+def test_shushu_core_performs_open_memory_url_action(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    storage = mocker.MagicMock(spec=BaseStorage)
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    sut.set_memory(LinkData(link="http://example.com/page0.html"))
+    sut.perform(OpenMemoryUrlCoreAction(attribute="link"))
+    (action,), _ = web_agent.perform.call_args
+    assert isinstance(action, OpenUrlAction)
+    assert str(action.url.value) == "http://example.com/page0.html"
+
+
+def test_shushu_core_opens_url_data_memory(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    storage = mocker.MagicMock(spec=BaseStorage)
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    sut.set_memory(UrlData(url=Url(value="http://example.com/page0.html")))
+    sut.perform(OpenMemoryUrlCoreAction())
+    (action,), _ = web_agent.perform.call_args
+    assert str(action.url.value) == "http://example.com/page0.html"
+
+
+def _links(count: int) -> BaseDataModel:
+    class Links(BaseDataModel):
+        type_id: TypeId = TypeId("01M57K84NJ3CSV3N45V2NPWHC5")
+        links: Sequence[LinkData]
+
+    return Links(links=[LinkData(link=f"http://example.com/page{i}.html") for i in range(count)])
+
+
+def test_shushu_core_performs_parallel_action_with_own_web_agents(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    storage = mocker.MagicMock(spec=BaseStorage)
+    created_web_agents: list[MagicMock] = []
+
+    def create_web_agent() -> BaseWebAgent:
+        child_web_agent = mocker.MagicMock(spec=BaseWebAgent)
+        child_web_agent.__enter__.return_value = child_web_agent
+        created_web_agents.append(child_web_agent)
+        return child_web_agent
+
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture, web_agent_factory=create_web_agent)
+    sut.set_memory(_links(10))
+    action = ParallelCoreAction(
+        payload=MemoryPayload(attribute="links"),
+        action=SequencialCoreAction(
+            actions=[
+                OpenMemoryUrlCoreAction(attribute="link"),
+                StorageCoreAction(action=SaveDataAction(), payload=MemoryPayload()),
+            ]
+        ),
+        max_workers=3,
+    )
+    with sut:
+        sut.perform(action)
+        sut.set_memory(_links(10))
+        sut.perform(action)
+        for created_web_agent in created_web_agents:
+            created_web_agent.__exit__.assert_not_called()
+
+    actual = sut.get_memory()
+    assert isinstance(actual, DataSequence)
+    assert [item.link for item in actual.data] == [f"http://example.com/page{i}.html" for i in range(10)]
+    web_agent.perform.assert_not_called()
+    assert 1 <= len(created_web_agents) <= 3
+    opened = sorted(
+        str(call.args[0].url.value) for agent in created_web_agents for call in agent.perform.call_args_list
+    )
+    assert opened == sorted(f"http://example.com/page{i}.html" for i in range(10) for _ in range(2))
+    for created_web_agent in created_web_agents:
+        created_web_agent.__enter__.assert_called_once_with()
+        created_web_agent.__exit__.assert_called_once_with(None, None, None)
+    assert storage.perform.call_count == 20
+
+
+def test_shushu_core_performs_parallel_action_serially_without_web_agent_factory(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    storage = mocker.MagicMock(spec=BaseStorage)
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    sut.set_memory(_links(3))
+    sut.perform(
+        ParallelCoreAction(
+            payload=MemoryPayload(attribute="links"), action=OpenMemoryUrlCoreAction(attribute="link"), ordered=False
+        )
+    )
+    assert [str(call.args[0].url.value) for call in web_agent.perform.call_args_list] == [
+        f"http://example.com/page{i}.html" for i in range(3)
+    ]
+    actual = sut.get_memory()
+    assert isinstance(actual, DataSequence)
+    assert len(actual.data) == 3
+
+
+@pytest.mark.parametrize("driver_pool_size", [1, 2])
+def test_shushu_core_parallel_action_does_not_wait_for_drivers_held_by_workers(
+    mocker: MockerFixture, logger_fixture: MagicMock, driver_pool_size: int
+) -> None:
+    SeleniumDriverFactory = mocker.patch("shushu.web_agents.selenium_drivers.pool.SeleniumDriverFactory")
+    SeleniumDriverFactory.return_value.create.side_effect = lambda settings: mocker.MagicMock(spec=BaseSeleniumDriver)
+    mocker.patch("shushu.core.StorageFactory")
+    settings = CoreSettings(
+        web_agent_settings=SeleniumWebAgentSettings(driver_pool_size=driver_pool_size),
+        python_code_worker_pool_settings=PythonCodeWorkerPoolSettings(size=0),
+    )
+    results: list[list[BaseDataModel]] = []
+
+    def run() -> None:
+        with gen_shushu_core(settings=settings, logger=logger_fixture) as sut:
+            results.append(
+                sut.map(
+                    action=OpenMemoryUrlCoreAction(attribute="link"),
+                    items=[LinkData(link=f"http://example.com/page{i}.html") for i in range(4)],
+                    max_workers=2,
+                )
+            )
+
+    thread = Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert [len(result) for result in results] == [4]
+    assert SeleniumDriverFactory.return_value.create.call_count == driver_pool_size
+
+
+def test_shushu_core_parallel_action_propagates_errors(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    storage = mocker.MagicMock(spec=BaseStorage)
+    child_web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    child_web_agent.__enter__.return_value = child_web_agent
+    child_web_agent.perform.side_effect = RuntimeError("failed to open")
+    sut = ShushuCore(
+        web_agent=web_agent, storage=storage, logger=logger_fixture, web_agent_factory=lambda: child_web_agent
+    )
+    sut.set_memory(_links(4))
+    with pytest.raises(RuntimeError):
+        with sut:
+            sut.perform(
+                ParallelCoreAction(
+                    payload=MemoryPayload(attribute="links"),
+                    action=OpenMemoryUrlCoreAction(attribute="link"),
+                    max_workers=2,
+                )
+            )
+    child_web_agent.__exit__.assert_called_with(None, None, None)
+
+
+def test_shushu_core_map_passes_failed_items_to_on_error(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    child_web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    child_web_agent.__enter__.return_value = child_web_agent
+    error = RuntimeError("failed to open")
+
+    def perform(action: OpenUrlAction) -> None:
+        if str(action.url.value).endswith("page1.html"):
+            raise error
+
+    web_agent.perform.side_effect = perform
+    child_web_agent.perform.side_effect = perform
+    sut = ShushuCore(
+        web_agent=web_agent,
+        storage=mocker.MagicMock(spec=BaseStorage),
+        logger=logger_fixture,
+        web_agent_factory=lambda: child_web_agent,
+    )
+    items = [LinkData(link=f"http://example.com/page{i}.html") for i in range(4)]
+    failures: list[tuple[BaseDataModel, Exception]] = []
+    with sut:
+        actual = sut.map(
+            action=OpenMemoryUrlCoreAction(attribute="link"),
+            items=items,
+            max_workers=2,
+            on_error=lambda item, e: failures.append((item, e)),
+            use_own_web_agent=True,
+        )
+    assert actual == [items[0], items[2], items[3]]
+    assert failures == [(items[1], error)]
+
+
+def test_shushu_core_parallel_action_rejects_non_data_model_items(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    storage = mocker.MagicMock(spec=BaseStorage)
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    sut.set_memory(LinkData(link="http://example.com/"))
+    with pytest.raises(TypeError):
+        sut.perform(
+            ParallelCoreAction(
+                payload=MemoryPayload(attribute="link"), action=OpenMemoryUrlCoreAction(attribute="link")
+            )
+        )
+
+
+def test_shushu_core_validates_plan_before_performing_actions(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    storage = mocker.MagicMock(spec=BaseStorage)
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    action = SequencialCoreAction(
+        actions=[
+            WebAgentCoreAction(action=OpenUrlAction(url=Url(value="http://localhost:8080/"))),
+            StorageCoreAction(action=SaveDataAction(), payload=SelectedElementPayload()),
+        ]
+    )
+    with pytest.raises(PlanValidationError):
+        sut.perform(action)
+    web_agent.perform.assert_not_called()
+
+
+def test_shushu_core_runs_compiled_plan_for_each_item(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    storage = mocker.MagicMock(spec=BaseStorage)
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    plan = compile_plan(StorageCoreAction(action=SaveDataAction(), payload=MemoryPayload()))
+    items = [IdData(value=Id.generate()) for _ in range(3)]
+    compile_plan_spy = mocker.spy(shushu.core, "compile_plan")
+
+    assert sut.map(action=plan, items=items) == items
+
+    compile_plan_spy.assert_not_called()
+    assert [call.kwargs["payload"] for call in storage.perform.call_args_list] == items
+
+
+def test_shushu_core_traces_actions(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    storage = mocker.MagicMock(spec=BaseStorage)
+    tracer = Tracer(logger=logger_fixture, trace_path=Path("unused.json"), log_spans=False)
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture, tracer=tracer)
+    open_url = WebAgentCoreAction(action=OpenUrlAction(url=Url(value="http://localhost:8080/")))
+    save = StorageCoreAction(action=SaveDataAction(), payload=MemoryPayload())
+    sut.set_memory(IdData(value=Id.generate()))
+
+    sut.perform(SequencialCoreAction(actions=[open_url, save]))
+
+    assert [(r.name, r.category, r.attributes.get("action_id")) for r in tracer.records] == [
+        ("OPEN_URL", "web_agent", str(open_url.action.id)),
+        ("WebAgentStep", "core", str(open_url.id)),
+        ("SAVE_DATA", "storage", str(save.action.id)),
+        ("StorageStep", "core", str(save.id)),
+    ]
+    assert tracer.records[2].attributes["payload_size"] == len(sut.get_memory().model_dump_json())
+
+
+def test_shushu_core_streams_chunks_to_storage(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    events: list[str] = []
+    chunks = [
+        ElementSequence(elements=[Element(url=Url(value="http://example.com"), html_source=f"<li>{i}</li>")])
+        for i in range(2)
+    ]
+
+    def iter_selected_elements(chunk_size: int) -> Iterator[ElementSequence]:
+        for chunk in chunks:
+            events.append("read")
+            yield chunk
+
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    web_agent.iter_selected_elements.side_effect = iter_selected_elements
+    storage = mocker.MagicMock(spec=BaseStorage)
+    storage.perform.side_effect = lambda action, payload: events.append("save")
+    DataProcessorFactory = mocker.patch("shushu.core.DataProcessorFactory")
+    data_processor_factory = DataProcessorFactory.return_value
+    results = [_links(2), _links(1)]
+    data_processor_factory.resolve.return_value.return_value.perform.side_effect = results
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    action = StreamCoreAction(
+        action=PythonCodeDataProcessorAction(code="def convert(x):\n    return x"),
+        storage_payload=MemoryPayload(attribute="links", expand=True),
+        chunk_size=50,
+    )
+
+    sut.perform(action)
+
+    web_agent.iter_selected_elements.assert_called_once_with(50)
+    web_agent.get_selected_elements.assert_not_called()
+    data_processor_factory.resolve.assert_called_once_with(action.action)
+    assert [call.args[0] for call in data_processor_factory.resolve.return_value.call_args_list] == chunks
+    assert events == ["read", "save", "save", "read", "save"]
+    assert sut.get_memory() == results[1]
+
+
+def _next_link(url: str, href: str) -> Element:
+    return Element(url=Url(value=url), html_source=f'<a class="next" href="{href}">next</a>')
+
+
+def test_shushu_core_paginates_until_next_link_is_missing(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    web_agent.get_selected_element.side_effect = [
+        _next_link("http://example.com/list/index.html", "index1.html"),
+        _next_link("http://example.com/list/index1.html", "/list/index2.html"),
+        NoElementFoundError(),
+    ]
+    storage = mocker.MagicMock(spec=BaseStorage)
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    save = StorageCoreAction(action=SaveDataAction())
+    action = PaginateCoreAction(action=save, next_selector=XPathSelector(xpath="//a[@class='next']"), prefetch=True)
+
+    sut.perform(action)
+
+    assert storage.perform.call_count == 3
+    opened_urls = [
+        str(call.args[0].url.value)
+        for call in web_agent.perform.call_args_list
+        if isinstance(call.args[0], OpenUrlAction)
+    ]
+    expected_urls = ["http://example.com/list/index1.html", "http://example.com/list/index2.html"]
+    assert opened_urls == expected_urls
+    assert [call.args[0] for call in web_agent.prefetch.call_args_list] == expected_urls
+
+
+@pytest.mark.parametrize(
+    "next_links",
+    [
+        [_next_link("http://example.com/list/index.html", "#")],
+        [
+            _next_link("http://example.com/list/index.html", "index1.html"),
+            _next_link("http://example.com/list/index1.html", "index.html#top"),
+        ],
+    ],
+)
+def test_shushu_core_stops_paginating_at_an_already_visited_page(
+    mocker: MockerFixture, logger_fixture: MagicMock, next_links: list[Element]
+) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    web_agent.get_selected_element.side_effect = next_links
+    storage = mocker.MagicMock(spec=BaseStorage)
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    action = PaginateCoreAction(
+        action=StorageCoreAction(action=SaveDataAction()), next_selector=XPathSelector(xpath="//a[@class='next']")
+    )
+
+    sut.perform(action)
+
+    assert storage.perform.call_count == len(next_links)
+    assert "Next page was already visited." in [call.args[0] for call in logger_fixture.warning.call_args_list]
+
+
+def test_shushu_core_paginates_by_clicking_up_to_max_pages(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    web_agent.get_selected_element.return_value = _next_link("http://example.com/list/index.html", "#")
+    storage = mocker.MagicMock(spec=BaseStorage)
+    sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture)
+    action = PaginateCoreAction(
+        action=StorageCoreAction(action=SaveDataAction()),
+        next_selector=XPathSelector(xpath="//a[@class='next']"),
+        mode=PaginationMode.CLICK,
+        max_pages=2,
+    )
+
+    sut.perform(action)
+
+    assert storage.perform.call_count == 2
+    web_agent.get_selected_element.assert_called_once_with()
+    actions = [call.args[0] for call in web_agent.perform.call_args_list]
+    assert [type(a) for a in actions] == [SetSelectorAction, SetSelectorAction, ClickSelectedElementAction]
+    web_agent.prefetch.assert_not_called()
+
+
+def _build_parallel_crawl() -> ParallelCoreAction:
+    return ParallelCoreAction(
+        payload=MemoryPayload(attribute="links"), action=OpenMemoryUrlCoreAction(attribute="link")
+    )
+
+
+def test_shushu_core_skips_items_completed_before_a_restart(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    storage = mocker.MagicMock(spec=BaseStorage)
+    with TemporaryDirectory() as tempdir:
+        checkpoint_path = Path(tempdir) / "checkpoints.log"
+        crashing_web_agent = mocker.MagicMock(spec=BaseWebAgent)
+        crashing_web_agent.perform.side_effect = [None, None, RuntimeError("crashed")]
+        journal = CheckpointJournal(path=checkpoint_path, logger=logger_fixture)
+        crashed = ShushuCore(
+            web_agent=crashing_web_agent, storage=storage, logger=logger_fixture, checkpoint_journal=journal
+        )
+        crashed.set_memory(_links(4))
+        with pytest.raises(RuntimeError):
+            with crashed:
+                crashed.perform(_build_parallel_crawl())
+
+        web_agent = mocker.MagicMock(spec=BaseWebAgent)
+        journal = CheckpointJournal(path=checkpoint_path, logger=logger_fixture)
+        sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture, checkpoint_journal=journal)
+        sut.set_memory(_links(4))
+        with sut:
+            sut.perform(_build_parallel_crawl())
+
+    opened_urls = [str(call.args[0].url.value) for call in web_agent.perform.call_args_list]
+    assert opened_urls == ["http://example.com/page2.html", "http://example.com/page3.html"]
+    actual = sut.get_memory()
+    assert isinstance(actual, DataSequence)
+    assert [item.link for item in actual.data] == opened_urls
+
+
+def test_shushu_core_skips_pages_completed_before_a_restart(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    web_agent.get_selected_element.side_effect = [
+        _next_link("http://example.com/list/index.html", "index1.html"),
+        NoElementFoundError(),
+    ]
+    storage = mocker.MagicMock(spec=BaseStorage)
+    action = PaginateCoreAction(
+        action=StorageCoreAction(action=SaveDataAction()), next_selector=XPathSelector(xpath="//a[@class='next']")
+    )
+    interrupted = PaginateCoreAction(
+        action=StorageCoreAction(action=SaveDataAction()), next_selector=XPathSelector(xpath="//a[@class='next']")
+    )
+    prefix = action_checkpoint_prefix(interrupted)
+    with TemporaryDirectory() as tempdir:
+        checkpoint_path = Path(tempdir) / "checkpoints.log"
+        checkpoint_path.write_text(f"{prefix}:page:1\n", encoding="utf-8")
+        journal = CheckpointJournal(path=checkpoint_path, logger=logger_fixture)
+        sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture, checkpoint_journal=journal)
+        with sut:
+            sut.perform(action)
+        assert checkpoint_path.read_text(encoding="utf-8") == f"{prefix}:page:1\n{prefix}:page:2\n"
+    storage.perform.assert_called_once_with(action=action.action.action)
+
+
+def test_shushu_core_paginates_every_item_of_a_map_with_a_checkpoint_journal(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    web_agent.get_selected_element.side_effect = [
+        _next_link("http://example.com/page0.html", "page0-2.html"),
+        NoElementFoundError(),
+        _next_link("http://example.com/page1.html", "page1-2.html"),
+        NoElementFoundError(),
+    ]
+    storage = mocker.MagicMock(spec=BaseStorage)
+    paginate = PaginateCoreAction(
+        action=StorageCoreAction(action=SaveDataAction()), next_selector=XPathSelector(xpath="//a[@class='next']")
+    )
+    action = ParallelCoreAction(
+        payload=MemoryPayload(attribute="links"),
+        action=SequencialCoreAction(actions=[OpenMemoryUrlCoreAction(attribute="link"), paginate]),
+    )
+    with TemporaryDirectory() as tempdir:
+        journal = CheckpointJournal(path=Path(tempdir) / "checkpoints.log", logger=logger_fixture)
+        sut = ShushuCore(web_agent=web_agent, storage=storage, logger=logger_fixture, checkpoint_journal=journal)
+        sut.set_memory(_links(2))
+        with sut:
+            sut.perform(action)
+        assert len(journal) == 6
+
+    assert storage.perform.call_count == 4
+
+
+def test_gen_shushu_core_creates_checkpoint_journal(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    mocker.patch("shushu.core.WebAgentFactory")
+    mocker.patch("shushu.core.StorageFactory")
+    CheckpointJournal = mocker.patch("shushu.core.CheckpointJournal")
+    settings = CoreSettings(checkpoint_settings=CheckpointSettings(path="checkpoints.log", resume=False))
+    actual = gen_shushu_core(settings=settings, logger=logger_fixture)
+    assert actual.checkpoint_journal == CheckpointJournal.return_value
+    CheckpointJournal.assert_called_once_with(
+        path=Path("checkpoints.log"), logger=logger_fixture, resume=False, flush_interval=100
+    )
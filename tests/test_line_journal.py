@@ -0,0 +1,45 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from shushu.line_journal import LineJournal
+
+
+def test_line_journal_writes_lines_only_on_flush() -> None:
+    with TemporaryDirectory() as tempdir:
+        path = Path(tempdir) / "journal.log"
+        sut = LineJournal(path)
+        sut.append("a")
+        sut.append("b")
+        assert sut.pending_count == 2
+        assert not path.exists()
+        sut.flush()
+        assert sut.pending_count == 0
+        sut.append("c")
+        sut.close()
+        assert path.read_text(encoding="utf-8") == "a\nb\n"
+
+
+@pytest.mark.parametrize("partial_line", ["c", "c" * 10000])
+def test_line_journal_cuts_off_a_partially_written_last_line(partial_line: str) -> None:
+    with TemporaryDirectory() as tempdir:
+        path = Path(tempdir) / "journal.log"
+        path.write_text(f"a\nb\n{partial_line}", encoding="utf-8")
+        sut = LineJournal(path)
+        assert list(sut.read_lines()) == ["a", "b"]
+        sut.append("d")
+        sut.flush()
+        sut.close()
+        assert list(LineJournal(path).read_lines()) == ["a", "b", "d"]
+
+
+def test_line_journal_cuts_off_a_journal_without_complete_lines() -> None:
+    with TemporaryDirectory() as tempdir:
+        path = Path(tempdir) / "journal.log"
+        path.write_text("a", encoding="utf-8")
+        sut = LineJournal(path)
+        sut.append("b")
+        sut.flush()
+        sut.close()
+        assert path.read_text(encoding="utf-8") == "b\n"
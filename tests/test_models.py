@@ -0,0 +1,115 @@
+import pytest
+from pydantic import ValidationError
+
+import shushu.models
+from shushu.models import (
+    CompactElementSequence,
+    Element,
+    ElementSequence,
+    Url,
+    get_html_parser_type,
+)
+from shushu.types import ClassSet, ClassString, HtmlParserType, TagString
+
+LIST_ITEM_SOURCE = """\
+<li class="list-item first-item">
+    <a href="page0.html">始まりの村</a><!-- note --><script>var x = 1;</script> <p>日付: 2024-03-31</p>
+</li>"""
+
+
+@pytest.mark.parametrize("html_parser_type", list(HtmlParserType))
+def test_element_is_inspected_alike_by_every_html_parser(
+    html_parser_type: HtmlParserType, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(shushu.models, "_html_parser_type", html_parser_type)
+    sut = Element(url=Url(value="http://localhost:8080/"), html_source=LIST_ITEM_SOURCE)
+    assert get_html_parser_type() == html_parser_type
+    assert sut.classes == ClassSet([ClassString("list-item"), ClassString("first-item")])
+    assert sut.tag_name == TagString("li")
+    assert sut.text == "\n始まりの村 日付: 2024-03-31\n"
+    assert sut.get_attribute("class") == "list-item first-item"
+    assert sut.get_attribute("href") is None
+
+
+@pytest.mark.parametrize("html_parser_type", list(HtmlParserType))
+@pytest.mark.parametrize(
+    "html_source,tag_name,text,classes",
+    [
+        ("<body class=k>x</body>", "body", "x", ["k"]),
+        ("<!DOCTYPE html><html><head><title>t</title></head><body>x</body></html>", "html", "tx", []),
+        ("<p class=a>a</p><p class=b>b</p>", "p", "a", ["a"]),
+        ("leading <b>x</b>", "b", "x", []),
+        ("only text", None, "", []),
+    ],
+)
+def test_element_root_is_the_first_element_for_every_html_parser(
+    html_parser_type: HtmlParserType,
+    html_source: str,
+    tag_name: str | None,
+    text: str,
+    classes: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(shushu.models, "_html_parser_type", html_parser_type)
+    sut = Element(url=Url(value="http://localhost:8080/"), html_source=html_source)
+    assert sut.tag_name == (None if tag_name is None else TagString(tag_name))
+    assert sut.text == text
+    assert sut.classes == ClassSet([ClassString(c) for c in classes])
+
+
+def test_lxml_root_of_unparsable_source_is_none(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(shushu.models, "_html_parser_type", HtmlParserType.LXML)
+    sut = Element(url=Url(value="http://localhost:8080/"), html_source="<!-- only a comment -->")
+    assert sut.lxml_root is None
+    assert sut.tag_name is None
+    assert sut.text == ""
+
+
+def _list_item_sources(count: int) -> list[str]:
+    return [f'<li class="list-item"><a href="page{i}.html">記事 {i}</a></li>' for i in range(count)]
+
+
+def test_compact_element_sequence_is_smaller_than_element_sequence() -> None:
+    url = Url(value="http://localhost:8080/")
+    element_sequence = ElementSequence(elements=[Element(url=url, html_source=s) for s in _list_item_sources(100)])
+    sut = CompactElementSequence.from_element_sequence(element_sequence)
+    restored = CompactElementSequence.model_validate_json(sut.model_dump_json())
+    assert len(sut.model_dump_json()) * 2 < len(element_sequence.model_dump_json())
+    assert len(restored.elements) == 100
+    assert [str(e.html_source) for e in restored.elements] == _list_item_sources(100)
+    assert [e.text for e in restored.to_element_sequence().elements] == [e.text for e in element_sequence.elements]
+    assert restored.elements[-1].url == url
+    assert [e.text for e in restored.elements[1:3]] == ["記事 1", "記事 2"]
+    with pytest.raises(IndexError):
+        restored.elements[100]
+
+
+def test_compact_element_sequence_returns_the_same_element_on_every_access() -> None:
+    sut = CompactElementSequence.from_html_sources(
+        url=Url(value="http://localhost:8080/"), html_sources=_list_item_sources(3)
+    )
+    first = sut.elements[0]
+    assert sut.elements[0].id == first.id
+    assert sut.elements[-3] == first
+    assert [e.id for e in sut.elements[0:2]] == [e.id for e in list(sut.elements)[0:2]]
+    assert [e.id for e in sut.to_element_sequence().elements] == [e.id for e in sut.elements]
+    assert len({e.id for e in sut.elements}) == 3
+
+
+def test_compact_element_sequence_requires_elements_of_one_url() -> None:
+    elements = [
+        Element(url=Url(value="http://localhost:8080/index.html"), html_source="<li>a</li>"),
+        Element(url=Url(value="http://localhost:8080/index1.html"), html_source="<li>b</li>"),
+    ]
+    with pytest.raises(ValueError):
+        CompactElementSequence.from_element_sequence(ElementSequence(elements=elements))
+    assert len(CompactElementSequence.from_element_sequence(ElementSequence(elements=[])).elements) == 0
+
+
+@pytest.mark.parametrize(
+    ["html_buffer", "offsets"],
+    [("<li>a</li>", [0, 5]), ("<li>a</li>", [1, 10]), ("<li>a</li><li>b</li>", [0, 15, 10, 20])],
+)
+def test_compact_element_sequence_rejects_inconsistent_offsets(html_buffer: str, offsets: list[int]) -> None:
+    with pytest.raises(ValidationError):
+        CompactElementSequence(url=Url(value="http://localhost:8080/"), html_buffer=html_buffer, offsets=offsets)
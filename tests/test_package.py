@@ -1,7 +1,68 @@
+import json
+import os
 import re
+import subprocess
+import sys
+from pathlib import Path
+
+HEAVY_MODULES = ("selenium", "bs4", "lxml", "urllib3", "sqlite3", "zstandard")
+MAIN_IMPORT_TIME_BUDGET_US = 200_000
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """Returns the cumulative import time in microseconds of every module imported by `statement`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True
+    )
+    import_times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)", line)
+        if match is not None:
+            import_times[match.group(2)] = int(match.group(1))
+    return import_times
 
 
 def test_package_version() -> None:
     from shushu import __version__
 
     assert re.match(r"\d+\.\d+\.\d+", __version__)
+
+
+def test_version_option_does_not_import_the_package() -> None:
+    result = subprocess.run([sys.executable, "-m", "shushu", "--version"], capture_output=True, text=True, check=True)
+    assert result.stdout.startswith("shushu ")
+    import_times = _import_times("import shushu.main")
+    assert [module for module in import_times if module.startswith("shushu.")] == ["shushu.main"]
+    assert not [module for module in import_times if module.split(".")[0] in (*HEAVY_MODULES, "pydantic")]
+    assert import_times["shushu.main"] < MAIN_IMPORT_TIME_BUDGET_US
+
+
+def test_main_requires_a_target_or_a_targets_file() -> None:
+    result = subprocess.run([sys.executable, "-m", "shushu"], capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "either a target or --targets-file is required" in result.stderr
+
+
+def test_main_exits_with_an_error_when_targets_fail(tmp_path: Path) -> None:
+    core_settings = {
+        "web_agent_settings": {"type": "HTTP"},
+        "storage_settings": {"type": "LOCAL_FILE", "path": str(tmp_path / "data")},
+    }
+    targets_path = tmp_path / "targets.txt"
+    targets_path.write_text("not a url\n", encoding="utf-8")
+    result = subprocess.run(
+        [sys.executable, "-m", "shushu", "--config-env-file-path", str(tmp_path / ".env")]
+        + ["--targets-file", str(targets_path)],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "SHUSHU_CORE_SETTINGS": json.dumps(core_settings)},
+    )
+    assert result.returncode == 1
+    assert "1 failed" in result.stderr
+
+
+def test_core_does_not_import_backends_until_they_are_created() -> None:
+    import_times = _import_times("import shushu.core, shushu.async_core")
+    assert not [module for module in import_times if module.split(".")[0] in HEAVY_MODULES]
+    assert "shushu.web_agents.selenium" not in import_times
+    assert "shushu.data_processors.python_code" not in import_times
@@ -0,0 +1,232 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from shushu.actions import (
+    DataProcessorCoreAction,
+    GenerateIdCoreAction,
+    MemoryPayload,
+    OpenMemoryUrlCoreAction,
+    OpenUrlAction,
+    PaginateCoreAction,
+    ParallelCoreAction,
+    PythonCodeDataProcessorAction,
+    RectangleSelector,
+    SaveDataAction,
+    SelectedElementPayload,
+    SequencialCoreAction,
+    SetSelectorAction,
+    StorageCoreAction,
+    StreamCoreAction,
+    WebAgentCoreAction,
+    XPathSelector,
+)
+from shushu.data_processors.factory import DataProcessorFactory
+from shushu.exceptions import PlanValidationError
+from shushu.models import Rectangle, Url
+from shushu.plans import (
+    DataProcessorStep,
+    GenerateIdStep,
+    OpenMemoryUrlStep,
+    PaginateStep,
+    ParallelStep,
+    Plan,
+    StorageStep,
+    StreamStep,
+    WebAgentStep,
+    action_checkpoint_prefix,
+    bind_plan,
+    compile_plan,
+)
+from shushu.types import PaginationMode
+
+
+def test_compile_plan_flattens_sequencial_actions() -> None:
+    generate_id = GenerateIdCoreAction()
+    open_url = WebAgentCoreAction(action=OpenUrlAction(url=Url(value="http://localhost:8080/")))
+    process = DataProcessorCoreAction(
+        action=PythonCodeDataProcessorAction(code="def convert(x):\n    return x"), payload=SelectedElementPayload()
+    )
+    save = StorageCoreAction(action=SaveDataAction(), payload=MemoryPayload())
+    action = SequencialCoreAction(actions=[generate_id, SequencialCoreAction(actions=[open_url, process]), save])
+    assert compile_plan(action) == Plan(
+        steps=(
+            GenerateIdStep(action_id=generate_id.id),
+            WebAgentStep(action_id=open_url.id, action=open_url.action),
+            DataProcessorStep(action_id=process.id, action=process.action, payload=SelectedElementPayload()),
+            StorageStep(action_id=save.id, action=save.action, payload=MemoryPayload()),
+        )
+    )
+
+
+def test_compile_plan_compiles_parallel_actions_once() -> None:
+    open_memory_url = OpenMemoryUrlCoreAction(attribute="link")
+    action = ParallelCoreAction(
+        payload=MemoryPayload(attribute="links"),
+        action=SequencialCoreAction(actions=[open_memory_url]),
+        max_workers=2,
+        ordered=False,
+    )
+    assert compile_plan(action) == Plan(
+        steps=(
+            ParallelStep(
+                action_id=action.id,
+                checkpoint_prefix=action_checkpoint_prefix(action),
+                payload=MemoryPayload(attribute="links"),
+                plan=Plan(steps=(OpenMemoryUrlStep(action_id=open_memory_url.id, attribute="link"),)),
+                max_workers=2,
+                ordered=False,
+            ),
+        )
+    )
+
+
+def test_compile_plan_compiles_paginate_actions() -> None:
+    save = StorageCoreAction(action=SaveDataAction(), payload=MemoryPayload())
+    next_selector = XPathSelector(xpath="//a[@class='next']")
+    action = PaginateCoreAction(action=save, next_selector=next_selector, max_pages=3, prefetch=True)
+    assert compile_plan(action) == Plan(
+        steps=(
+            PaginateStep(
+                action_id=action.id,
+                checkpoint_prefix=action_checkpoint_prefix(action),
+                plan=Plan(steps=(StorageStep(action_id=save.id, action=save.action, payload=MemoryPayload()),)),
+                next_selector=next_selector,
+                mode=PaginationMode.OPEN_URL,
+                max_pages=3,
+                prefetch=True,
+            ),
+        )
+    )
+
+
+def _build_paginated_crawl(max_pages: int) -> SequencialCoreAction:
+    return SequencialCoreAction(
+        actions=[
+            PaginateCoreAction(
+                action=StorageCoreAction(action=SaveDataAction(), payload=MemoryPayload()),
+                next_selector=XPathSelector(xpath="//a[@class='next']"),
+                max_pages=max_pages,
+            ),
+            PaginateCoreAction(
+                action=StorageCoreAction(action=SaveDataAction(), payload=MemoryPayload()),
+                next_selector=XPathSelector(xpath="//a[@class='next']"),
+                max_pages=max_pages,
+            ),
+        ]
+    )
+
+
+def test_compile_plan_derives_checkpoint_prefixes_from_action_content() -> None:
+    first = compile_plan(_build_paginated_crawl(max_pages=3)).steps
+    second = compile_plan(_build_paginated_crawl(max_pages=3)).steps
+    changed = compile_plan(_build_paginated_crawl(max_pages=4)).steps
+    assert [step.checkpoint_prefix for step in first] == [step.checkpoint_prefix for step in second]
+    assert first[0].checkpoint_prefix != first[1].checkpoint_prefix
+    assert first[0].checkpoint_prefix != changed[0].checkpoint_prefix
+
+
+def test_compile_plan_compiles_stream_actions() -> None:
+    process = PythonCodeDataProcessorAction(code="def convert(x):\n    return x")
+    action = StreamCoreAction(action=process, storage_payload=MemoryPayload(attribute="rows", expand=True))
+    assert compile_plan(action) == Plan(
+        steps=(
+            StreamStep(
+                action_id=action.id,
+                action=process,
+                storage_action=action.storage_action,
+                storage_payload=MemoryPayload(attribute="rows", expand=True),
+                chunk_size=100,
+                compact=False,
+            ),
+        )
+    )
+
+
+def test_bind_plan_resolves_data_processors_of_nested_steps(mocker: MockerFixture) -> None:
+    data_processor_factory = mocker.MagicMock(spec=DataProcessorFactory)
+    process = DataProcessorCoreAction(
+        action=PythonCodeDataProcessorAction(code="def convert(x):\n    return x"), payload=SelectedElementPayload()
+    )
+    stream = StreamCoreAction(action=PythonCodeDataProcessorAction(code="def convert(x):\n    return [x]"))
+    action = SequencialCoreAction(
+        actions=[
+            OpenMemoryUrlCoreAction(),
+            ParallelCoreAction(
+                payload=MemoryPayload(attribute="links"), action=SequencialCoreAction(actions=[process])
+            ),
+            stream,
+        ]
+    )
+    plan = compile_plan(action)
+    actual = bind_plan(plan, data_processor_factory)
+    assert actual.steps[0] is plan.steps[0]
+    assert actual.steps[1].plan.steps[0].processor == data_processor_factory.resolve.return_value
+    assert actual.steps[2].processor == data_processor_factory.resolve.return_value
+    assert [call.args[0] for call in data_processor_factory.resolve.call_args_list] == [process.action, stream.action]
+    assert bind_plan(actual, data_processor_factory) is actual
+
+
+@pytest.mark.parametrize(
+    ["action", "path"],
+    [
+        (
+            SequencialCoreAction(
+                actions=[
+                    GenerateIdCoreAction(),
+                    StorageCoreAction(action=SaveDataAction(), payload=SelectedElementPayload()),
+                ]
+            ),
+            "action.actions[1].payload",
+        ),
+        (
+            WebAgentCoreAction(
+                action=SetSelectorAction(selector=RectangleSelector(rectangle=Rectangle(x=0, y=0, width=1, height=1)))
+            ),
+            "action.action.selector",
+        ),
+        (
+            ParallelCoreAction(
+                payload=MemoryPayload(),
+                action=DataProcessorCoreAction(
+                    action=PythonCodeDataProcessorAction(code="def convert(x) return x"), payload=MemoryPayload()
+                ),
+            ),
+            "action.action.action.code",
+        ),
+        (
+            DataProcessorCoreAction(
+                action=PythonCodeDataProcessorAction(code="def transform(x):\n    return x"), payload=MemoryPayload()
+            ),
+            "action.action.code",
+        ),
+        (
+            PaginateCoreAction(
+                action=GenerateIdCoreAction(),
+                next_selector=RectangleSelector(rectangle=Rectangle(x=0, y=0, width=1, height=1)),
+            ),
+            "action.next_selector",
+        ),
+        (
+            PaginateCoreAction(
+                action=GenerateIdCoreAction(),
+                next_selector=XPathSelector(xpath="//a[@class='next']"),
+                mode=PaginationMode.CLICK,
+                prefetch=True,
+            ),
+            "action.prefetch",
+        ),
+        (
+            StreamCoreAction(action=PythonCodeDataProcessorAction(code="def transform(x):\n    return x")),
+            "action.action.code",
+        ),
+    ],
+)
+def test_compile_plan_raises_error_for_invalid_actions(action: SequencialCoreAction, path: str) -> None:
+    with pytest.raises(PlanValidationError) as e:
+        compile_plan(action)
+    assert e.value.path == path
+
+
+def test_compile_plan_accepts_selectors_supported_by_web_agents() -> None:
+    action = WebAgentCoreAction(action=SetSelectorAction(selector=XPathSelector(xpath="//a")))
+    assert compile_plan(action).steps == (WebAgentStep(action_id=action.id, action=action.action),)
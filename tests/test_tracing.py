@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+
+import pytest
+
+from shushu.tracing import Tracer
+
+
+def test_tracer_logs_finished_spans(logger_fixture: MagicMock) -> None:
+    sut = Tracer(logger=logger_fixture)
+    with sut.span("OPEN_URL", category="web_agent", action_id="01HW5QHEQ53AZ7HNNRM56RKD4P") as span:
+        span.set("payload_size", 10)
+    logger_fixture.info.assert_called_once()
+    extra = logger_fixture.info.call_args.kwargs["extra"]
+    assert extra["span_name"] == "OPEN_URL"
+    assert extra["category"] == "web_agent"
+    assert extra["action_id"] == "01HW5QHEQ53AZ7HNNRM56RKD4P"
+    assert extra["payload_size"] == 10
+    assert extra["duration_ms"] >= 0
+
+
+def test_tracer_records_errors_and_reraises(logger_fixture: MagicMock) -> None:
+    sut = Tracer(logger=logger_fixture)
+    with pytest.raises(ValueError):
+        with sut.span("SAVE_DATA", category="storage"):
+            raise ValueError("broken")
+    assert logger_fixture.info.call_args.kwargs["extra"]["error"] == "ValueError: broken"
+
+
+def test_tracer_writes_chrome_trace_on_close(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        trace_path = Path(tempdir) / "trace.json"
+        sut = Tracer(logger=logger_fixture, trace_path=trace_path, log_spans=False)
+        with sut.span("WebAgentStep", category="core"):
+            with sut.span("OPEN_URL", category="web_agent", action_id="a"):
+                ...
+        sut.close()
+        with open(trace_path, "r", encoding="utf-8") as f:
+            events = json.load(f)["traceEvents"]
+    logger_fixture.info.assert_called_once()
+    assert [(e["name"], e["cat"], e["ph"]) for e in events] == [
+        ("OPEN_URL", "web_agent", "X"),
+        ("WebAgentStep", "core", "X"),
+    ]
+    inner, outer = events
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert inner["args"] == {"action_id": "a"}
+
+
+def test_disabled_tracer_records_nothing(logger_fixture: MagicMock) -> None:
+    sut = Tracer(logger=logger_fixture, enabled=False, trace_path=Path("unused.json"))
+    with sut.span("OPEN_URL", category="web_agent") as span:
+        span.set("payload_size", 10)
+    assert sut.records == []
+    logger_fixture.info.assert_not_called()
@@ -1,23 +1,32 @@
+import json
+import shutil
+import subprocess
 from datetime import datetime, timezone
+from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
 from freezegun import freeze_time
 from oltl import Id
 from pytest_mock import MockerFixture
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import JavascriptException, NoSuchElementException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
 from shushu.actions import (
     ClickSelectedElementAction,
+    MinimumEnclosingElementWithMultipleTextsSelector,
     OpenUrlAction,
     SetSelectorAction,
     XPathSelector,
 )
-from shushu.models import Element, ElementSequence, Url
-from shushu.web_agents.selenium_drivers.base import BaseSeleniumDriver
+from shushu.models import Element, ElementSequence, Rectangle, Url
+from shushu.web_agents.selenium_drivers.base import (
+    MINIMUM_ENCLOSING_ELEMENT_SCRIPT,
+    SELECT_ELEMENTS_SCRIPT,
+    BaseSeleniumDriver,
+)
 from shushu.web_agents.selenium_drivers.exceptions import (
     NoElementFoundError,
     NoElementSelectedError,
@@ -158,3 +167,255 @@ def test_perform_click_selected_element_success(logger_fixture: MagicMock, mocke
     mock_web_driver.find_element.assert_called_once_with(By.XPATH, "//div[@id='test']")
     mock_web_driver.find_element.return_value.click.assert_called_once_with()
     mock_web_driver.reset_mock()
+
+
+def _create_driver(
+    web_driver: MagicMock, logger: MagicMock, collect_element_locations: bool = False
+) -> BaseSeleniumDriver:
+    class ScriptedSeleniumDriver(BaseSeleniumDriver):
+        def _init_driver(self) -> None:
+            self._driver = web_driver
+
+    return ScriptedSeleniumDriver(logger=logger, collect_element_locations=collect_element_locations)
+
+
+def test_get_selected_elements_uses_single_script_round_trip(logger_fixture: MagicMock) -> None:
+    web_driver = MagicMock(spec=WebDriver)
+    web_driver.current_url = "http://localhost:8080/"
+    web_driver.execute_script.return_value = [[["<div>test0</div>", None], ["<div>test1</div>", None]], None]
+    sut = _create_driver(web_driver, logger_fixture)
+    sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//div")))
+    actual = sut.get_selected_elements()
+    assert [element.html_source for element in actual.elements] == ["<div>test0</div>", "<div>test1</div>"]
+    assert all(element.location is None for element in actual.elements)
+    web_driver.execute_script.assert_called_once_with(SELECT_ELEMENTS_SCRIPT, "//div", False, 0, None)
+    web_driver.find_elements.assert_not_called()
+
+
+def test_get_selected_elements_collects_locations_in_script(logger_fixture: MagicMock) -> None:
+    web_driver = MagicMock(spec=WebDriver)
+    web_driver.current_url = "http://localhost:8080/"
+    web_driver.execute_script.return_value = [[["<div>test0</div>", [1, 2, 3, 4]]], None]
+    sut = _create_driver(web_driver, logger_fixture, collect_element_locations=True)
+    sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//div")))
+    actual = sut.get_selected_elements()
+    assert actual.elements[0].location == Rectangle(x=1, y=2, width=3, height=4)
+    web_driver.execute_script.assert_called_once_with(SELECT_ELEMENTS_SCRIPT, "//div", True, 0, None)
+
+
+def test_get_selected_elements_falls_back_to_find_elements(logger_fixture: MagicMock) -> None:
+    web_driver = MagicMock(spec=WebDriver)
+    web_driver.current_url = "http://localhost:8080/"
+    web_driver.execute_script.side_effect = JavascriptException("document.evaluate is not available")
+    mock_element = MagicMock(spec=WebElement)
+    mock_element.get_attribute.return_value = "<div>test0</div>"
+    mock_element.rect = {"x": 1.2, "y": 2.0, "width": 3.0, "height": 4.4}
+    web_driver.find_elements.return_value = [mock_element]
+    sut = _create_driver(web_driver, logger_fixture, collect_element_locations=True)
+    sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//div")))
+    actual = sut.get_selected_elements()
+    assert [element.html_source for element in actual.elements] == ["<div>test0</div>"]
+    assert actual.elements[0].location == Rectangle(x=1, y=2, width=3, height=4)
+    web_driver.find_elements.assert_called_once_with(By.XPATH, "//div")
+
+
+def test_iter_selected_elements_fetches_one_chunk_per_script_round_trip(logger_fixture: MagicMock) -> None:
+    web_driver = MagicMock(spec=WebDriver)
+    web_driver.current_url = "http://localhost:8080/"
+    web_driver.execute_script.side_effect = [
+        [[["<div>test0</div>", None], ["<div>test1</div>", None]], 3],
+        [[["<div>test2</div>", None]], None],
+    ]
+    sut = _create_driver(web_driver, logger_fixture)
+    sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//div")))
+    chunks = sut.iter_selected_elements(2)
+    assert [e.html_source for e in next(chunks).elements] == ["<div>test0</div>", "<div>test1</div>"]
+    web_driver.execute_script.assert_called_once_with(SELECT_ELEMENTS_SCRIPT, "//div", False, 0, 2)
+    assert [[e.html_source for e in chunk.elements] for chunk in chunks] == [["<div>test2</div>"]]
+    web_driver.execute_script.assert_called_with(SELECT_ELEMENTS_SCRIPT, "//div", False, 3, 2)
+    web_driver.find_elements.assert_not_called()
+
+
+def test_iter_selected_elements_falls_back_to_find_elements_after_yielded_elements(
+    logger_fixture: MagicMock,
+) -> None:
+    web_driver = MagicMock(spec=WebDriver)
+    web_driver.current_url = "http://localhost:8080/"
+    web_driver.execute_script.side_effect = [
+        [[["<div>test0</div>", None]], 1],
+        JavascriptException("page changed"),
+    ]
+    mock_elements = [MagicMock(spec=WebElement) for _ in range(3)]
+    for i, mock_element in enumerate(mock_elements):
+        mock_element.get_attribute.return_value = f"<div>test{i}</div>"
+    web_driver.find_elements.return_value = mock_elements
+    sut = _create_driver(web_driver, logger_fixture)
+    sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//div")))
+    actual = [[e.html_source for e in chunk.elements] for chunk in sut.iter_selected_elements(1)]
+    assert actual == [["<div>test0</div>"], ["<div>test1</div>"], ["<div>test2</div>"]]
+    web_driver.find_elements.assert_called_once_with(By.XPATH, "//div")
+
+
+def test_minimum_enclosing_element_is_found_in_single_script_round_trip(logger_fixture: MagicMock) -> None:
+    web_driver = MagicMock(spec=WebDriver)
+    web_driver.current_url = "http://localhost:8080/"
+    found = MagicMock(spec=WebElement)
+    found.get_attribute.return_value = "<li><a>foo</a><p>2024</p></li>"
+    web_driver.execute_script.return_value = found
+    sut = _create_driver(web_driver, logger_fixture)
+    sut.perform(
+        SetSelectorAction(selector=MinimumEnclosingElementWithMultipleTextsSelector(target_strings=["foo", "2024"]))
+    )
+    actual = sut.get_selected_element()
+    assert actual.html_source == "<li><a>foo</a><p>2024</p></li>"
+    web_driver.execute_script.assert_called_once_with(MINIMUM_ENCLOSING_ELEMENT_SCRIPT, ["foo", "2024"])
+    web_driver.find_element.assert_not_called()
+
+
+def test_minimum_enclosing_element_script_raises_error_when_no_element_found(logger_fixture: MagicMock) -> None:
+    web_driver = MagicMock(spec=WebDriver)
+    web_driver.execute_script.return_value = None
+    sut = _create_driver(web_driver, logger_fixture)
+    sut.perform(SetSelectorAction(selector=MinimumEnclosingElementWithMultipleTextsSelector(target_strings=["foo"])))
+    with pytest.raises(NoElementFoundError):
+        sut.get_selected_element()
+    web_driver.find_element.assert_not_called()
+
+
+def test_minimum_enclosing_element_falls_back_to_element_wise_search(logger_fixture: MagicMock) -> None:
+    web_driver = MagicMock(spec=WebDriver)
+    web_driver.execute_script.side_effect = JavascriptException("innerText is not available")
+    root = MagicMock(spec=WebElement)
+    root.text = "foo 2024 bar"
+    child = MagicMock(spec=WebElement)
+    child.text = "foo 2024"
+    child.find_elements.return_value = []
+    root.find_elements.return_value = [child]
+    web_driver.find_element.return_value = root
+    sut = _create_driver(web_driver, logger_fixture)
+    sut.perform(
+        SetSelectorAction(selector=MinimumEnclosingElementWithMultipleTextsSelector(target_strings=["foo", "2024"]))
+    )
+    sut.perform(ClickSelectedElementAction())
+    child.click.assert_called_once_with()
+    web_driver.find_element.assert_called_once_with(By.XPATH, "/*")
+
+
+def test_reset_clears_browsing_data_and_selector(logger_fixture: MagicMock) -> None:
+    web_driver = MagicMock(spec=WebDriver)
+    sut = _create_driver(web_driver, logger_fixture)
+    sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//div")))
+    sut.reset()
+    web_driver.delete_all_cookies.assert_called_once_with()
+    web_driver.get.assert_called_once_with("about:blank")
+    with pytest.raises(NoElementSelectedError):
+        sut.get_selected_elements()
+
+
+def test_quit_quits_web_driver_only_once(logger_fixture: MagicMock) -> None:
+    web_driver = MagicMock(spec=WebDriver)
+    sut = _create_driver(web_driver, logger_fixture)
+    assert sut.is_alive()
+    sut.quit()
+    assert not sut.is_alive()
+    del sut
+    web_driver.quit.assert_called_once_with()
+
+
+# A minimal DOM for running the browser scripts in node: `h` creates HTML elements and `s` creates SVG elements.
+# Like in a browser, the innerText of an element that is not rendered falls back to its textContent.
+FAKE_DOM_SCRIPT = """
+class Element {
+    constructor(tagName, text, rendered, children) {
+        this.tagName = tagName;
+        this.text = text;
+        this.rendered = rendered;
+        this.children = children;
+    }
+    get textContent() {
+        return this.text + this.children.map((child) => child.textContent).join("");
+    }
+    getClientRects() {
+        return this.rendered ? [{}] : [];
+    }
+}
+class HTMLElement extends Element {
+    get innerText() {
+        if (!this.rendered) {
+            return this.textContent;
+        }
+        const texts = this.children
+            .filter((child) => child.rendered)
+            .map((child) => (child instanceof HTMLElement ? child.innerText : child.textContent));
+        return [this.text, ...texts].join(" ");
+    }
+}
+const h = (tagName, text, children = [], rendered = true) => new HTMLElement(tagName, text, rendered, children);
+const s = (tagName, text, children = []) => new Element(tagName, text, true, children);
+"""
+
+
+def _run_minimum_enclosing_element_script(document_element: str, target_strings: list[str]) -> str:
+    script = "\n".join(
+        [
+            FAKE_DOM_SCRIPT,
+            f"const document = {{ documentElement: {document_element} }};",
+            f"const find = function () {{ {MINIMUM_ENCLOSING_ELEMENT_SCRIPT} }};",
+            f"const found = find.apply(null, {json.dumps([target_strings])});",
+            "console.log(found === null ? 'null' : found.tagName);",
+        ]
+    )
+    node = shutil.which("node")
+    assert node is not None
+    return subprocess.run([node, "-e", script], capture_output=True, text=True, check=True).stdout.strip()
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize(
+    ["document_element", "expected"],
+    [
+        (
+            'h("html", "", [h("body", "", [h("div", "", [h("p", "foo 2024")], false), h("ul", "", [h("li", "foo 2024")])])])',  # noqa: E501
+            "li",
+        ),
+        ('h("html", "", [h("body", "", [h("div", "", [h("p", "foo 2024")], false)])])', "null"),
+        ('h("html", "", [h("body", "", [s("svg", "", [s("text", "foo 2024")])])])', "text"),
+    ],
+)
+def test_minimum_enclosing_element_script_matches_rendered_text_only(document_element: str, expected: str) -> None:
+    assert _run_minimum_enclosing_element_script(document_element, ["foo", "2024"]) == expected
+
+
+def _run_select_elements_script(nodes: str, start: int, count: int | None) -> Any:
+    script = "\n".join(
+        [
+            "const Node = { ELEMENT_NODE: 1 };",
+            "const XPathResult = { ORDERED_NODE_SNAPSHOT_TYPE: 7 };",
+            f"const nodes = {nodes};",
+            "const document = { evaluate: () => ({ snapshotLength: nodes.length, snapshotItem: (i) => nodes[i] }) };",
+            f"const select = function () {{ {SELECT_ELEMENTS_SCRIPT} }};",
+            f"console.log(JSON.stringify(select.apply(null, {json.dumps(['//li', False, start, count])})));",
+        ]
+    )
+    node = shutil.which("node")
+    assert node is not None
+    return json.loads(subprocess.run([node, "-e", script], capture_output=True, text=True, check=True).stdout)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize(
+    ["start", "count", "expected"],
+    [
+        (0, 2, [[["<li>a</li>", None], ["<li>b</li>", None]], 3]),
+        (3, 2, [[["<li>c</li>", None]], None]),
+        (0, None, [[["<li>a</li>", None], ["<li>b</li>", None], ["<li>c</li>", None]], None]),
+    ],
+)
+def test_select_elements_script_pages_through_the_matched_elements(
+    start: int, count: int | None, expected: Any
+) -> None:
+    nodes = (
+        '[{ nodeType: 1, outerHTML: "<li>a</li>" }, { nodeType: 3 }, '
+        '{ nodeType: 1, outerHTML: "<li>b</li>" }, { nodeType: 1, outerHTML: "<li>c</li>" }]'
+    )
+    assert _run_select_elements_script(nodes, start, count) == expected
@@ -0,0 +1,90 @@
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from shushu.actions import (
+    ClickSelectedElementAction,
+    OpenUrlAction,
+    SetSelectorAction,
+    XPathSelector,
+)
+from shushu.models import Url
+from shushu.settings import (
+    BlockedResourceType,
+    ChromeSeleniumDriverSettings,
+    PageLoadStrategy,
+)
+from shushu.web_agents.selenium_drivers.chrome import ChromeSeleniumDriver
+
+
+def test_chrome_driver_uses_default_options(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    Chrome = mocker.patch("shushu.web_agents.selenium_drivers.chrome.Chrome")
+    sut = ChromeSeleniumDriver(settings=ChromeSeleniumDriverSettings(), logger=logger_fixture)
+    options = Chrome.call_args.kwargs["options"]
+    assert options.arguments == ["--disable-gpu", "--headless"]
+    assert options.page_load_strategy == "normal"
+    Chrome.return_value.execute_cdp_cmd.assert_not_called()
+    sut.quit()
+
+
+def test_chrome_driver_applies_lean_page_load_settings(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    Chrome = mocker.patch("shushu.web_agents.selenium_drivers.chrome.Chrome")
+    settings = ChromeSeleniumDriverSettings(
+        page_load_strategy=PageLoadStrategy.EAGER,
+        blocked_url_patterns=["*://ads.example.com/*"],
+        blocked_resource_types=[BlockedResourceType.STYLESHEET],
+        disable_images=True,
+    )
+    sut = ChromeSeleniumDriver(settings=settings, logger=logger_fixture)
+    options = Chrome.call_args.kwargs["options"]
+    assert options.page_load_strategy == "eager"
+    assert "--blink-settings=imagesEnabled=false" in options.arguments
+    assert options.experimental_options["prefs"] == {"profile.managed_default_content_settings.images": 2}
+    Chrome.return_value.execute_cdp_cmd.assert_any_call("Network.enable", {})
+    Chrome.return_value.execute_cdp_cmd.assert_any_call(
+        "Network.setBlockedURLs", {"urls": ["*://ads.example.com/*", "*.css", "*.css?*"]}
+    )
+    sut.quit()
+
+
+def test_chrome_driver_waits_for_xpath_after_opening_url(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    Chrome = mocker.patch("shushu.web_agents.selenium_drivers.chrome.Chrome")
+    WebDriverWait = mocker.patch("shushu.web_agents.selenium_drivers.chrome.WebDriverWait")
+    presence_of_element_located = mocker.patch("shushu.web_agents.selenium_drivers.chrome.presence_of_element_located")
+    settings = ChromeSeleniumDriverSettings(wait_for_xpath="//main", wait_timeout=3.0)
+    sut = ChromeSeleniumDriver(settings=settings, logger=logger_fixture)
+    sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/")))
+    Chrome.return_value.get.assert_called_once_with(url="http://localhost:8080/")
+    WebDriverWait.assert_called_once_with(Chrome.return_value, 3.0)
+    presence_of_element_located.assert_called_once_with((By.XPATH, "//main"))
+    WebDriverWait.return_value.until.assert_called_once_with(presence_of_element_located.return_value)
+    sut.quit()
+
+
+def test_chrome_driver_waits_for_xpath_after_clicking(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    Chrome = mocker.patch("shushu.web_agents.selenium_drivers.chrome.Chrome")
+    WebDriverWait = mocker.patch("shushu.web_agents.selenium_drivers.chrome.WebDriverWait")
+    presence_of_element_located = mocker.patch("shushu.web_agents.selenium_drivers.chrome.presence_of_element_located")
+    settings = ChromeSeleniumDriverSettings(wait_for_xpath="//main", wait_timeout=3.0)
+    sut = ChromeSeleniumDriver(settings=settings, logger=logger_fixture)
+    sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//a[@class='next']")))
+    sut.perform(ClickSelectedElementAction())
+    Chrome.return_value.find_element.assert_called_once_with(By.XPATH, "//a[@class='next']")
+    Chrome.return_value.find_element.return_value.click.assert_called_once_with()
+    WebDriverWait.assert_called_once_with(Chrome.return_value, 3.0)
+    presence_of_element_located.assert_called_once_with((By.XPATH, "//main"))
+    WebDriverWait.return_value.until.assert_called_once_with(presence_of_element_located.return_value)
+    sut.quit()
+
+
+def test_chrome_driver_continues_when_wait_times_out(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    mocker.patch("shushu.web_agents.selenium_drivers.chrome.Chrome")
+    WebDriverWait = mocker.patch("shushu.web_agents.selenium_drivers.chrome.WebDriverWait")
+    WebDriverWait.return_value.until.side_effect = TimeoutException()
+    settings = ChromeSeleniumDriverSettings(wait_for_xpath="//main")
+    sut = ChromeSeleniumDriver(settings=settings, logger=logger_fixture)
+    sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/")))
+    logger_fixture.warning.assert_called_once()
+    sut.quit()
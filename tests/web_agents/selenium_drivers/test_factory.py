@@ -7,8 +7,8 @@ from shushu.web_agents.selenium_drivers.factory import SeleniumDriverFactory
 
 
 def test_selenium_driver_factory_creates_chrome_driver(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
-    ChromeSeleniumDriver = mocker.patch("shushu.web_agents.selenium_drivers.factory.ChromeSeleniumDriver")
+    ChromeSeleniumDriver = mocker.patch("shushu.web_agents.selenium_drivers.chrome.ChromeSeleniumDriver")
     settings = ChromeSeleniumDriverSettings()
     actual = SeleniumDriverFactory(logger=logger_fixture).create(settings=settings)
     assert actual == ChromeSeleniumDriver.return_value
-    ChromeSeleniumDriver.assert_called_once_with(logger=logger_fixture)
+    ChromeSeleniumDriver.assert_called_once_with(settings=settings, logger=logger_fixture)
@@ -0,0 +1,154 @@
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+from selenium.common.exceptions import WebDriverException
+
+from shushu.settings import ChromeSeleniumDriverSettings
+from shushu.web_agents.selenium_drivers.base import BaseSeleniumDriver
+from shushu.web_agents.selenium_drivers.pool import SeleniumDriverPool
+
+
+def _create_drivers(mocker: MockerFixture, count: int) -> list[MagicMock]:
+    drivers = [mocker.MagicMock(spec=BaseSeleniumDriver) for _ in range(count)]
+    for driver in drivers:
+        driver.is_alive.return_value = True
+    return drivers
+
+
+def test_pool_rejects_non_positive_size(logger_fixture: MagicMock) -> None:
+    with pytest.raises(ValueError):
+        SeleniumDriverPool(
+            driver_settings=ChromeSeleniumDriverSettings(), size=0, max_uses_per_driver=1, logger=logger_fixture
+        )
+
+
+def test_pool_reuses_reset_driver(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    SeleniumDriverFactory = mocker.patch("shushu.web_agents.selenium_drivers.pool.SeleniumDriverFactory")
+    (driver,) = _create_drivers(mocker, 1)
+    SeleniumDriverFactory.return_value.create.return_value = driver
+    settings = ChromeSeleniumDriverSettings()
+    sut = SeleniumDriverPool(driver_settings=settings, size=1, max_uses_per_driver=10, logger=logger_fixture)
+
+    first = sut.acquire()
+    sut.release(first)
+    second = sut.acquire()
+    sut.release(second)
+
+    assert first is driver
+    assert second is driver
+    SeleniumDriverFactory.return_value.create.assert_called_once_with(settings=settings)
+    assert driver.reset.call_count == 2
+    driver.quit.assert_not_called()
+
+
+def test_pool_launches_drivers_up_to_size(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    SeleniumDriverFactory = mocker.patch("shushu.web_agents.selenium_drivers.pool.SeleniumDriverFactory")
+    drivers = _create_drivers(mocker, 2)
+    SeleniumDriverFactory.return_value.create.side_effect = drivers
+    sut = SeleniumDriverPool(
+        driver_settings=ChromeSeleniumDriverSettings(), size=2, max_uses_per_driver=10, logger=logger_fixture
+    )
+
+    first = sut.acquire()
+    second = sut.acquire()
+
+    assert {id(first), id(second)} == {id(driver) for driver in drivers}
+
+
+def test_pool_recycles_driver_after_max_uses(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    SeleniumDriverFactory = mocker.patch("shushu.web_agents.selenium_drivers.pool.SeleniumDriverFactory")
+    drivers = _create_drivers(mocker, 2)
+    SeleniumDriverFactory.return_value.create.side_effect = drivers
+    sut = SeleniumDriverPool(
+        driver_settings=ChromeSeleniumDriverSettings(), size=1, max_uses_per_driver=2, logger=logger_fixture
+    )
+
+    for _ in range(2):
+        sut.release(sut.acquire())
+    third = sut.acquire()
+
+    assert third is drivers[1]
+    drivers[0].quit.assert_called_once_with()
+    drivers[0].reset.assert_called_once_with()
+
+
+def test_pool_replaces_unhealthy_driver(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    SeleniumDriverFactory = mocker.patch("shushu.web_agents.selenium_drivers.pool.SeleniumDriverFactory")
+    drivers = _create_drivers(mocker, 2)
+    SeleniumDriverFactory.return_value.create.side_effect = drivers
+    sut = SeleniumDriverPool(
+        driver_settings=ChromeSeleniumDriverSettings(), size=1, max_uses_per_driver=10, logger=logger_fixture
+    )
+
+    sut.release(sut.acquire())
+    drivers[0].is_alive.return_value = False
+    actual = sut.acquire()
+
+    assert actual is drivers[1]
+    drivers[0].quit.assert_called_once_with()
+
+
+def test_pool_recycles_driver_that_cannot_be_reset(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    SeleniumDriverFactory = mocker.patch("shushu.web_agents.selenium_drivers.pool.SeleniumDriverFactory")
+    drivers = _create_drivers(mocker, 2)
+    drivers[0].reset.side_effect = WebDriverException("chrome not reachable")
+    SeleniumDriverFactory.return_value.create.side_effect = drivers
+    sut = SeleniumDriverPool(
+        driver_settings=ChromeSeleniumDriverSettings(), size=1, max_uses_per_driver=10, logger=logger_fixture
+    )
+
+    sut.release(sut.acquire())
+
+    assert sut.acquire() is drivers[1]
+    drivers[0].quit.assert_called_once_with()
+
+
+def test_pool_keeps_slot_when_launch_fails(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    SeleniumDriverFactory = mocker.patch("shushu.web_agents.selenium_drivers.pool.SeleniumDriverFactory")
+    (driver,) = _create_drivers(mocker, 1)
+    SeleniumDriverFactory.return_value.create.side_effect = [WebDriverException("no chrome"), driver]
+    sut = SeleniumDriverPool(
+        driver_settings=ChromeSeleniumDriverSettings(), size=1, max_uses_per_driver=10, logger=logger_fixture
+    )
+
+    with pytest.raises(WebDriverException):
+        sut.acquire()
+
+    assert sut.acquire() is driver
+
+
+def test_close_quits_idle_drivers(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    SeleniumDriverFactory = mocker.patch("shushu.web_agents.selenium_drivers.pool.SeleniumDriverFactory")
+    drivers = _create_drivers(mocker, 2)
+    SeleniumDriverFactory.return_value.create.side_effect = drivers
+    sut = SeleniumDriverPool(
+        driver_settings=ChromeSeleniumDriverSettings(), size=1, max_uses_per_driver=10, logger=logger_fixture
+    )
+
+    sut.release(sut.acquire())
+    sut.close()
+
+    drivers[0].quit.assert_called_once_with()
+    assert sut.acquire() is drivers[1]
+
+
+def test_prelaunch_launches_every_driver_before_the_first_lease(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    SeleniumDriverFactory = mocker.patch("shushu.web_agents.selenium_drivers.pool.SeleniumDriverFactory")
+    drivers = _create_drivers(mocker, 2)
+    SeleniumDriverFactory.return_value.create.side_effect = drivers
+    sut = SeleniumDriverPool(
+        driver_settings=ChromeSeleniumDriverSettings(), size=2, max_uses_per_driver=1, logger=logger_fixture
+    )
+
+    sut.prelaunch()
+    assert SeleniumDriverFactory.return_value.create.call_count == 2
+    leased = [sut.acquire(), sut.acquire()]
+    sut.release(leased[0])
+
+    assert {id(driver) for driver in leased} == {id(driver) for driver in drivers}
+    assert SeleniumDriverFactory.return_value.create.call_count == 2
+    # a prelaunched driver is not counted as used until it is leased
+    leased[0].quit.assert_called_once_with()
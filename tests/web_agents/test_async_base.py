@@ -0,0 +1,68 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+
+from shushu.actions import OpenUrlAction
+from shushu.models import Element, ElementSequence, Url
+from shushu.web_agents.async_base import ThreadedAsyncWebAgent
+from shushu.web_agents.base import BaseWebAgent
+
+
+def test_threaded_async_web_agent_delegates_to_web_agent(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    sut = ThreadedAsyncWebAgent(web_agent=web_agent, logger=logger_fixture)
+    action = OpenUrlAction(url=Url(value="http://localhost:8080"))
+
+    async def run() -> None:
+        async with sut:
+            await sut.perform(action)
+            assert await sut.get_selected_element() == web_agent.get_selected_element.return_value
+            assert await sut.get_selected_elements() == web_agent.get_selected_elements.return_value
+
+    asyncio.run(run())
+
+    web_agent.__enter__.assert_called_once_with()
+    web_agent.__exit__.assert_called_once_with(None, None, None)
+    web_agent.perform.assert_called_once_with(action)
+
+
+def test_threaded_async_web_agent_serializes_calls(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    in_flight: list[int] = []
+    max_in_flight: list[int] = []
+
+    def perform(action: OpenUrlAction) -> None:
+        in_flight.append(1)
+        max_in_flight.append(len(in_flight))
+        in_flight.pop()
+
+    web_agent.perform.side_effect = perform
+    sut = ThreadedAsyncWebAgent(web_agent=web_agent, logger=logger_fixture)
+
+    async def run() -> None:
+        action = OpenUrlAction(url=Url(value="http://localhost:8080"))
+        await asyncio.gather(*[sut.perform(action) for _ in range(5)])
+
+    asyncio.run(run())
+
+    assert max(max_in_flight) == 1
+    assert web_agent.perform.call_count == 5
+
+
+def test_threaded_async_web_agent_iterates_chunks_of_web_agent(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    web_agent = mocker.MagicMock(spec=BaseWebAgent)
+    chunks = [
+        ElementSequence(elements=[Element(url=Url(value="http://localhost:8080"), html_source=f"<li>{i}</li>")])
+        for i in range(3)
+    ]
+    web_agent.iter_selected_elements.return_value = iter(chunks)
+    sut = ThreadedAsyncWebAgent(web_agent=web_agent, logger=logger_fixture)
+
+    async def run() -> list[ElementSequence]:
+        return [chunk async for chunk in sut.iter_selected_elements(1)]
+
+    assert asyncio.run(run()) == chunks
+    web_agent.iter_selected_elements.assert_called_once_with(1)
@@ -0,0 +1,48 @@
+from lxml.html import document_fromstring
+
+from shushu.web_agents.element_search import (
+    find_minimum_enclosing_element_with_multiple_texts,
+    iter_visible_texts,
+)
+
+SOURCE = """\
+<html>
+<head><title>始まりの村</title><script>var text = "始まりの村 2024";</script></head>
+<body>
+    <div id="outer">
+        <ul>
+            <li id="first"><a>始まりの村</a><p>日付: 2024-03-31</p></li>
+            <li id="second"><a>ゼルファンの森</a><p>日付: 2024-04-01</p></li>
+        </ul>
+        <p id="footer">始まりの村<style>.x { color: red; }</style></p>
+    </div>
+</body>
+</html>
+"""
+
+
+def test_iter_visible_texts_skips_invisible_elements() -> None:
+    document = document_fromstring(SOURCE)
+    text = "".join(iter_visible_texts(document))
+    assert "var text" not in text
+    assert "color" not in text
+    assert "ゼルファンの森" in text
+
+
+def test_find_minimum_enclosing_element_descends_into_first_matching_child() -> None:
+    document = document_fromstring(SOURCE)
+    actual = find_minimum_enclosing_element_with_multiple_texts(document, ["始まりの村", "2024"])
+    assert actual is not None
+    assert actual.get("id") == "first"
+
+
+def test_find_minimum_enclosing_element_returns_common_ancestor() -> None:
+    document = document_fromstring(SOURCE)
+    actual = find_minimum_enclosing_element_with_multiple_texts(document, ["始まりの村", "ゼルファンの森"])
+    assert actual is not None
+    assert actual.tag == "ul"
+
+
+def test_find_minimum_enclosing_element_ignores_invisible_texts() -> None:
+    document = document_fromstring(SOURCE)
+    assert find_minimum_enclosing_element_with_multiple_texts(document, ["var text"]) is None
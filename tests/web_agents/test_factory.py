@@ -2,17 +2,138 @@ from unittest.mock import MagicMock
 
 from pytest_mock import MockerFixture
 
-from shushu.settings import SeleniumWebAgentSettings
+from shushu.settings import (
+    HttpWebAgentSettings,
+    PageCacheMode,
+    PageCacheSettings,
+    SeleniumWebAgentSettings,
+)
 from shushu.web_agents.factory import WebAgentFactory
+from shushu.web_agents.page_cache import SELENIUM_CACHE_OPTIONS
 
 
 def test_web_agent_factory_creates_selenium_agent(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
-    SeleniumWebAgent = mocker.patch("shushu.web_agents.factory.SeleniumWebAgent")
+    SeleniumWebAgent = mocker.patch("shushu.web_agents.selenium.SeleniumWebAgent")
     selenium_web_agent_settings = SeleniumWebAgentSettings()
 
     actual = WebAgentFactory(logger=logger_fixture).create(settings=selenium_web_agent_settings)
 
     assert actual == SeleniumWebAgent.return_value
     SeleniumWebAgent.assert_called_once_with(
-        driver_settings=selenium_web_agent_settings.driver_settings, logger=logger_fixture
+        driver_settings=selenium_web_agent_settings.driver_settings,
+        logger=logger_fixture,
+        driver_pool=None,
+        page_cache=None,
     )
+
+
+def test_web_agent_factory_creates_selenium_agent_with_driver_pool(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    SeleniumWebAgent = mocker.patch("shushu.web_agents.selenium.SeleniumWebAgent")
+    SeleniumDriverPool = mocker.patch("shushu.web_agents.selenium_drivers.pool.SeleniumDriverPool")
+    selenium_web_agent_settings = SeleniumWebAgentSettings(driver_pool_size=2, driver_max_uses=10)
+
+    actual = WebAgentFactory(logger=logger_fixture).create(settings=selenium_web_agent_settings)
+
+    assert actual == SeleniumWebAgent.return_value
+    SeleniumDriverPool.assert_called_once_with(
+        driver_settings=selenium_web_agent_settings.driver_settings,
+        size=2,
+        max_uses_per_driver=10,
+        logger=logger_fixture,
+    )
+    SeleniumWebAgent.assert_called_once_with(
+        driver_settings=selenium_web_agent_settings.driver_settings,
+        logger=logger_fixture,
+        driver_pool=SeleniumDriverPool.return_value,
+        page_cache=None,
+    )
+    SeleniumDriverPool.return_value.prelaunch.assert_called_once_with()
+
+
+def test_web_agent_factory_closes_driver_pools(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    mocker.patch("shushu.web_agents.selenium.SeleniumWebAgent")
+    SeleniumDriverPool = mocker.patch("shushu.web_agents.selenium_drivers.pool.SeleniumDriverPool")
+    sut = WebAgentFactory(logger=logger_fixture)
+    sut.create(settings=SeleniumWebAgentSettings(driver_pool_size=2, driver_pool_prelaunch=False))
+
+    sut.close()
+
+    SeleniumDriverPool.return_value.prelaunch.assert_not_called()
+    SeleniumDriverPool.return_value.close.assert_called_once_with()
+
+
+def test_web_agent_factory_shares_driver_pool_between_agents(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    SeleniumWebAgent = mocker.patch("shushu.web_agents.selenium.SeleniumWebAgent")
+    SeleniumDriverPool = mocker.patch("shushu.web_agents.selenium_drivers.pool.SeleniumDriverPool")
+    SeleniumDriverPool.side_effect = lambda **kwargs: mocker.MagicMock()
+    sut = WebAgentFactory(logger=logger_fixture)
+
+    sut.create(settings=SeleniumWebAgentSettings(driver_pool_size=2))
+    sut.create(settings=SeleniumWebAgentSettings(driver_pool_size=2))
+    sut.create(settings=SeleniumWebAgentSettings(driver_pool_size=3))
+
+    driver_pools = [call.kwargs["driver_pool"] for call in SeleniumWebAgent.call_args_list]
+    assert SeleniumDriverPool.call_count == 2
+    assert driver_pools[0] is driver_pools[1]
+    assert driver_pools[0] is not driver_pools[2]
+
+
+def test_web_agent_factory_creates_http_agent(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    HttpWebAgent = mocker.patch("shushu.web_agents.http.HttpWebAgent")
+    http_web_agent_settings = HttpWebAgentSettings(timeout=5.0, max_connections_per_host=3, user_agent="test-agent")
+
+    actual = WebAgentFactory(logger=logger_fixture).create(settings=http_web_agent_settings)
+
+    assert actual == HttpWebAgent.return_value
+    HttpWebAgent.assert_called_once_with(
+        timeout=5.0, max_connections_per_host=3, user_agent="test-agent", logger=logger_fixture, page_cache=None
+    )
+
+
+def test_web_agent_factory_shares_page_cache_between_agents(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    HttpWebAgent = mocker.patch("shushu.web_agents.http.HttpWebAgent")
+    PageCache = mocker.patch("shushu.web_agents.factory.PageCache")
+    settings = HttpWebAgentSettings(page_cache=PageCacheSettings(path="cache", ttl=60.0))
+    sut = WebAgentFactory(logger=logger_fixture)
+
+    sut.create(settings=settings)
+    sut.create(settings=settings)
+
+    assert settings.page_cache is not None
+    PageCache.assert_called_once_with(
+        path=settings.page_cache.path,
+        logger=logger_fixture,
+        mode=PageCacheMode.READ_WRITE,
+        ttl=60.0,
+        max_size=1024 * 1024 * 1024,
+        max_memory_size=64 * 1024 * 1024,
+    )
+    assert [call.kwargs["page_cache"] for call in HttpWebAgent.call_args_list] == [PageCache.return_value] * 2
+
+
+def test_web_agent_factory_replays_selenium_pages_with_http_agent(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    SeleniumWebAgent = mocker.patch("shushu.web_agents.selenium.SeleniumWebAgent")
+    HttpWebAgent = mocker.patch("shushu.web_agents.http.HttpWebAgent")
+    PageCache = mocker.patch("shushu.web_agents.factory.PageCache")
+    PageCache.return_value.mode = PageCacheMode.REPLAY
+    settings = SeleniumWebAgentSettings(page_cache=PageCacheSettings(path="cache", mode=PageCacheMode.REPLAY))
+
+    actual = WebAgentFactory(logger=logger_fixture).create(settings=settings)
+
+    assert actual == HttpWebAgent.return_value
+    SeleniumWebAgent.assert_not_called()
+    assert HttpWebAgent.call_args.kwargs["page_cache"] == PageCache.return_value
+    assert HttpWebAgent.call_args.kwargs["cache_options"] == SELENIUM_CACHE_OPTIONS
+
+
+def test_web_agent_factory_reports_capacity_of_driver_pools(logger_fixture: MagicMock) -> None:
+    sut = WebAgentFactory(logger=logger_fixture)
+    assert sut.get_capacity(SeleniumWebAgentSettings(driver_pool_size=3)) == 3
+    assert sut.get_capacity(SeleniumWebAgentSettings()) is None
+    assert sut.get_capacity(HttpWebAgentSettings()) is None
+    replay = PageCacheSettings(path="cache", mode=PageCacheMode.REPLAY)
+    assert sut.get_capacity(SeleniumWebAgentSettings(driver_pool_size=3, page_cache=replay)) is None
@@ -0,0 +1,255 @@
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from shushu.actions import (
+    ClickSelectedElementAction,
+    MinimumEnclosingElementWithMultipleTextsSelector,
+    OpenUrlAction,
+    SetSelectorAction,
+    XPathSelector,
+)
+from shushu.models import Url
+from shushu.web_agents.exceptions import (
+    HttpStatusError,
+    HttpWebAgentNotReadyError,
+    NoPageOpenedError,
+)
+from shushu.web_agents.http import HttpWebAgent
+from shushu.web_agents.page_cache import CachedPage, PageCache
+from shushu.web_agents.selenium_drivers.exceptions import (
+    NoElementFoundError,
+    NoElementSelectedError,
+)
+
+INDEX_SOURCE = """\
+<!DOCTYPE html>
+<html lang="ja">
+<head>
+    <meta charset="UTF-8">
+    <title>始まりの村 一覧</title>
+    <script>var text = "始まりの村 2024";</script>
+</head>
+<body>
+    <ul class="item-list">
+        <li class="list-item first-item">
+            <a href="page0.html">始まりの村</a>
+            <p>日付: 2024-03-31</p>
+        </li>
+        <li class="list-item">
+            <a href="page1.html">ゼルファンの森</a>
+            <p>日付: 2024-04-01</p>
+        </li>
+    </ul>
+    <a class="next" href="index1.html">次のページへ</a>
+</body>
+</html>
+"""
+
+
+def _response(data: str, url: str, status: int = 200, content_type: str = "text/html") -> MagicMock:
+    response = MagicMock()
+    response.status = status
+    response.url = url
+    response.headers = {"Content-Type": content_type}
+    response.data = data.encode("utf-8")
+    return response
+
+
+def _create_sut(logger: MagicMock) -> HttpWebAgent:
+    return HttpWebAgent(timeout=5.0, max_connections_per_host=2, user_agent="test-agent", logger=logger)
+
+
+def test_perform_raises_exception_when_agent_is_not_ready(logger_fixture: MagicMock) -> None:
+    sut = _create_sut(logger_fixture)
+    with pytest.raises(HttpWebAgentNotReadyError):
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080")))
+
+
+def test_get_selected_element_raises_exception_when_no_page_is_opened(logger_fixture: MagicMock) -> None:
+    sut = _create_sut(logger_fixture)
+    with sut:
+        sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//li")))
+        with pytest.raises(NoPageOpenedError):
+            sut.get_selected_element()
+
+
+def test_open_url_uses_pool_manager(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    PoolManager = mocker.patch("shushu.web_agents.http.PoolManager")
+    PoolManager.return_value.request.return_value = _response(INDEX_SOURCE, url="/index.html")
+    sut = _create_sut(logger_fixture)
+    with sut:
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/")))
+        assert sut.current_url == "http://localhost:8080/index.html"
+    PoolManager.return_value.request.assert_called_once_with("GET", "http://localhost:8080/")
+    PoolManager.return_value.clear.assert_called_once_with()
+    assert PoolManager.call_args.kwargs["maxsize"] == 2
+    assert PoolManager.call_args.kwargs["headers"] == {"User-Agent": "test-agent"}
+
+
+def test_open_url_raises_http_status_error(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    PoolManager = mocker.patch("shushu.web_agents.http.PoolManager")
+    PoolManager.return_value.request.return_value = _response("not found", url="/missing.html", status=404)
+    sut = _create_sut(logger_fixture)
+    with sut:
+        with pytest.raises(HttpStatusError):
+            sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/missing.html")))
+
+
+def test_get_selected_elements_with_xpath_selector(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    PoolManager = mocker.patch("shushu.web_agents.http.PoolManager")
+    PoolManager.return_value.request.return_value = _response(INDEX_SOURCE, url="http://localhost:8080/")
+    sut = _create_sut(logger_fixture)
+    with sut:
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/")))
+        sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//li[contains(@class, 'list-item')]")))
+        actual = sut.get_selected_elements()
+        first = sut.get_selected_element()
+    assert [element.tag_name for element in actual.elements] == ["li", "li"]
+    assert "始まりの村" in actual.elements[0].text
+    assert "ゼルファンの森" in actual.elements[1].text
+    assert all(str(element.url.value) == "http://localhost:8080/" for element in actual.elements)
+    assert first.html_source == actual.elements[0].html_source
+    assert "list-item" in first.classes
+
+
+def test_get_selected_elements_returns_empty_sequence_when_nothing_matches(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    PoolManager = mocker.patch("shushu.web_agents.http.PoolManager")
+    PoolManager.return_value.request.return_value = _response(INDEX_SOURCE, url="http://localhost:8080/")
+    sut = _create_sut(logger_fixture)
+    with sut:
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/")))
+        sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//table")))
+        assert len(sut.get_selected_elements().elements) == 0
+        with pytest.raises(NoElementFoundError):
+            sut.get_selected_element()
+
+
+def test_get_selected_element_with_minimum_enclosing_element_selector(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    PoolManager = mocker.patch("shushu.web_agents.http.PoolManager")
+    PoolManager.return_value.request.return_value = _response(INDEX_SOURCE, url="http://localhost:8080/")
+    sut = _create_sut(logger_fixture)
+    with sut:
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/")))
+        sut.perform(
+            SetSelectorAction(
+                selector=MinimumEnclosingElementWithMultipleTextsSelector(target_strings=["始まりの村", "2024"])
+            )
+        )
+        actual = sut.get_selected_element()
+    assert actual.tag_name == "li"
+    assert "first-item" in actual.classes
+
+
+def test_get_selected_element_raises_error_when_no_selector_is_set(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    PoolManager = mocker.patch("shushu.web_agents.http.PoolManager")
+    PoolManager.return_value.request.return_value = _response(INDEX_SOURCE, url="http://localhost:8080/")
+    sut = _create_sut(logger_fixture)
+    with sut:
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/")))
+        with pytest.raises(NoElementSelectedError):
+            sut.get_selected_element()
+
+
+def test_click_selected_link_opens_its_href(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    PoolManager = mocker.patch("shushu.web_agents.http.PoolManager")
+    PoolManager.return_value.request.side_effect = [
+        _response(INDEX_SOURCE, url="http://localhost:8080/list/"),
+        _response("<html><body><p>next</p></body></html>", url="http://localhost:8080/list/index1.html"),
+    ]
+    sut = _create_sut(logger_fixture)
+    with sut:
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/list/")))
+        sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//a[@class='next']")))
+        sut.perform(ClickSelectedElementAction())
+        assert sut.current_url == "http://localhost:8080/list/index1.html"
+    PoolManager.return_value.request.assert_called_with("GET", "http://localhost:8080/list/index1.html")
+
+
+def test_click_selected_element_without_href_is_not_supported(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    PoolManager = mocker.patch("shushu.web_agents.http.PoolManager")
+    PoolManager.return_value.request.return_value = _response(INDEX_SOURCE, url="http://localhost:8080/")
+    sut = _create_sut(logger_fixture)
+    with sut:
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/")))
+        sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//ul")))
+        with pytest.raises(NotImplementedError):
+            sut.perform(ClickSelectedElementAction())
+
+
+def test_open_url_is_served_from_page_cache(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    PoolManager = mocker.patch("shushu.web_agents.http.PoolManager")
+    PoolManager.return_value.request.return_value = _response(INDEX_SOURCE, url="http://localhost:8080/index.html")
+    page_cache = MagicMock(spec=PageCache)
+    page_cache.get.return_value = None
+    sut = HttpWebAgent(
+        timeout=5.0, max_connections_per_host=2, user_agent="test-agent", logger=logger_fixture, page_cache=page_cache
+    )
+    with sut:
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/")))
+        page = page_cache.put.call_args.args[1]
+        page_cache.get.return_value = page
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/")))
+        sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//li")))
+        assert len(sut.get_selected_elements().elements) == 2
+        assert sut.current_url == "http://localhost:8080/index.html"
+    PoolManager.return_value.request.assert_called_once_with("GET", "http://localhost:8080/")
+    page_cache.get.assert_called_with("http://localhost:8080/", {"user_agent": "test-agent"})
+    page_cache.put.assert_called_once_with("http://localhost:8080/", page, {"user_agent": "test-agent"})
+    assert page == CachedPage(
+        url="http://localhost:8080/index.html", content=INDEX_SOURCE.encode("utf-8"), content_type="text/html"
+    )
+
+
+def test_open_url_uses_prefetched_page(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    PoolManager = mocker.patch("shushu.web_agents.http.PoolManager")
+    PoolManager.return_value.request.side_effect = [
+        _response(INDEX_SOURCE, url="http://localhost:8080/index.html"),
+        _response("<html><body><p>next</p></body></html>", url="http://localhost:8080/index1.html"),
+    ]
+    sut = _create_sut(logger_fixture)
+    with sut:
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/index.html")))
+        sut.prefetch("http://localhost:8080/index1.html")
+        sut.prefetch("http://localhost:8080/index1.html")
+        sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//li")))
+        assert len(sut.get_selected_elements().elements) == 2
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/index1.html")))
+        assert sut.current_url == "http://localhost:8080/index1.html"
+    assert PoolManager.return_value.request.call_count == 2
+    PoolManager.return_value.request.assert_called_with("GET", "http://localhost:8080/index1.html")
+
+
+def test_get_selected_elements_compact(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    PoolManager = mocker.patch("shushu.web_agents.http.PoolManager")
+    PoolManager.return_value.request.return_value = _response(INDEX_SOURCE, url="http://localhost:8080/")
+    sut = _create_sut(logger_fixture)
+    with sut:
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/")))
+        sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//li[contains(@class, 'list-item')]")))
+        expected = sut.get_selected_elements()
+        actual = sut.get_selected_elements_compact()
+    assert str(actual.url.value) == "http://localhost:8080/"
+    assert [e.html_source for e in actual.elements] == [e.html_source for e in expected.elements]
+
+
+def test_iter_selected_elements_yields_chunks(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    PoolManager = mocker.patch("shushu.web_agents.http.PoolManager")
+    PoolManager.return_value.request.return_value = _response(INDEX_SOURCE, url="http://localhost:8080/")
+    sut = _create_sut(logger_fixture)
+    with sut:
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080/")))
+        sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//li | //a")))
+        expected = [e.html_source for e in sut.get_selected_elements().elements]
+        chunks = list(sut.iter_selected_elements(2))
+        compact_chunks = list(sut.iter_selected_elements_compact(2))
+    assert [len(chunk.elements) for chunk in chunks] == [2, 2, 1]
+    assert [e.html_source for chunk in chunks for e in chunk.elements] == expected
+    assert [e.html_source for chunk in compact_chunks for e in chunk.elements] == expected
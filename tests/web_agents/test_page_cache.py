@@ -0,0 +1,97 @@
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from shushu.settings import PageCacheMode
+from shushu.web_agents.exceptions import PageNotCachedError
+from shushu.web_agents.page_cache import CachedPage, PageCache
+
+OPTIONS = {"user_agent": "test-agent"}
+
+
+def _page(url: str, size: int = 10) -> CachedPage:
+    return CachedPage(url=url, content=b"x" * size, content_type="text/html")
+
+
+def test_page_cache_stores_pages_on_disk(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        page = _page("http://localhost/index.html")
+        PageCache(path=Path(tempdir), logger=logger_fixture).put("http://localhost/", page, OPTIONS)
+        sut = PageCache(path=Path(tempdir), logger=logger_fixture)
+        assert sut.get("http://localhost/", OPTIONS) == page
+        assert sut.get("http://localhost/", {"user_agent": "other-agent"}) is None
+        assert sut.get("http://localhost/other.html", OPTIONS) is None
+
+
+def test_page_cache_expires_pages_after_ttl(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    time = mocker.patch("shushu.web_agents.page_cache.time", return_value=1000.0)
+    with TemporaryDirectory() as tempdir:
+        sut = PageCache(path=Path(tempdir), logger=logger_fixture, ttl=60.0)
+        sut.put("http://localhost/", _page("http://localhost/"), OPTIONS)
+        time.return_value = 1059.0
+        assert sut.get("http://localhost/", OPTIONS) is not None
+        time.return_value = 1061.0
+        assert sut.get("http://localhost/", OPTIONS) is None
+        replay = PageCache(path=Path(tempdir), logger=logger_fixture, mode=PageCacheMode.REPLAY, ttl=60.0)
+        assert replay.get("http://localhost/", OPTIONS) is not None
+
+
+def test_page_cache_evicts_least_recently_used_pages(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        sut = PageCache(path=Path(tempdir), logger=logger_fixture, max_size=2500, max_memory_size=0)
+        sut.put("http://localhost/0", _page("http://localhost/0", 1000), OPTIONS)
+        sut.put("http://localhost/1", _page("http://localhost/1", 1000), OPTIONS)
+        for path in Path(tempdir).iterdir():
+            os.utime(path, (0, 0))
+        assert sut.get("http://localhost/0", OPTIONS) is not None
+        sut.put("http://localhost/2", _page("http://localhost/2", 1000), OPTIONS)
+        assert sut.get("http://localhost/0", OPTIONS) is not None
+        assert sut.get("http://localhost/1", OPTIONS) is None
+        assert sut.get("http://localhost/2", OPTIONS) is not None
+
+
+def test_page_cache_keeps_pages_served_from_memory_from_eviction(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        sut = PageCache(path=Path(tempdir), logger=logger_fixture, max_size=2500)
+        sut.put("http://localhost/0", _page("http://localhost/0", 1000), OPTIONS)
+        (first_path,) = Path(tempdir).iterdir()
+        os.utime(first_path, (0, 0))
+        sut.put("http://localhost/1", _page("http://localhost/1", 1000), OPTIONS)
+        for path in Path(tempdir).iterdir():
+            if path != first_path:
+                os.utime(path, (1, 1))
+        assert sut.get("http://localhost/0", OPTIONS) is not None
+        sut.put("http://localhost/2", _page("http://localhost/2", 1000), OPTIONS)
+        assert len(list(Path(tempdir).iterdir())) == 2
+        assert sut.get("http://localhost/1", OPTIONS) is None
+        assert sut.get("http://localhost/0", OPTIONS) is not None
+
+
+def test_page_cache_serves_recent_pages_from_memory(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        sut = PageCache(path=Path(tempdir), logger=logger_fixture)
+        page = _page("http://localhost/")
+        sut.put("http://localhost/", page, OPTIONS)
+        for path in Path(tempdir).iterdir():
+            path.unlink()
+        assert sut.get("http://localhost/", OPTIONS) == page
+
+
+def test_page_cache_records_without_reading(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        sut = PageCache(path=Path(tempdir), logger=logger_fixture, mode=PageCacheMode.RECORD)
+        sut.put("http://localhost/", _page("http://localhost/"), OPTIONS)
+        assert sut.get("http://localhost/", OPTIONS) is None
+        assert len(list(Path(tempdir).iterdir())) == 1
+
+
+def test_page_cache_raises_error_for_missing_page_in_replay_mode(logger_fixture: MagicMock) -> None:
+    with TemporaryDirectory() as tempdir:
+        sut = PageCache(path=Path(tempdir), logger=logger_fixture, mode=PageCacheMode.REPLAY)
+        sut.put("http://localhost/", _page("http://localhost/"), OPTIONS)
+        with pytest.raises(PageNotCachedError):
+            sut.get("http://localhost/", OPTIONS)
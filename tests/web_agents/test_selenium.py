@@ -3,12 +3,14 @@ from unittest.mock import MagicMock
 import pytest
 from pytest_mock import MockerFixture
 
-from shushu.actions import OpenUrlAction
+from shushu.actions import OpenUrlAction, SetSelectorAction, XPathSelector
 from shushu.models import Url
-from shushu.settings import ChromeSeleniumDriverSettings
+from shushu.settings import ChromeSeleniumDriverSettings, PageCacheMode
 from shushu.web_agents.exceptions import SeleniumDriverNotReadyError
+from shushu.web_agents.page_cache import SELENIUM_CACHE_OPTIONS, CachedPage, PageCache
 from shushu.web_agents.selenium import SeleniumWebAgent
 from shushu.web_agents.selenium_drivers.base import BaseSeleniumDriver
+from shushu.web_agents.selenium_drivers.pool import SeleniumDriverPool
 
 
 def test_perform_raises_exception_when_driver_is_not_ready(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
@@ -93,6 +95,21 @@ def test_get_selected_elements_calls_driver_get_selected_elements(
     selenium_driver.get_selected_elements.assert_called_once_with()
 
 
+def test_iter_selected_elements_calls_driver_iter_selected_elements(
+    mocker: MockerFixture, logger_fixture: MagicMock
+) -> None:
+    selenium_driver = mocker.MagicMock(spec=BaseSeleniumDriver)
+    SeleniumDriverFactory = mocker.patch("shushu.web_agents.selenium.SeleniumDriverFactory")
+    SeleniumDriverFactory.return_value.create.return_value = selenium_driver
+    sut = SeleniumWebAgent(driver_settings=ChromeSeleniumDriverSettings(), logger=logger_fixture)
+
+    with sut:
+        actual = sut.iter_selected_elements(10)
+    assert selenium_driver.iter_selected_elements.return_value == actual
+    selenium_driver.iter_selected_elements.assert_called_once_with(10)
+    selenium_driver.get_selected_elements.assert_not_called()
+
+
 def test_get_selected_elements_raises_exception_when_driver_is_not_ready(
     mocker: MockerFixture, logger_fixture: MagicMock
 ) -> None:
@@ -102,3 +119,45 @@ def test_get_selected_elements_raises_exception_when_driver_is_not_ready(
 
     with pytest.raises(SeleniumDriverNotReadyError):
         sut.get_selected_elements()
+
+
+def test_driver_is_leased_from_driver_pool(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    settings = ChromeSeleniumDriverSettings()
+    selenium_driver = mocker.MagicMock(spec=BaseSeleniumDriver)
+    driver_pool = mocker.MagicMock(spec=SeleniumDriverPool)
+    driver_pool.acquire.return_value = selenium_driver
+    SeleniumDriverFactory = mocker.patch("shushu.web_agents.selenium.SeleniumDriverFactory")
+    sut = SeleniumWebAgent(driver_settings=settings, logger=logger_fixture, driver_pool=driver_pool)
+
+    with sut:
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080")))
+        driver_pool.release.assert_not_called()
+
+    assert sut._driver is None
+    driver_pool.acquire.assert_called_once_with()
+    driver_pool.release.assert_called_once_with(selenium_driver)
+    SeleniumDriverFactory.assert_not_called()
+
+
+def test_opened_pages_are_recorded_in_page_cache(mocker: MockerFixture, logger_fixture: MagicMock) -> None:
+    settings = ChromeSeleniumDriverSettings()
+    selenium_driver = mocker.MagicMock(spec=BaseSeleniumDriver)
+    selenium_driver.current_url = "http://localhost:8080/index.html"
+    selenium_driver.page_source = "<html></html>"
+    SeleniumDriverFactory = mocker.patch("shushu.web_agents.selenium.SeleniumDriverFactory")
+    SeleniumDriverFactory.return_value.create.return_value = selenium_driver
+    page_cache = mocker.MagicMock(spec=PageCache)
+    page_cache.mode = PageCacheMode.RECORD
+    sut = SeleniumWebAgent(driver_settings=settings, logger=logger_fixture, page_cache=page_cache)
+
+    with sut:
+        sut.perform(OpenUrlAction(url=Url(value="http://localhost:8080")))
+        sut.perform(SetSelectorAction(selector=XPathSelector(xpath="//a")))
+
+    page_cache.put.assert_called_once_with(
+        "http://localhost:8080/",
+        CachedPage(
+            url="http://localhost:8080/index.html", content=b"<html></html>", content_type="text/html; charset=utf-8"
+        ),
+        SELENIUM_CACHE_OPTIONS,
+    )